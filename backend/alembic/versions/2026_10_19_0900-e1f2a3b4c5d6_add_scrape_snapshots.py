@@ -0,0 +1,47 @@
+"""add scrape snapshot tables
+
+Revision ID: e1f2a3b4c5d6
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Content-addressed, compressed scrape payloads (shared by identical snapshots)
+    op.create_table(
+        'scrape_payloads',
+        sa.Column('content_hash', sa.String(length=64), primary_key=True),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('pharmacy_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    # One row per (area, slot) pointing at its payload
+    op.create_table(
+        'scrape_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('area', sa.String(length=200), nullable=False),
+        sa.Column('slot', sa.DateTime(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), sa.ForeignKey('scrape_payloads.content_hash'), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint('area', 'slot', name='uq_scrape_snapshot_area_slot'),
+    )
+    op.create_index('ix_scrape_snapshots_id', 'scrape_snapshots', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scrape_snapshots_id', table_name='scrape_snapshots')
+    op.drop_table('scrape_snapshots')
+    op.drop_table('scrape_payloads')
@@ -0,0 +1,45 @@
+"""add security events table
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a3b4c5d6e7'
+down_revision: Union[str, None] = 'e1f2a3b4c5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Append-only security event store, written in batches by the security logger
+    op.create_table(
+        'security_events',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), primary_key=True, autoincrement=True),
+        sa.Column('occurred_at', sa.DateTime(), nullable=False),
+        sa.Column('event_type', sa.String(length=50), nullable=False),
+        sa.Column('level', sa.String(length=10), nullable=False),
+        sa.Column('username', sa.String(length=255), nullable=True),
+        sa.Column('ip_address', sa.String(length=45), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('details', sa.JSON(), nullable=True),
+    )
+    op.create_index('idx_security_event_type_time', 'security_events', ['event_type', 'occurred_at'])
+    op.create_index('idx_security_event_username_time', 'security_events', ['username', 'occurred_at'])
+    op.create_index('idx_security_event_ip_time', 'security_events', ['ip_address', 'occurred_at'])
+    op.create_index('idx_security_event_time', 'security_events', ['occurred_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_security_event_time', table_name='security_events')
+    op.drop_index('idx_security_event_ip_time', table_name='security_events')
+    op.drop_index('idx_security_event_username_time', table_name='security_events')
+    op.drop_index('idx_security_event_type_time', table_name='security_events')
+    op.drop_table('security_events')
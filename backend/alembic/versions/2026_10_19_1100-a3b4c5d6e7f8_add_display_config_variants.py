@@ -0,0 +1,29 @@
+"""add image variants to display configs
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3b4c5d6e7f8'
+down_revision: Union[str, None] = 'f2a3b4c5d6e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Resized WebP/AVIF variant URLs, filled in by the background image pipeline
+    op.add_column('display_configs', sa.Column('logo_variants', sa.JSON(), nullable=True))
+    op.add_column('display_configs', sa.Column('image_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('display_configs', 'image_variants')
+    op.drop_column('display_configs', 'logo_variants')
@@ -0,0 +1,36 @@
+"""add upload blobs table
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c5d6e7f8a9'
+down_revision: Union[str, None] = 'a3b4c5d6e7f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reference counts of content-addressed uploads (files named by SHA-256)
+    op.create_table(
+        'upload_blobs',
+        sa.Column('url', sa.String(length=500), primary_key=True),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('refcount', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_upload_blobs_sha256', 'upload_blobs', ['sha256'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_upload_blobs_sha256', table_name='upload_blobs')
+    op.drop_table('upload_blobs')
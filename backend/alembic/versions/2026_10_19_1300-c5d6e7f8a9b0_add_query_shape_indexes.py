@@ -0,0 +1,66 @@
+"""add indexes matching the listing and display query shapes
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d6e7f8a9b0'
+down_revision: Union[str, None] = 'b4c5d6e7f8a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE = sa.column('is_active', sa.Boolean) == True
+
+
+def upgrade() -> None:
+    # CONCURRENTLY on PostgreSQL: shifts and devices stay writable while the
+    # indexes build (not allowed inside a transaction)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_shift_pharmacy_date_start', 'shifts', ['pharmacy_id', 'date', 'start_time'],
+            postgresql_include=['end_time'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_pharmacy_user', 'pharmacies', ['user_id'],
+            postgresql_include=['id'], postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_pharmacy_active_name', 'pharmacies', ['name'],
+            postgresql_where=ACTIVE, sqlite_where=ACTIVE, postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_pharmacy_user_active_name', 'pharmacies', ['user_id', 'name'],
+            postgresql_where=ACTIVE, sqlite_where=ACTIVE, postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_device_status_last_seen', 'devices', ['status', sa.text('last_seen DESC')],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_device_pharmacy_last_seen', 'devices', ['pharmacy_id', sa.text('last_seen DESC')],
+            postgresql_concurrently=True
+        )
+
+    # Prefix of idx_shift_pharmacy_date_start, now redundant (databases
+    # created from the models before this revision have it)
+    inspector = sa.inspect(op.get_bind())
+    if 'idx_shift_pharmacy_date' in [index['name'] for index in inspector.get_indexes('shifts')]:
+        op.drop_index('idx_shift_pharmacy_date', table_name='shifts')
+
+
+def downgrade() -> None:
+    op.create_index('idx_shift_pharmacy_date', 'shifts', ['pharmacy_id', 'date'])
+    op.drop_index('idx_device_pharmacy_last_seen', table_name='devices')
+    op.drop_index('idx_device_status_last_seen', table_name='devices')
+    op.drop_index('idx_pharmacy_user_active_name', table_name='pharmacies')
+    op.drop_index('idx_pharmacy_active_name', table_name='pharmacies')
+    op.drop_index('idx_pharmacy_user', table_name='pharmacies')
+    op.drop_index('idx_shift_pharmacy_date_start', table_name='shifts')
@@ -0,0 +1,26 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter, HTTPException, Response, status
+
+from app.config import get_settings
+from app.core.metrics import METRICS_AVAILABLE, METRICS_PATH, render_metrics
+
+settings = get_settings()
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(METRICS_PATH, include_in_schema=False)
+def metrics() -> Response:
+    """
+    Metrics of all workers in the Prometheus text format.
+
+    Served on the backend port only; nginx does not proxy it.
+
+    Raises:
+        HTTPException: If metrics are disabled or prometheus_client is missing
+    """
+    if not METRICS_AVAILABLE or not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics not enabled")
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
@@ -0,0 +1,151 @@
+"""Uploaded files serving (replaces the StaticFiles mount)."""
+
+import mimetypes
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.config import get_settings
+from app.utils import uploads
+
+settings = get_settings()
+
+router = APIRouter(tags=["uploads"])
+
+# Not in every system mime.types
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+# Content-addressed names: <sha256><ext>, or <sha256>-<variant><ext> for derived files
+CONTENT_ADDRESSED_NAME = re.compile(r"^(?P<sha256>[0-9a-f]{64})(?:-[\w-]+)?\.\w+$")
+
+# Content-addressed files never change; others are revalidated on each use
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MUTABLE_CACHE_CONTROL = "public, no-cache"
+
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+@router.api_route("/uploads/{file_path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+def serve_upload(file_path: str, request: Request):
+    """
+    Serve an uploaded file with validators, long-lived caching and Range support.
+
+    - Content-addressed files get a strong ETag derived from their name and
+      `Cache-Control: immutable`; others get a stat-based ETag and no-cache.
+    - If-None-Match is answered with 304.
+    - A single byte range is answered with 206 (multiple ranges: full file).
+    - With UPLOAD_ACCEL_REDIRECT_PREFIX set, only headers are produced and
+      nginx sends the bytes (sendfile, ranges) from its internal location.
+    """
+    path = _resolve(file_path)
+    try:
+        stat_result = path.stat()
+    except OSError:
+        stat_result = None
+    if stat_result is None or not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if CONTENT_ADDRESSED_NAME.match(path.name):
+        etag = f'"{path.name}"'
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        etag = f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"'
+        cache_control = MUTABLE_CACHE_CONTROL
+
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Accept-Ranges": "bytes"}
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    accel_prefix = settings.UPLOAD_ACCEL_REDIRECT_PREFIX
+    if accel_prefix:
+        headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + quote(file_path.lstrip("/"))
+        return Response(headers=headers, media_type=media_type)
+
+    size = stat_result.st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and request.method == "GET" and (if_range is None or if_range == etag):
+        byte_range = _parse_range(range_header, size)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+        if byte_range != (0, size - 1):
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                _read_range(path, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                headers=headers,
+                media_type=media_type
+            )
+
+    return FileResponse(path, headers=headers, media_type=media_type, stat_result=stat_result)
+
+
+def _resolve(file_path: str) -> Path:
+    """Path of an upload URL; hidden files (e.g. partial uploads) are not served."""
+    if any(part.startswith(".") for part in file_path.split("/")):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    path = uploads.upload_path(uploads.UPLOAD_URL_PREFIX + file_path)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return path
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header with an ETag."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `bytes=` header.
+
+    Returns:
+        Inclusive (start, end), the whole file for unsupported or multiple
+        ranges, or None if not satisfiable
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return (0, size - 1)
+
+    start_text, _, end_text = spec.strip().partition("-")
+    try:
+        if start_text == "":
+            length = int(end_text)  # Suffix range: last N bytes
+            if length <= 0:
+                return None
+            return (max(size - length, 0), size - 1)
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return (0, size - 1)
+
+    if start >= size or end < start:
+        return None
+    return (start, min(end, size - 1))
+
+
+def _read_range(path: Path, start: int, end: int) -> Iterator[bytes]:
+    """Read bytes start..end (inclusive) in chunks."""
+    remaining = end - start + 1
+    with open(path, "rb") as file:
+        file.seek(start)
+        while remaining > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import auth, health, pharmacies, shifts, devices, display, display_config, scraping, users
+from app.api.v1 import auth, health, pharmacies, shifts, devices, display, display_config, scraping, users, security_events, profiling
 
 api_router = APIRouter()
 
@@ -16,5 +16,7 @@ api_router.include_router(devices.router)
 api_router.include_router(display.router)
 api_router.include_router(display_config.router, prefix="/display-config", tags=["display-config"])
 api_router.include_router(scraping.router)
+api_router.include_router(security_events.router)
+api_router.include_router(profiling.router)
 
 __all__ = ["api_router"]
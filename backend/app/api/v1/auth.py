@@ -7,8 +7,9 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse, Token, ProfileUpdate, PasswordChange
-from app.utils.security import verify_password, get_password_hash, create_access_token
-from app.dependencies import CurrentUser
+from app.utils.security import verify_password_async, get_password_hash_async, create_access_token
+from app.dependencies import CurrentUserRecord
+from app.core.principal_cache import principal_cache
 from app.config import get_settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -51,7 +52,7 @@ async def register(
     user = User(
         username=user_data.username,
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash_async(user_data.password),
         role=user_data.role,
     )
 
@@ -84,7 +85,7 @@ async def login(
     user = db.query(User).filter(User.username == credentials.username).first()
 
     # Verify credentials
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -112,7 +113,7 @@ async def login(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: CurrentUser) -> User:
+async def get_current_user_info(current_user: CurrentUserRecord) -> User:
     """
     Get current authenticated user information.
 
@@ -128,7 +129,7 @@ async def get_current_user_info(current_user: CurrentUser) -> User:
 @router.put("/profile", response_model=UserResponse)
 async def update_profile(
     profile_data: ProfileUpdate,
-    current_user: CurrentUser,
+    current_user: CurrentUserRecord,
     db: Session = Depends(get_db)
 ) -> User:
     """
@@ -176,7 +177,7 @@ async def update_profile(
 @router.post("/change-password", status_code=status.HTTP_200_OK)
 async def change_password(
     password_data: PasswordChange,
-    current_user: CurrentUser,
+    current_user: CurrentUserRecord,
     db: Session = Depends(get_db)
 ) -> dict[str, str]:
     """
@@ -194,23 +195,25 @@ async def change_password(
         HTTPException: If current password is incorrect
     """
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.password_hash):
+    if not await verify_password_async(password_data.current_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
 
     # Ensure new password is different from current
-    if verify_password(password_data.new_password, current_user.password_hash):
+    if await verify_password_async(password_data.new_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="New password must be different from current password"
         )
 
     # Update password
-    current_user.password_hash = get_password_hash(password_data.new_password)
+    current_user.password_hash = await get_password_hash_async(password_data.new_password)
     db.commit()
 
+    principal_cache.invalidate_user(current_user.id)
+
     return {"message": "Password changed successfully"}
 
 
@@ -262,6 +265,7 @@ async def reset_password(
         HTTPException: If token is invalid
     """
     # TODO: Implement token validation and password reset logic
+    # (hash the new password with get_password_hash_async, never inline)
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
         detail="Password reset functionality not yet implemented"
@@ -8,10 +8,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.user import User
+from app.database import get_db, get_read_db
 from app.models.device import Device, DeviceStatus
-from app.models.pharmacy import Pharmacy
 from app.schemas.device import (
     DeviceCreate,
     DeviceActivate,
@@ -20,7 +18,10 @@ from app.schemas.device import (
     DeviceHeartbeat
 )
 from app.dependencies import AdminUser, CurrentUser, get_current_user, require_admin
+from app.core.principal_cache import Principal
 from app.api.v1.pharmacies import require_pharmacy_access
+from app.core.pharmacy_ownership import check_pharmacy_access, pharmacy_ownership
+from app.utils.fast_json import FastJSONResponse, serialize_row, serialize_rows
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
@@ -29,7 +30,7 @@ router = APIRouter(prefix="/devices", tags=["devices"])
 async def register_device(
     device_in: DeviceCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: Principal = Depends(require_admin)
 ):
     """
     Register a new device (ADMIN ONLY).
@@ -75,7 +76,7 @@ async def activate_device(
     device_id: UUID,
     activation_in: DeviceActivate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Activate a device with activation code.
@@ -142,8 +143,8 @@ async def activate_device(
 async def list_devices(
     pharmacy_id: UUID | None = Query(None, description="Filter by pharmacy"),
     status: DeviceStatus | None = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     List devices with filters.
@@ -161,17 +162,14 @@ async def list_devices(
     # RBAC filtering
     if current_user.role != "admin":
         # Get user's pharmacy IDs
-        user_pharmacy_ids = db.query(Pharmacy.id).filter(
-            Pharmacy.user_id == current_user.id
-        ).all()
-        user_pharmacy_ids = [pid[0] for pid in user_pharmacy_ids]
+        user_pharmacy_ids = pharmacy_ownership.get_owned_pharmacy_ids(db, current_user.id)
 
         query = query.filter(Device.pharmacy_id.in_(user_pharmacy_ids))
 
     # Pharmacy filter
     if pharmacy_id:
         # Verify access to pharmacy
-        await require_pharmacy_access(pharmacy_id, current_user, db)
+        check_pharmacy_access(db, pharmacy_id, current_user)
         query = query.filter(Device.pharmacy_id == pharmacy_id)
 
     # Status filter
@@ -182,14 +180,14 @@ async def list_devices(
     query = query.order_by(Device.last_seen.desc())
 
     devices = query.all()
-    return devices
+    return FastJSONResponse(serialize_rows(devices, DeviceResponse))
 
 
 @router.get("/{device_id}", response_model=DeviceResponse)
 async def get_device(
     device_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get device details.
@@ -208,7 +206,7 @@ async def get_device(
 
     # Verify access if device is associated with a pharmacy
     if device.pharmacy_id:
-        await require_pharmacy_access(device.pharmacy_id, current_user, db)
+        check_pharmacy_access(db, device.pharmacy_id, current_user)
 
     return device
 
@@ -258,7 +256,7 @@ async def device_heartbeat(
     db.commit()
     db.refresh(device)
 
-    return device
+    return FastJSONResponse(serialize_row(device, DeviceResponse))
 
 
 @router.put("/{device_id}/status", response_model=DeviceResponse)
@@ -266,7 +264,7 @@ async def update_device_status(
     device_id: UUID,
     status_update: DeviceStatusUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: Principal = Depends(require_admin)
 ):
     """
     Update device status (ADMIN ONLY).
@@ -295,7 +293,7 @@ async def update_device_status(
 async def delete_device(
     device_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: Principal = Depends(require_admin)
 ):
     """
     Delete device (ADMIN ONLY).
@@ -2,18 +2,21 @@
 
 from datetime import datetime
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.core.compression import precompressed_response
+from app.database import get_read_db
 from app.models.pharmacy import Pharmacy
 from app.models.shift import Shift
+from app.services.display_cache import display_cache
+from app.utils.fast_json import JSON_MEDIA_TYPE, FastJSONResponse, dumps, serialize_row, serialize_rows
+from app.utils.geo import haversine_meters
 from app.schemas.display import (
     DisplayDataResponse,
     DisplayPharmacyInfo,
-    DisplayShiftInfo,
-    NearbyPharmacyInfo
+    DisplayShiftInfo
 )
 
 router = APIRouter(prefix="/display", tags=["display"])
@@ -22,7 +25,8 @@ router = APIRouter(prefix="/display", tags=["display"])
 @router.get("/{pharmacy_id}", response_model=DisplayDataResponse)
 async def get_display_data(
     pharmacy_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_read_db)
 ):
     """
     Get display data for a pharmacy (PUBLIC - NO AUTH).
@@ -34,8 +38,16 @@ async def get_display_data(
     - Active messages (future feature)
 
     Optimized for performance with efficient queries.
-    Suitable for frequent polling from display devices.
+    Suitable for frequent polling from display devices: the payload is
+    built as plain data and serialized once (response_model is only used
+    for the documentation). Payloads are cached for
+    DISPLAY_CACHE_TTL_SECONDS and stored precompressed, so a poll within
+    the TTL costs no query and no compression (304 if unchanged).
     """
+    cached = display_cache.get(pharmacy_id)
+    if cached is not None:
+        return precompressed_response(request, cached, JSON_MEDIA_TYPE, cached.etag)
+
     # Get pharmacy
     pharmacy = db.query(Pharmacy).filter(
         Pharmacy.id == pharmacy_id,
@@ -60,24 +72,13 @@ async def get_display_data(
         Shift.end_time >= current_time
     ).all()
 
-    # Convert to display shift info
-    shift_list = [
-        DisplayShiftInfo(
-            date=shift.date,
-            start_time=shift.start_time,
-            end_time=shift.end_time,
-            notes=shift.notes
-        )
-        for shift in current_shifts
-    ]
+    shift_list = serialize_rows(current_shifts, DisplayShiftInfo)
 
     # Get nearby pharmacies using Haversine formula (5km radius)
     nearby_pharmacies = []
 
     if pharmacy.latitude is not None and pharmacy.longitude is not None:
         # Get all active pharmacies with coordinates
-        from math import radians, sin, cos, sqrt, atan2
-
         all_pharmacies = db.query(Pharmacy).filter(
             Pharmacy.id != pharmacy_id,
             Pharmacy.is_active == True,
@@ -88,17 +89,10 @@ async def get_display_data(
         # Calculate distances using Haversine formula
         pharmacy_distances = []
         for other in all_pharmacies:
-            # Haversine formula for distance calculation
-            R = 6371000  # Earth radius in meters
-            lat1, lon1 = radians(pharmacy.latitude), radians(pharmacy.longitude)
-            lat2, lon2 = radians(other.latitude), radians(other.longitude)
-
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-
-            a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-            c = 2 * atan2(sqrt(a), sqrt(1-a))
-            distance = R * c
+            distance = haversine_meters(
+                pharmacy.latitude, pharmacy.longitude,
+                other.latitude, other.longitude
+            )
 
             if distance <= 5000:  # Within 5km
                 pharmacy_distances.append((other, distance))
@@ -106,38 +100,32 @@ async def get_display_data(
         # Sort by distance and limit to 10
         pharmacy_distances.sort(key=lambda x: x[1])
         nearby_pharmacies = [
-            NearbyPharmacyInfo(
-                id=p.id,
-                name=p.name,
-                address=p.address,
-                city=p.city,
-                phone=p.phone,
-                distance_meters=float(dist)
-            )
+            {
+                "id": p.id,
+                "name": p.name,
+                "address": p.address,
+                "city": p.city,
+                "phone": p.phone,
+                "distance_meters": float(dist),
+            }
             for p, dist in pharmacy_distances[:10]
         ]
 
     # Build response
-    return DisplayDataResponse(
-        pharmacy=DisplayPharmacyInfo(
-            id=pharmacy.id,
-            name=pharmacy.name,
-            address=pharmacy.address,
-            city=pharmacy.city,
-            phone=pharmacy.phone,
-            logo_url=pharmacy.logo_url
-        ),
-        current_shifts=shift_list,
-        nearby_pharmacies=nearby_pharmacies,
-        messages=[],  # Future feature
-        updated_at=datetime.utcnow()
-    )
+    payload = display_cache.set(pharmacy_id, dumps({
+        "pharmacy": serialize_row(pharmacy, DisplayPharmacyInfo),
+        "current_shifts": shift_list,
+        "nearby_pharmacies": nearby_pharmacies,
+        "messages": [],  # Future feature
+        "updated_at": datetime.utcnow(),
+    }))
+    return precompressed_response(request, payload, JSON_MEDIA_TYPE, payload.etag)
 
 
 @router.get("/{pharmacy_id}/shifts", response_model=list[DisplayShiftInfo])
 async def get_display_shifts(
     pharmacy_id: UUID,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get upcoming shifts for display (PUBLIC - NO AUTH).
@@ -168,12 +156,4 @@ async def get_display_shifts(
         Shift.date <= end_date
     ).order_by(Shift.date, Shift.start_time).all()
 
-    return [
-        DisplayShiftInfo(
-            date=shift.date,
-            start_time=shift.start_time,
-            end_time=shift.end_time,
-            notes=shift.notes
-        )
-        for shift in shifts
-    ]
+    return FastJSONResponse(serialize_rows(shifts, DisplayShiftInfo))
@@ -2,10 +2,14 @@
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from redis import Redis
 
-from app.database import get_db
+from app.core.db_pool import get_pool_stats
+from app.core.principal_cache import Principal
+from app.database import engine, get_db, replica_engines, replica_router
+from app.dependencies import require_admin
 from app.config import get_settings
+from app.utils.security import password_hash_pool
+from app.core.redis_pool import redis_pool
 
 router = APIRouter(prefix="/health", tags=["health"])
 settings = get_settings()
@@ -46,12 +50,53 @@ async def detailed_health_check(db: Session = Depends(get_db)) -> dict[str, str]
     except Exception as e:
         status["database"] = f"unhealthy: {str(e)}"
 
-    # Check Redis
-    try:
-        redis_client = Redis.from_url(settings.REDIS_URL)
-        redis_client.ping()
-        status["redis"] = "healthy"
-    except Exception as e:
-        status["redis"] = f"unhealthy: {str(e)}"
+    # Check Redis through the shared pool (the error is on the admin-only /health/redis)
+    status["redis"] = "healthy" if await redis_pool.ping() else "unhealthy"
 
     return status
+
+
+@router.get("/password-hashing")
+async def password_hashing_stats() -> dict:
+    """
+    Password hashing pool statistics.
+
+    Returns:
+        Workers, running jobs, queue depth and timing counters
+    """
+    return password_hash_pool.get_stats()
+
+
+@router.get("/redis")
+async def redis_stats(_: Principal = Depends(require_admin)) -> dict:
+    """
+    Shared Redis pool statistics (admin only: exposes the host and last error).
+
+    Returns:
+        Health state, connections in use/idle and command counters
+    """
+    return redis_pool.get_stats()
+
+
+@router.get("/database-pool")
+async def database_pool_stats(_: Principal = Depends(require_admin)) -> dict:
+    """
+    Database connection pool statistics of this worker (admin only).
+
+    Monitoring scrapes the db_pool_* metrics on /metrics instead.
+
+    Returns:
+        Per pool: size, connections in use and in overflow, checkouts, waits and timeouts
+    """
+    return {"pools": [get_pool_stats(pool_engine) for pool_engine in [engine, *replica_engines]]}
+
+
+@router.get("/replicas")
+async def replica_stats(_: Principal = Depends(require_admin)) -> dict:
+    """
+    Read replica statistics (admin only: exposes database hosts and errors).
+
+    Returns:
+        Lag and health of each replica, and reads that fell back to the primary
+    """
+    return replica_router.get_stats()
@@ -2,32 +2,39 @@
 
 from typing import List
 from uuid import UUID
-import os
-import uuid
-from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.user import User, UserRole
+from app.database import get_db, get_read_db
+from app.models.user import UserRole
 from app.models.pharmacy import Pharmacy
 from app.models.device import Device, DeviceStatus
 from app.schemas.pharmacy import PharmacyCreate, PharmacyUpdate, PharmacyResponse
 from app.dependencies import CurrentUser, get_current_user, require_admin
+from app.core.principal_cache import Principal
+from app.core.pharmacy_ownership import check_pharmacy_access, pharmacy_ownership
 from app.utils.pagination import paginate, PaginatedResponse
 from app.utils.display_id import generate_display_id
+from app.utils.fast_json import FastJSONResponse, serialize_rows
+from app.utils.uploads import save_upload_file, delete_file_if_exists
+from app.services.display_cache import display_cache
+from app.services.scraping_enrichment import pharmacy_matcher
 
 router = APIRouter(prefix="/pharmacies", tags=["pharmacies"])
 
+LOGO_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
 
 async def require_pharmacy_access(
     pharmacy_id: UUID,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ) -> Pharmacy:
     """
-    Verify user has access to pharmacy.
+    Verify user has access to pharmacy and load it.
+
+    Use check_pharmacy_access when the pharmacy row itself is not needed.
 
     Args:
         pharmacy_id: UUID of the pharmacy
@@ -40,7 +47,9 @@ async def require_pharmacy_access(
     Raises:
         HTTPException: If pharmacy not found or access denied
     """
-    pharmacy = db.query(Pharmacy).filter(Pharmacy.id == pharmacy_id).first()
+    check_pharmacy_access(db, pharmacy_id, current_user)
+
+    pharmacy = db.get(Pharmacy, pharmacy_id)
 
     if not pharmacy:
         raise HTTPException(
@@ -48,17 +57,6 @@ async def require_pharmacy_access(
             detail="Pharmacy not found"
         )
 
-    # Admin can access all pharmacies
-    if current_user.role == UserRole.ADMIN:
-        return pharmacy
-
-    # User can only access own pharmacies
-    if pharmacy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-
     return pharmacy
 
 
@@ -67,8 +65,8 @@ async def list_pharmacies(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return"),
     search: str | None = Query(None, description="Search in name, city, or address"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     List pharmacies with pagination and search.
@@ -106,15 +104,16 @@ async def list_pharmacies(
 
     # Paginate
     result = paginate(query, skip, limit)
+    result["items"] = serialize_rows(result["items"], PharmacyResponse)
 
-    return result
+    return FastJSONResponse(result)
 
 
 @router.post("/", response_model=PharmacyResponse, status_code=status.HTTP_201_CREATED)
 async def create_pharmacy(
     pharmacy_in: PharmacyCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new pharmacy.
@@ -148,13 +147,19 @@ async def create_pharmacy(
     db.commit()
     db.refresh(pharmacy)
 
+    pharmacy_ownership.invalidate_pharmacy(pharmacy.id, pharmacy.user_id)
+    # Scraped pharmacies may now match this one
+    pharmacy_matcher.clear()
+    # Name, address or position may show in cached displays (own or nearby)
+    display_cache.clear()
+
     return pharmacy
 
 
 @router.get("/by-display-id/{display_id}", response_model=PharmacyResponse)
 async def get_pharmacy_by_display_id(
     display_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get pharmacy details by public display ID.
@@ -215,6 +220,10 @@ async def update_pharmacy(
     db.commit()
     db.refresh(pharmacy)
 
+    pharmacy_matcher.clear()
+    # Name, address or position may show in cached displays (own or nearby)
+    display_cache.clear()
+
     return pharmacy
 
 
@@ -240,22 +249,16 @@ async def delete_pharmacy(
         Device.pharmacy_id == pharmacy.id
     ).update({"status": DeviceStatus.INACTIVE})
 
+    # Read before commit: attributes expire and would be reloaded with a SELECT
+    pharmacy_id, owner_id = pharmacy.id, pharmacy.user_id
     db.commit()
 
-    return None
-
+    pharmacy_ownership.invalidate_pharmacy(pharmacy_id, owner_id)
+    pharmacy_matcher.clear()
+    # Name, address or position may show in cached displays (own or nearby)
+    display_cache.clear()
 
-def delete_file_if_exists(file_path: str | None):
-    """Delete file from filesystem if it exists."""
-    if file_path and file_path.startswith("/uploads/"):
-        try:
-            # Remove leading slash and construct full path
-            rel_path = file_path[1:]  # Remove leading /
-            full_path = Path(rel_path)
-            if full_path.exists():
-                full_path.unlink()
-        except Exception as e:
-            print(f"Warning: Could not delete file {file_path}: {e}")
+    return None
 
 
 @router.post("/{pharmacy_id}/upload-logo")
@@ -263,7 +266,7 @@ def upload_pharmacy_logo(
     pharmacy_id: str,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Upload logo for pharmacy."""
 
@@ -274,31 +277,15 @@ def upload_pharmacy_logo(
         raise HTTPException(status_code=400, detail="Invalid pharmacy_id format")
 
     # Verify ownership
-    pharmacy = db.query(Pharmacy).filter(Pharmacy.id == pharmacy_uuid).first()
-    if not pharmacy:
-        raise HTTPException(status_code=404, detail="Pharmacy not found")
-
-    if pharmacy.user_id != current_user.id and current_user.role != UserRole.ADMIN:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    # Delete old logo if exists
-    delete_file_if_exists(pharmacy.logo_path)
-
-    # Save file
-    file_extension = os.path.splitext(file.filename)[1]
-    if file_extension.lower() not in ['.jpg', '.jpeg', '.png']:
-        raise HTTPException(status_code=400, detail="Only JPG and PNG files are allowed")
-
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    upload_dir = Path("uploads/pharmacy_logos")
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    check_pharmacy_access(db, pharmacy_uuid, current_user)
+    pharmacy = db.get(Pharmacy, pharmacy_uuid)
 
-    file_path = upload_dir / unique_filename
-    with open(file_path, "wb") as buffer:
-        buffer.write(file.file.read())
+    # Save file, release old logo if exists
+    stored = save_upload_file(db, file, "pharmacy_logos", LOGO_EXTENSIONS)
+    delete_file_if_exists(db, pharmacy.logo_path)
 
     # Update pharmacy logo_path
-    pharmacy.logo_path = f"/uploads/pharmacy_logos/{unique_filename}"
+    pharmacy.logo_path = stored.url
     db.commit()
     db.refresh(pharmacy)
 
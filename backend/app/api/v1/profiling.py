@@ -0,0 +1,96 @@
+"""Sampling profiler API endpoints (admin only)."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from app.core.principal_cache import Principal
+from app.core.sampling_profiler import ProfilerBusyError, sampling_profiler
+from app.dependencies import require_admin
+
+router = APIRouter(prefix="/profiling", tags=["profiling"])
+
+COLLAPSED_MEDIA_TYPE = "text/plain; charset=utf-8"
+
+
+def _start(duration_seconds: float, interval_ms: float, sample_rate: float | None) -> dict:
+    try:
+        return sampling_profiler.start(duration_seconds, interval_ms / 1000, sample_rate)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.post("/start")
+async def start_profiling(
+    duration_seconds: float = Query(10, gt=0, description="Session length (capped by PROFILER_MAX_SECONDS)"),
+    interval_ms: float = Query(5, ge=1, le=1000, description="Time between samples"),
+    sample_rate: float | None = Query(None, gt=0, le=1, description="Profile only this share of requests"),
+    _: Principal = Depends(require_admin)
+):
+    """
+    Start sampling this worker in the background.
+
+    Without sample_rate all threads are sampled for the whole window; with it,
+    only while one of the picked requests is in flight. Each worker process
+    profiles itself: the response tells which one (pid).
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    return _start(duration_seconds, interval_ms, sample_rate)
+
+
+@router.get("/status")
+async def profiling_status(_: Principal = Depends(require_admin)):
+    """
+    State of the current or last session of this worker.
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    return sampling_profiler.get_status()
+
+
+@router.post("/stop")
+def stop_profiling(_: Principal = Depends(require_admin)):
+    """
+    Stop the running session early.
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    sampling_profiler.stop()
+    return sampling_profiler.get_status()
+
+
+@router.get("/flamegraph")
+def profiling_flamegraph(
+    wait: bool = Query(False, description="Block until the running session ends"),
+    _: Principal = Depends(require_admin)
+):
+    """
+    Collapsed stacks of the last finished session, one "frame;frame count"
+    line per stack (flamegraph.pl, speedscope, inferno).
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    result = sampling_profiler.wait() if wait else sampling_profiler.result
+    if result is None or (sampling_profiler.running and not wait):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No finished profiling session")
+    return Response(content=result["collapsed"], media_type=COLLAPSED_MEDIA_TYPE)
+
+
+@router.get("/sample")
+def sample_now(
+    duration_seconds: float = Query(5, gt=0, description="Window length (capped by PROFILER_MAX_SECONDS)"),
+    interval_ms: float = Query(5, ge=1, le=1000, description="Time between samples"),
+    _: Principal = Depends(require_admin)
+):
+    """
+    Sample this worker for a window and return the collapsed stacks.
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    _start(duration_seconds, interval_ms, None)
+    result = sampling_profiler.wait()
+    return Response(content=result["collapsed"], media_type=COLLAPSED_MEDIA_TYPE)
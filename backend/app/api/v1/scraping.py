@@ -1,11 +1,18 @@
 """API endpoints for pharmacy scraping."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
-from datetime import date, time as dt_time, datetime
+from datetime import datetime
+from uuid import UUID
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 
+from app.database import get_db, SessionLocal
 from app.services.scraping_service import scraping_service, PharmacyShiftInfo
+from app.services.scraping_cache import scrape_cache, CircuitOpenError
+from app.services import snapshot_store
+from app.services.scraping_enrichment import enrich_pharmacies
+from app.models.pharmacy import Pharmacy
 
 router = APIRouter(prefix="/scraping", tags=["scraping"])
 
@@ -16,6 +23,7 @@ class ScrapeRequest(BaseModel):
     city: Optional[str] = None
     search_date: Optional[str] = None  # Format: YYYY-MM-DD
     search_time: Optional[str] = None  # Format: HH:MM
+    pharmacy_id: Optional[UUID] = None  # Farmacia del display, per le distanze
 
 
 class ScrapeResponse(BaseModel):
@@ -23,10 +31,64 @@ class ScrapeResponse(BaseModel):
     pharmacies: List[PharmacyShiftInfo]
     total: int
     search_params: dict
+    content_hash: Optional[str] = None  # Hash del contenuto dello snapshot salvato
+    changed: Optional[bool] = None  # False se identico allo snapshot precedente
+    stale: bool = False  # True se servito da cache/snapshot in attesa di aggiornamento
+    fetched_at: Optional[datetime] = None  # Quando i dati sono stati letti dall'upstream
+
+
+class SnapshotInfo(BaseModel):
+    """Snapshot salvato per un'area e uno slot."""
+    area: str
+    slot: datetime
+    content_hash: str
+    fetched_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SnapshotDiffResponse(BaseModel):
+    """Differenze tra due snapshot della stessa area."""
+    area: str
+    from_slot: Optional[datetime]
+    to_slot: Optional[datetime]
+    from_hash: Optional[str]
+    to_hash: Optional[str]
+    has_changes: bool
+    added: List[PharmacyShiftInfo]
+    removed: List[PharmacyShiftInfo]
+    changed: List[PharmacyShiftInfo]
+
+
+def _persist_background_refresh(area: str, slot: datetime, pharmacies: List[PharmacyShiftInfo]) -> None:
+    """Save snapshots refreshed in background (outside any request session)."""
+    db = SessionLocal()
+    try:
+        snapshot_store.save_snapshot(db, area, slot, pharmacies)
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not save refreshed scrape snapshot: {e}")
+    finally:
+        db.close()
+
+
+scrape_cache.on_refresh = _persist_background_refresh
+
+
+def _parse_slot(value: str) -> datetime:
+    """Parse slot in formato YYYY-MM-DDTHH:MM."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M")
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato slot non valido: {value} (atteso YYYY-MM-DDTHH:MM)"
+        )
 
 
 @router.post("/search", response_model=ScrapeResponse)
-async def search_pharmacies(request: ScrapeRequest):
+async def search_pharmacies(request: ScrapeRequest, db: Session = Depends(get_db)):
     """
     Cerca farmacie di turno o aperte tramite scraping.
 
@@ -34,6 +96,16 @@ async def search_pharmacies(request: ScrapeRequest):
     - **city**: Città per la ricerca (alternativa a cap)
     - **search_date**: Data ricerca (default: oggi) formato YYYY-MM-DD
     - **search_time**: Ora ricerca (default: ora corrente) formato HH:MM
+    - **pharmacy_id**: Farmacia del display; se indicata, `distance_from_pharmacy_km`
+      è calcolata dalle sue coordinate
+
+    Le farmacie trovate vengono associate alle nostre (per nome, indirizzo e CAP)
+    riutilizzandone le coordinate; le associazioni sono in cache.
+
+    I risultati sono serviti stale-while-revalidate: se i dati in cache sono
+    scaduti, o mancano ma lo slot è già stato salvato, vengono restituiti con
+    `stale=true` mentre l'aggiornamento avviene in background. Se l'upstream
+    non risponde viene restituito l'ultimo snapshot valido dell'area.
     """
     if not request.cap and not request.city:
         raise HTTPException(
@@ -56,37 +128,83 @@ async def search_pharmacies(request: ScrapeRequest):
             detail=f"Formato data/ora non valido: {str(e)}"
         )
 
+    def load_slot_snapshot(area: str, slot: datetime):
+        """Snapshot persisted for exactly this slot."""
+        snapshot = snapshot_store.get_snapshot(db, area, slot)
+        if snapshot is None:
+            return None
+        return snapshot_store.load_pharmacies(snapshot), snapshot.fetched_at
+
+    def load_last_good_snapshot(area: str, slot: datetime):
+        """Last persisted snapshot for the slot, or the latest for the area."""
+        snapshot = snapshot_store.get_snapshot(db, area, slot) or snapshot_store.get_latest_snapshot(db, area)
+        if snapshot is None:
+            return None
+        return snapshot_store.load_pharmacies(snapshot), snapshot.fetched_at
+
     try:
-        pharmacies = await scraping_service.search_pharmacies(
+        result = await scrape_cache.get(
             cap=request.cap,
             city=request.city,
             search_date=search_date,
-            search_time=search_time
+            search_time=search_time,
+            persisted=load_slot_snapshot,
+            fallback=load_last_good_snapshot
         )
-
-        return ScrapeResponse(
-            pharmacies=pharmacies,
-            total=len(pharmacies),
-            search_params={
-                "cap": request.cap,
-                "city": request.city,
-                "date": search_date.isoformat() if search_date else datetime.now().date().isoformat(),
-                "time": search_time.isoformat() if search_time else datetime.now().time().strftime("%H:%M")
-            }
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Servizio farmaciediturno.org non disponibile, riprovare più tardi",
+            headers={"Retry-After": str(e.retry_after)}
         )
-
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Errore durante lo scraping: {str(e)}"
         )
 
+    pharmacies = result.pharmacies
+
+    # Persist fresh scrapes (deduplicated by content hash); never fail the search for it
+    content_hash = None
+    changed = None
+    try:
+        if result.refreshed:
+            saved = snapshot_store.save_snapshot(db, result.area, result.slot, pharmacies)
+            content_hash = saved.snapshot.content_hash
+            changed = saved.changed
+        else:
+            snapshot = snapshot_store.get_snapshot(db, result.area, result.slot)
+            content_hash = snapshot.content_hash if snapshot else None
+    except Exception as e:
+        db.rollback()
+        print(f"Warning: Could not save scrape snapshot: {e}")
+
+    origin = db.get(Pharmacy, request.pharmacy_id) if request.pharmacy_id else None
+    pharmacies = enrich_pharmacies(db, pharmacies, origin)
+
+    return ScrapeResponse(
+        pharmacies=pharmacies,
+        total=len(pharmacies),
+        search_params={
+            "cap": request.cap,
+            "city": request.city,
+            "date": search_date.isoformat() if search_date else datetime.now().date().isoformat(),
+            "time": search_time.isoformat() if search_time else datetime.now().time().strftime("%H:%M")
+        },
+        content_hash=content_hash,
+        changed=changed,
+        stale=result.stale,
+        fetched_at=result.fetched_at
+    )
+
 
 @router.get("/test", response_model=ScrapeResponse)
 async def test_scraping(
     cap: str = Query(..., description="CAP per test"),
     date_str: Optional[str] = Query(None, description="Data (YYYY-MM-DD)"),
-    time_str: Optional[str] = Query(None, description="Ora (HH:MM)")
+    time_str: Optional[str] = Query(None, description="Ora (HH:MM)"),
+    db: Session = Depends(get_db)
 ):
     """
     Endpoint di test per scraping rapido.
@@ -99,4 +217,87 @@ async def test_scraping(
         search_time=time_str
     )
 
-    return await search_pharmacies(request)
+    return await search_pharmacies(request, db)
+
+
+@router.get("/pool-stats")
+async def get_pool_stats() -> dict:
+    """
+    Statistiche del connection pool HTTP verso farmaciediturno.org.
+
+    Include limiti configurati, connessioni aperte/idle/HTTP2, richieste
+    in coda e contatori di richieste, risposte 304 ed errori, oltre allo
+    stato della cache stale-while-revalidate e del circuit breaker.
+    """
+    return {**scraping_service.get_pool_stats(), "cache": scrape_cache.get_stats()}
+
+
+@router.get("/snapshots", response_model=List[SnapshotInfo])
+async def list_snapshots(
+    cap: Optional[str] = Query(None, description="CAP dell'area"),
+    city: Optional[str] = Query(None, description="Città dell'area"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Elenca gli snapshot salvati per un'area (slot più recente per primo).
+    """
+    if not cap and not city:
+        raise HTTPException(
+            status_code=400,
+            detail="Deve essere specificato almeno CAP o città"
+        )
+
+    area = snapshot_store.normalize_area(cap, city)
+    return snapshot_store.list_snapshots(db, area, limit)
+
+
+@router.get("/snapshots/diff", response_model=SnapshotDiffResponse)
+async def diff_snapshots(
+    to_slot: str = Query(..., description="Slot di arrivo (YYYY-MM-DDTHH:MM)"),
+    from_slot: Optional[str] = Query(None, description="Slot di partenza (default: snapshot precedente)"),
+    cap: Optional[str] = Query(None, description="CAP dell'area"),
+    city: Optional[str] = Query(None, description="Città dell'area"),
+    db: Session = Depends(get_db)
+):
+    """
+    Restituisce cosa è cambiato tra due slot di un'area.
+
+    Se from_slot non è indicato, il confronto avviene con lo snapshot
+    precedente a to_slot. Snapshot con lo stesso content hash non vengono
+    decompressi e producono un diff vuoto.
+
+    Esempio: /api/v1/scraping/snapshots/diff?cap=21049&to_slot=2025-11-11T22:00
+    """
+    if not cap and not city:
+        raise HTTPException(
+            status_code=400,
+            detail="Deve essere specificato almeno CAP o città"
+        )
+
+    area = snapshot_store.normalize_area(cap, city)
+
+    new = snapshot_store.get_snapshot(db, area, _parse_slot(to_slot))
+    if not new:
+        raise HTTPException(status_code=404, detail="Snapshot non trovato per to_slot")
+
+    if from_slot:
+        old = snapshot_store.get_snapshot(db, area, _parse_slot(from_slot))
+        if not old:
+            raise HTTPException(status_code=404, detail="Snapshot non trovato per from_slot")
+    else:
+        old = snapshot_store.get_previous_snapshot(db, area, new.slot)
+
+    diff = snapshot_store.diff_snapshots(old, new)
+
+    return SnapshotDiffResponse(
+        area=area,
+        from_slot=old.slot if old else None,
+        to_slot=new.slot,
+        from_hash=diff.from_hash,
+        to_hash=diff.to_hash,
+        has_changes=diff.has_changes,
+        added=diff.added,
+        removed=diff.removed,
+        changed=diff.changed
+    )
@@ -0,0 +1,84 @@
+"""Security events API endpoints (admin only)."""
+
+from datetime import timedelta
+from typing import List, Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import require_admin
+from app.core.principal_cache import Principal
+from app.core.security_logging import SecurityEventType
+from app.schemas.security_event import (
+    SecurityEventAggregateItem,
+    SecurityEventAggregateResponse,
+    SecurityEventResponse,
+)
+from app.services.security_event_store import aggregate_events, list_events
+
+router = APIRouter(prefix="/security-events", tags=["security-events"])
+
+# Up to one week
+MAX_WINDOW_MINUTES = 7 * 24 * 60
+
+
+@router.get("/", response_model=List[SecurityEventResponse])
+async def get_security_events(
+    window_minutes: int = Query(60, ge=1, le=MAX_WINDOW_MINUTES, description="Window length, ending now"),
+    event_type: SecurityEventType | None = Query(None, description="Filter by event type"),
+    username: str | None = Query(None, description="Filter by username"),
+    ip_address: str | None = Query(None, description="Filter by IP address"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of events to return"),
+    db: Session = Depends(get_db),
+    _: Principal = Depends(require_admin)
+):
+    """
+    List the most recent security events.
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    return list_events(
+        db,
+        timedelta(minutes=window_minutes),
+        event_type=event_type.value if event_type else None,
+        username=username,
+        ip_address=ip_address,
+        limit=limit
+    )
+
+
+@router.get("/aggregate", response_model=SecurityEventAggregateResponse)
+async def aggregate_security_events(
+    group_by: Literal["ip_address", "username", "event_type"] = Query("ip_address", description="Column to group by"),
+    event_type: SecurityEventType | None = Query(None, description="Filter by event type"),
+    window_minutes: int = Query(60, ge=1, le=MAX_WINDOW_MINUTES, description="Window length, ending now"),
+    min_count: int = Query(1, ge=1, description="Drop groups with fewer events"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of groups to return"),
+    db: Session = Depends(get_db),
+    _: Principal = Depends(require_admin)
+):
+    """
+    Count security events per IP, username or type within a window.
+
+    Example: failed logins per IP in the last hour is
+    `?event_type=login_failure&group_by=ip_address&window_minutes=60`.
+
+    RBAC:
+    - Only admins can access this endpoint
+    """
+    aggregates = aggregate_events(
+        db,
+        timedelta(minutes=window_minutes),
+        group_by=group_by,
+        event_type=event_type.value if event_type else None,
+        min_count=min_count,
+        limit=limit
+    )
+    return SecurityEventAggregateResponse(
+        group_by=group_by,
+        event_type=event_type.value if event_type else None,
+        window_minutes=window_minutes,
+        items=[SecurityEventAggregateItem.model_validate(item) for item in aggregates]
+    )
@@ -6,12 +6,14 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.shift import Shift
 from app.schemas.shift import ShiftCreate, ShiftUpdate, ShiftResponse
 from app.dependencies import CurrentUser, get_current_user
-from app.models.user import User
-from app.api.v1.pharmacies import require_pharmacy_access
+from app.core.principal_cache import Principal
+from app.core.pharmacy_ownership import check_pharmacy_access
+from app.services.display_cache import display_cache
+from app.utils.fast_json import FastJSONResponse, serialize_rows
 
 router = APIRouter(prefix="/shifts", tags=["shifts"])
 
@@ -21,8 +23,8 @@ async def list_shifts(
     pharmacy_id: UUID = Query(..., description="Pharmacy UUID"),
     start_date: date = Query(..., description="Start date (ISO 8601)"),
     end_date: date = Query(..., description="End date (ISO 8601)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     List shifts for a pharmacy within a date range.
@@ -37,7 +39,7 @@ async def list_shifts(
     - end_date: End date in ISO 8601 format (required)
     """
     # Verify pharmacy access
-    await require_pharmacy_access(pharmacy_id, current_user, db)
+    check_pharmacy_access(db, pharmacy_id, current_user)
 
     # Validate date range
     if end_date < start_date:
@@ -53,14 +55,14 @@ async def list_shifts(
         Shift.date <= end_date
     ).order_by(Shift.date, Shift.start_time).all()
 
-    return shifts
+    return FastJSONResponse(serialize_rows(shifts, ShiftResponse))
 
 
 @router.post("/", response_model=ShiftResponse, status_code=status.HTTP_201_CREATED)
 async def create_shift(
     shift_in: ShiftCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Create a new shift.
@@ -76,7 +78,7 @@ async def create_shift(
     - Monthly on first Monday: FREQ=MONTHLY;BYDAY=1MO
     """
     # Verify pharmacy access
-    await require_pharmacy_access(shift_in.pharmacy_id, current_user, db)
+    check_pharmacy_access(db, shift_in.pharmacy_id, current_user)
 
     # Validate time range
     if shift_in.end_time <= shift_in.start_time:
@@ -112,6 +114,8 @@ async def create_shift(
     db.commit()
     db.refresh(shift)
 
+    display_cache.invalidate(shift.pharmacy_id)
+
     return shift
 
 
@@ -119,7 +123,7 @@ async def create_shift(
 async def get_shift(
     shift_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get shift details.
@@ -137,7 +141,7 @@ async def get_shift(
         )
 
     # Verify pharmacy access
-    await require_pharmacy_access(shift.pharmacy_id, current_user, db)
+    check_pharmacy_access(db, shift.pharmacy_id, current_user)
 
     return shift
 
@@ -147,7 +151,7 @@ async def update_shift(
     shift_id: UUID,
     shift_in: ShiftUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update shift information.
@@ -168,7 +172,7 @@ async def update_shift(
         )
 
     # Verify pharmacy access
-    await require_pharmacy_access(shift.pharmacy_id, current_user, db)
+    check_pharmacy_access(db, shift.pharmacy_id, current_user)
 
     # Validate time range if times are being updated
     new_start = shift_in.start_time if shift_in.start_time is not None else shift.start_time
@@ -202,6 +206,8 @@ async def update_shift(
     db.commit()
     db.refresh(shift)
 
+    display_cache.invalidate(shift.pharmacy_id)
+
     return shift
 
 
@@ -209,7 +215,7 @@ async def update_shift(
 async def delete_shift(
     shift_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Delete shift.
@@ -226,9 +232,12 @@ async def delete_shift(
         )
 
     # Verify pharmacy access
-    await require_pharmacy_access(shift.pharmacy_id, current_user, db)
+    check_pharmacy_access(db, shift.pharmacy_id, current_user)
 
+    pharmacy_id = shift.pharmacy_id
     db.delete(shift)
     db.commit()
 
+    display_cache.invalidate(pharmacy_id)
+
     return None
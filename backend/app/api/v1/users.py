@@ -6,12 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
 from app.dependencies import get_current_user, require_admin
+from app.core.principal_cache import Principal, principal_cache
 from app.utils.pagination import paginate, PaginatedResponse
-from app.services.authentication import AuthenticationService
+from app.utils.security import get_password_hash_async
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -22,8 +23,8 @@ async def list_users(
     limit: int = Query(20, ge=1, le=100, description="Maximum number of items to return"),
     search: str | None = Query(None, description="Search in username, email, or city"),
     role: UserRole | None = Query(None, description="Filter by role"),
-    db: Session = Depends(get_db),
-    _: User = Depends(require_admin)
+    db: Session = Depends(get_read_db),
+    _: Principal = Depends(require_admin)
 ):
     """
     List users with pagination and search.
@@ -66,7 +67,7 @@ async def list_users(
 async def create_user(
     user_in: UserCreate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_admin)
+    _: Principal = Depends(require_admin)
 ):
     """
     Create a new user.
@@ -97,8 +98,7 @@ async def create_user(
             )
 
     # Hash password
-    auth_service = AuthenticationService()
-    password_hash = auth_service.get_password_hash(user_in.password)
+    password_hash = await get_password_hash_async(user_in.password)
 
     # Create user
     user_data = user_in.dict(exclude={"password"})
@@ -118,7 +118,7 @@ async def create_user(
 async def get_user(
     user_id: UUID,
     db: Session = Depends(get_db),
-    _: User = Depends(require_admin)
+    _: Principal = Depends(require_admin)
 ):
     """
     Get user details.
@@ -142,7 +142,7 @@ async def update_user(
     user_id: UUID,
     user_in: UserUpdate,
     db: Session = Depends(get_db),
-    _: User = Depends(require_admin)
+    _: Principal = Depends(require_admin)
 ):
     """
     Update user information.
@@ -185,8 +185,7 @@ async def update_user(
 
     # Handle password change if provided
     if 'password' in update_data and update_data['password']:
-        auth_service = AuthenticationService()
-        password_hash = auth_service.get_password_hash(update_data['password'])
+        password_hash = await get_password_hash_async(update_data['password'])
         setattr(user, 'password_hash', password_hash)
         # Remove password from update_data as it's already handled
         del update_data['password']
@@ -198,6 +197,9 @@ async def update_user(
     db.commit()
     db.refresh(user)
 
+    # Role, status or password may have changed
+    principal_cache.invalidate_user(user.id)
+
     return user
 
 
@@ -205,7 +207,7 @@ async def update_user(
 async def delete_user(
     user_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: Principal = Depends(require_admin)
 ):
     """
     Delete user (soft delete).
@@ -243,4 +245,6 @@ async def delete_user(
 
     db.commit()
 
+    principal_cache.invalidate_user(user.id)
+
     return None
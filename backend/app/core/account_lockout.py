@@ -2,18 +2,65 @@
 Account Lockout Mechanism
 Implements brute force protection through Redis-based account lockout
 """
-import json
-from datetime import datetime, timedelta
+from dataclasses import dataclass
 from typing import Optional, Dict
 from fastapi import HTTPException, status
 import redis.asyncio as redis
 
+from app.core.redis_pool import redis_pool
+
 
 # Lockout configuration
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_DURATION_MINUTES = 15
 ATTEMPT_WINDOW_MINUTES = 30
 
+# Lockout state lives in one hash per user: {attempts, locked}. The key TTL is
+# the attempt window while counting failures, then the lockout duration once
+# locked, so Redis expires both natively.
+#
+# KEYS[1] = state key
+# ARGV    = operation ("check" | "fail"), max attempts, window seconds, lockout seconds
+# Returns {locked (0/1), failed attempts, remaining lockout seconds, just locked (0/1)}
+LOCKOUT_SCRIPT = """
+local key = KEYS[1]
+local attempts = tonumber(redis.call('HGET', key, 'attempts') or '0')
+
+if redis.call('HGET', key, 'locked') == '1' then
+    local ttl = redis.call('TTL', key)
+    if ttl > 0 then
+        return {1, attempts, ttl, 0}
+    end
+end
+
+if ARGV[1] == 'check' then
+    return {0, attempts, 0, 0}
+end
+
+attempts = redis.call('HINCRBY', key, 'attempts', 1)
+if attempts == 1 then
+    redis.call('EXPIRE', key, tonumber(ARGV[3]))
+end
+
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('HSET', key, 'locked', '1')
+    redis.call('EXPIRE', key, tonumber(ARGV[4]))
+    return {1, attempts, tonumber(ARGV[4]), 1}
+end
+
+return {0, attempts, 0, 0}
+"""
+
+
+@dataclass(frozen=True)
+class LockoutState:
+    """Lockout state of an account."""
+
+    locked: bool
+    failed_attempts: int
+    remaining_seconds: Optional[int] = None  # Set only while locked
+    just_locked: bool = False  # True if this failed attempt caused the lockout
+
 
 class AccountLockoutManager:
     """
@@ -28,53 +75,75 @@ class AccountLockoutManager:
         Initialize the account lockout manager.
 
         Args:
-            redis_client: Redis client instance (optional, will create if None)
+            redis_client: Redis client instance (optional, defaults to the shared pool)
         """
         self.redis_client = redis_client
         self.max_failed_attempts = MAX_FAILED_ATTEMPTS
         self.lockout_duration_minutes = LOCKOUT_DURATION_MINUTES
         self.attempt_window_minutes = ATTEMPT_WINDOW_MINUTES
+        self._script = None
 
-    async def _get_redis_client(self) -> redis.Redis:
+    def _get_state_key(self, username: str) -> str:
         """
-        Get or create Redis client.
+        Generate Redis key for the lockout state hash.
+
+        Args:
+            username: Username to track
 
         Returns:
-            Redis client instance
+            Redis key string
         """
-        if self.redis_client is None:
-            # Create Redis client with connection pooling
-            self.redis_client = await redis.from_url(
-                "redis://localhost:6379",
-                encoding="utf-8",
-                decode_responses=True,
-                max_connections=10
-            )
-        return self.redis_client
+        return f"auth:lockout_state:{username.lower()}"
 
-    def _get_failed_attempts_key(self, username: str) -> str:
+    async def _run_script(self, username: str, operation: str) -> LockoutState:
         """
-        Generate Redis key for failed attempts counter.
+        Read or update lockout state with the Lua script (one round-trip).
 
         Args:
-            username: Username to track
+            username: Username to check or update
+            operation: "check" or "fail"
 
         Returns:
-            Redis key string
+            Lockout state after the operation
         """
-        return f"auth:failed_attempts:{username.lower()}"
-
-    def _get_lockout_key(self, username: str) -> str:
+        keys = [self._get_state_key(username)]
+        args = [
+            operation,
+            self.max_failed_attempts,
+            self.attempt_window_minutes * 60,
+            self.lockout_duration_minutes * 60
+        ]
+
+        async def run(client: redis.Redis):
+            # EVALSHA, loading the script on the first NOSCRIPT
+            if self._script is None:
+                self._script = client.register_script(LOCKOUT_SCRIPT)
+            return await self._script(keys=keys, args=args, client=client)
+
+        if self.redis_client is not None:
+            result = await run(self.redis_client)
+        else:
+            result = await redis_pool.call(run)
+
+        locked, attempts, remaining, just_locked = (int(value) for value in result)
+        return LockoutState(
+            locked=bool(locked),
+            failed_attempts=attempts,
+            remaining_seconds=remaining if locked else None,
+            just_locked=bool(just_locked)
+        )
+
+    async def check(self, username: str) -> LockoutState:
         """
-        Generate Redis key for lockout status.
+        Get the lockout state of an account in one Redis round-trip.
 
         Args:
-            username: Username to lock out
+            username: Username to check
 
         Returns:
-            Redis key string
+            Lockout state
         """
-        return f"auth:lockout:{username.lower()}"
+        return await self._run_script(username, "check")
 
     async def is_locked_out(self, username: str) -> bool:
         """
@@ -86,31 +155,7 @@ class AccountLockoutManager:
         Returns:
             True if account is locked out, False otherwise
         """
-        client = await self._get_redis_client()
-        lockout_key = self._get_lockout_key(username)
-
-        # Check if lockout key exists
-        lockout_data = await client.get(lockout_key)
-
-        if lockout_data:
-            # Parse lockout data
-            try:
-                lockout_info = json.loads(lockout_data)
-                lockout_until = datetime.fromisoformat(lockout_info["locked_until"])
-
-                # Check if lockout has expired
-                if datetime.utcnow() < lockout_until:
-                    return True
-                else:
-                    # Lockout expired, clean up
-                    await client.delete(lockout_key)
-                    return False
-            except (json.JSONDecodeError, KeyError, ValueError):
-                # Invalid data, clean up
-                await client.delete(lockout_key)
-                return False
-
-        return False
+        return (await self.check(username)).locked
 
     async def get_lockout_remaining_time(self, username: str) -> Optional[int]:
         """
@@ -122,24 +167,7 @@ class AccountLockoutManager:
         Returns:
             Remaining seconds if locked out, None otherwise
         """
-        client = await self._get_redis_client()
-        lockout_key = self._get_lockout_key(username)
-
-        lockout_data = await client.get(lockout_key)
-
-        if lockout_data:
-            try:
-                lockout_info = json.loads(lockout_data)
-                lockout_until = datetime.fromisoformat(lockout_info["locked_until"])
-                now = datetime.utcnow()
-
-                if now < lockout_until:
-                    remaining = (lockout_until - now).total_seconds()
-                    return int(remaining)
-            except (json.JSONDecodeError, KeyError, ValueError):
-                pass
-
-        return None
+        return (await self.check(username)).remaining_seconds
 
     async def record_failed_attempt(self, username: str) -> Dict:
         """
@@ -154,65 +182,37 @@ class AccountLockoutManager:
         Raises:
             HTTPException: If account is locked out (429 Too Many Requests)
         """
-        client = await self._get_redis_client()
-        attempts_key = self._get_failed_attempts_key(username)
-        lockout_key = self._get_lockout_key(username)
+        state = await self._run_script(username, "fail")
 
-        # Check if already locked out
-        if await self.is_locked_out(username):
-            remaining_time = await self.get_lockout_remaining_time(username)
+        if state.just_locked:
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail={
                     "error": "account_locked",
-                    "message": f"Account locked due to too many failed login attempts. Try again in {remaining_time} seconds.",
-                    "locked_until_seconds": remaining_time,
-                    "locked_until_minutes": round(remaining_time / 60, 1)
+                    "message": f"Account locked due to {self.max_failed_attempts} failed login attempts. Try again in {self.lockout_duration_minutes} minutes.",
+                    "locked_until_seconds": self.lockout_duration_minutes * 60,
+                    "locked_until_minutes": self.lockout_duration_minutes
                 }
             )
 
-        # Increment failed attempts counter
-        attempts = await client.incr(attempts_key)
-
-        # Set expiry on first attempt (sliding window)
-        if attempts == 1:
-            await client.expire(attempts_key, self.attempt_window_minutes * 60)
-
-        # Check if lockout threshold exceeded
-        if attempts >= self.max_failed_attempts:
-            # Lock the account
-            lockout_until = datetime.utcnow() + timedelta(minutes=self.lockout_duration_minutes)
-            lockout_data = {
-                "locked_until": lockout_until.isoformat(),
-                "failed_attempts": attempts,
-                "locked_at": datetime.utcnow().isoformat()
-            }
-
-            await client.setex(
-                lockout_key,
-                self.lockout_duration_minutes * 60,
-                json.dumps(lockout_data)
-            )
-
-            # Reset failed attempts counter
-            await client.delete(attempts_key)
-
+        if state.locked:
+            remaining_time = state.remaining_seconds
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail={
                     "error": "account_locked",
-                    "message": f"Account locked due to {self.max_failed_attempts} failed login attempts. Try again in {self.lockout_duration_minutes} minutes.",
-                    "locked_until_seconds": self.lockout_duration_minutes * 60,
-                    "locked_until_minutes": self.lockout_duration_minutes
+                    "message": f"Account locked due to too many failed login attempts. Try again in {remaining_time} seconds.",
+                    "locked_until_seconds": remaining_time,
+                    "locked_until_minutes": round(remaining_time / 60, 1)
                 }
             )
 
         # Return current attempt count
         return {
             "locked": False,
-            "failed_attempts": attempts,
+            "failed_attempts": state.failed_attempts,
             "max_attempts": self.max_failed_attempts,
-            "remaining_attempts": self.max_failed_attempts - attempts,
+            "remaining_attempts": self.max_failed_attempts - state.failed_attempts,
             "window_minutes": self.attempt_window_minutes
         }
 
@@ -223,13 +223,11 @@ class AccountLockoutManager:
         Args:
             username: Username to reset
         """
-        client = await self._get_redis_client()
-        attempts_key = self._get_failed_attempts_key(username)
-        lockout_key = self._get_lockout_key(username)
-
-        # Delete both keys
-        await client.delete(attempts_key)
-        await client.delete(lockout_key)
+        key = self._get_state_key(username)
+        if self.redis_client is not None:
+            await self.redis_client.delete(key)
+        else:
+            await redis_pool.call(lambda client: client.delete(key))
 
     async def get_failed_attempts_count(self, username: str) -> int:
         """
@@ -241,11 +239,7 @@ class AccountLockoutManager:
         Returns:
             Number of failed attempts in current window
         """
-        client = await self._get_redis_client()
-        attempts_key = self._get_failed_attempts_key(username)
-
-        attempts = await client.get(attempts_key)
-        return int(attempts) if attempts else 0
+        return (await self.check(username)).failed_attempts
 
     async def unlock_account(self, username: str) -> None:
         """
@@ -266,16 +260,14 @@ class AccountLockoutManager:
         Returns:
             Dictionary with lockout status and details
         """
-        is_locked = await self.is_locked_out(username)
-        failed_attempts = await self.get_failed_attempts_count(username)
-        remaining_time = await self.get_lockout_remaining_time(username)
+        state = await self.check(username)
 
         return {
             "username": username,
-            "is_locked": is_locked,
-            "failed_attempts": failed_attempts,
+            "is_locked": state.locked,
+            "failed_attempts": state.failed_attempts,
             "max_attempts": self.max_failed_attempts,
-            "remaining_time_seconds": remaining_time,
+            "remaining_time_seconds": state.remaining_seconds,
             "lockout_duration_minutes": self.lockout_duration_minutes,
             "attempt_window_minutes": self.attempt_window_minutes
         }
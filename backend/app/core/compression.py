@@ -0,0 +1,193 @@
+"""
+Response Compression
+gzip/brotli negotiated per request, and precompressed bodies for cached payloads
+"""
+import gzip
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional: without it only gzip is offered
+    brotli = None
+
+settings = get_settings()
+
+GZIP = "gzip"
+BROTLI = "br"
+
+# Preferred first when the client accepts several with the same weight
+SUPPORTED_ENCODINGS: Tuple[str, ...] = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Returns:
+        "br" or "gzip", or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, precompress: bool = False) -> bytes:
+    """
+    Compress a body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "br" or "gzip"
+        precompress: Use the slow, high ratio settings (body compressed once
+            and served many times)
+    """
+    if encoding == BROTLI:
+        quality = 11 if precompress else settings.COMPRESSION_BROTLI_QUALITY
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=quality)
+    level = 9 if precompress else settings.COMPRESSION_GZIP_LEVEL
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class PrecompressedBody:
+    """
+    One version of a payload with its compressed variants.
+
+    Each encoding is compressed once, the first time a client asks for it,
+    then reused for every later response of the same version.
+    """
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def for_encoding(self, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+        """
+        Body to send for a negotiated encoding.
+
+        Returns:
+            (bytes, Content-Encoding or None)
+        """
+        if encoding is None or len(self.body) < settings.COMPRESSION_MIN_SIZE:
+            return self.body, None
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is None:
+                    variant = self._variants[encoding] = compress(self.body, encoding, precompress=True)
+        return variant, encoding
+
+
+def precompressed_response(request: Request, payload: PrecompressedBody, media_type: str, etag: str) -> Response:
+    """
+    Response for a precompressed payload: 304 if the client has this
+    version, else the variant for its Accept-Encoding.
+
+    Args:
+        request: The request (Accept-Encoding, If-None-Match)
+        payload: The payload version
+        media_type: Content type of the uncompressed body
+        etag: Weak ETag of the version (valid for every encoding)
+    """
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding")) if settings.COMPRESSION_ENABLED else None
+    body, content_encoding = payload.for_encoding(encoding)
+    if content_encoding:
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses the client accepts compressed.
+
+    Only complete (single message) bodies of compressible types, at least
+    COMPRESSION_MIN_SIZE bytes, are compressed; streamed responses (file
+    downloads, ranges) and responses that already carry a Content-Encoding
+    (precompressed payloads) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: List[Message] = []
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.append(message)  # Held until the body shows if it is worth compressing
+                return
+            if not start:
+                await send(message)
+                return
+
+            start_message = start.pop()
+            start_message = {**start_message, "headers": list(start_message.get("headers", []))}
+            headers = MutableHeaders(raw=start_message["headers"])
+            body = message.get("body", b"")
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or "content-encoding" in headers
+                or start_message["status"] in (204, 206, 304)
+                or not is_compressible(headers.get("content-type"))
+            ):
+                await send(start_message)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= settings.COMPRESSION_MIN_SIZE:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    headers["ETag"] = "W/" + headers["etag"]  # Same content, other bytes
+            await send(start_message)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,149 @@
+"""
+Database Connection Pool
+Pool settings (including PgBouncer transaction pooling) and pool usage statistics
+"""
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.config import get_settings
+from app.core.metrics import record_pool_checkout, record_pool_connect, record_pool_usage, record_pool_wait
+
+settings = get_settings()
+
+
+@dataclass
+class PoolStats:
+    """Connection counters of one pool (this worker process)."""
+
+    checkouts: int = 0
+    connections_opened: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    timeouts: int = 0
+
+
+_stats: Dict[str, PoolStats] = {}
+_stats_lock = threading.Lock()
+
+
+def _pool_stats(name: str) -> PoolStats:
+    with _stats_lock:
+        return _stats.setdefault(name, PoolStats())
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times the checkouts that had to wait.
+
+    A checkout waits when every pooled connection is in use and the overflow
+    is exhausted: the request then blocks up to pool_timeout seconds, which
+    is the signal that the pool (or the database budget) is too small.
+    """
+
+    def _do_get(self):
+        if self._max_overflow < 0 or self.overflow() < self._max_overflow or self.checkedin() > 0:
+            return super()._do_get()
+
+        stats = _pool_stats(self.logging_name)
+        started_at = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            with _stats_lock:
+                stats.waits += 1
+                stats.wait_seconds += elapsed
+                stats.timeouts += timed_out
+            record_pool_wait(self.logging_name, elapsed, timed_out)
+
+
+def engine_options(url: str, name: str) -> Dict[str, Any]:
+    """
+    create_engine arguments for the configured pool mode.
+
+    Per worker process, the pool opens up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+    connections. DB_NULL_POOL opens one per checkout and closes it after
+    (for a pooler such as PgBouncer in front of the database).
+    DB_TRANSACTION_POOLING turns off server-side prepared statements: with
+    PgBouncer pool_mode=transaction, consecutive transactions may run on
+    different server connections (psycopg2 binds client-side already).
+
+    Args:
+        url: Database URL
+        name: Pool name in statistics and metrics
+    """
+    options: Dict[str, Any] = {"pool_logging_name": name}
+    if settings.DB_NULL_POOL:
+        # A fresh connection per checkout: nothing to pre-ping or recycle
+        options["poolclass"] = NullPool
+    elif make_url(url).get_backend_name() == "sqlite":
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    else:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+
+    if settings.DB_TRANSACTION_POOLING and make_url(url).get_driver_name() == "psycopg":
+        options["connect_args"] = {"prepare_threshold": None}
+    return options
+
+
+def create_pooled_engine(url: str, name: str) -> Engine:
+    """Engine with the configured pool, reporting its usage under `name`."""
+    engine = create_engine(url, **engine_options(url, name))
+    stats = _pool_stats(name)
+
+    def usage(pool) -> tuple:
+        if isinstance(pool, QueuePool):
+            return pool.checkedout(), max(pool.overflow(), 0)
+        return 0, 0
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        with _stats_lock:
+            stats.connections_opened += 1
+        record_pool_connect(name)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _stats_lock:
+            stats.checkouts += 1
+        record_pool_checkout(name, *usage(engine.pool))
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        record_pool_usage(name, *usage(engine.pool))
+
+    return engine
+
+
+def get_pool_stats(engine: Engine) -> Dict[str, Any]:
+    """Configuration, current usage and counters of an engine's pool."""
+    pool = engine.pool
+    result: Dict[str, Any] = {"name": pool.logging_name, "class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        result.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    result.update(asdict(_pool_stats(pool.logging_name)))
+    return result
@@ -0,0 +1,269 @@
+"""
+Request Metrics
+Prometheus instrumentation of HTTP requests and the database/Redis work they do
+"""
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+    )
+except ImportError:  # prometheus_client is optional: without it nothing is recorded
+    REGISTRY = None
+
+settings = get_settings()
+
+METRICS_PATH = "/metrics"
+
+# With several workers (uvicorn --workers N) each process writes its samples
+# to this directory and /metrics aggregates them. prometheus_client reads it
+# from the process environment, so it must be set there, not in .env.
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# Bound label cardinality: other methods are reported as "OTHER"
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS_AVAILABLE = REGISTRY is not None
+
+if METRICS_AVAILABLE:
+    REQUESTS = Counter(
+        "http_requests_total", "HTTP requests", ["method", "route", "status"]
+    )
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds", "HTTP request latency", ["method", "route"], buckets=LATENCY_BUCKETS
+    )
+    REQUESTS_IN_PROGRESS = Gauge(
+        "http_requests_in_progress", "HTTP requests being served", ["method"], multiprocess_mode="livesum"
+    )
+    RESPONSE_SIZE = Histogram(
+        "http_response_size_bytes", "HTTP response body size", ["method", "route"], buckets=SIZE_BUCKETS
+    )
+    REQUEST_DB_QUERIES = Histogram(
+        "http_request_db_queries", "Database queries per request", ["route"], buckets=COUNT_BUCKETS
+    )
+    REQUEST_DB_TIME = Histogram(
+        "http_request_db_seconds", "Database time per request", ["route"], buckets=LATENCY_BUCKETS
+    )
+    REQUEST_REDIS_CALLS = Histogram(
+        "http_request_redis_calls", "Redis round-trips per request", ["route"], buckets=COUNT_BUCKETS
+    )
+    DB_QUERY_LATENCY = Histogram(
+        "db_query_duration_seconds", "Database statement latency", buckets=LATENCY_BUCKETS
+    )
+    REDIS_CALL_LATENCY = Histogram(
+        "redis_call_duration_seconds", "Redis round-trip latency", buckets=LATENCY_BUCKETS
+    )
+    DB_POOL_CHECKOUTS = Counter(
+        "db_pool_checkouts_total", "Database connections checked out of the pool", ["pool"]
+    )
+    DB_POOL_CONNECTIONS_OPENED = Counter(
+        "db_pool_connections_opened_total", "Database connections opened", ["pool"]
+    )
+    DB_POOL_WAITS = Counter(
+        "db_pool_waits_total", "Checkouts that waited for a connection (pool and overflow in use)", ["pool"]
+    )
+    DB_POOL_TIMEOUTS = Counter(
+        "db_pool_timeouts_total", "Checkouts that gave up waiting for a connection", ["pool"]
+    )
+    DB_POOL_WAIT_TIME = Histogram(
+        "db_pool_wait_seconds", "Time waited for a database connection", ["pool"], buckets=LATENCY_BUCKETS
+    )
+    DB_POOL_IN_USE = Gauge(
+        "db_pool_connections_in_use", "Database connections checked out", ["pool"], multiprocess_mode="livesum"
+    )
+    DB_POOL_OVERFLOW = Gauge(
+        "db_pool_overflow_connections", "Database connections open beyond the pool size", ["pool"],
+        multiprocess_mode="livesum"
+    )
+
+
+@dataclass
+class RequestStats:
+    """Database and Redis work done while serving one request."""
+
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    redis_calls: int = 0
+    redis_seconds: float = 0.0
+
+
+# Stats of the request being served; copied into threadpool workers with the context
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, None outside a request."""
+    return _current_request.get()
+
+
+def record_redis_call(elapsed: float) -> None:
+    """
+    Record one Redis round-trip (called by the shared Redis pool).
+
+    Args:
+        elapsed: Round-trip time in seconds
+    """
+    stats = _current_request.get()
+    if stats is not None:
+        stats.redis_calls += 1
+        stats.redis_seconds += elapsed
+    if METRICS_AVAILABLE and settings.METRICS_ENABLED:
+        REDIS_CALL_LATENCY.observe(elapsed)
+
+
+def record_pool_checkout(pool: str, in_use: int, overflow: int) -> None:
+    """Record a connection checkout and the pool usage after it."""
+    if METRICS_AVAILABLE and settings.METRICS_ENABLED:
+        DB_POOL_CHECKOUTS.labels(pool).inc()
+        record_pool_usage(pool, in_use, overflow)
+
+
+def record_pool_usage(pool: str, in_use: int, overflow: int) -> None:
+    """Record the connections in use and in overflow."""
+    if METRICS_AVAILABLE and settings.METRICS_ENABLED:
+        DB_POOL_IN_USE.labels(pool).set(in_use)
+        DB_POOL_OVERFLOW.labels(pool).set(overflow)
+
+
+def record_pool_connect(pool: str) -> None:
+    """Record a new database connection."""
+    if METRICS_AVAILABLE and settings.METRICS_ENABLED:
+        DB_POOL_CONNECTIONS_OPENED.labels(pool).inc()
+
+
+def record_pool_wait(pool: str, elapsed: float, timed_out: bool) -> None:
+    """Record a checkout that had to wait for a connection."""
+    if METRICS_AVAILABLE and settings.METRICS_ENABLED:
+        DB_POOL_WAITS.labels(pool).inc()
+        DB_POOL_WAIT_TIME.labels(pool).observe(elapsed)
+        if timed_out:
+            DB_POOL_TIMEOUTS.labels(pool).inc()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "_metrics_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+
+    stats = _current_request.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+    if METRICS_AVAILABLE and settings.METRICS_ENABLED:
+        DB_QUERY_LATENCY.observe(elapsed)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status, response size and in-flight
+    requests per route, plus the database queries and Redis round-trips each
+    request made.
+
+    Routes are labelled with their path template (e.g.
+    /api/v1/display/{pharmacy_id}), so ids do not explode the label set.
+    Added last, so it wraps the other middleware and times them too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not METRICS_AVAILABLE
+            or not settings.METRICS_ENABLED
+            or scope["path"] == METRICS_PATH
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            in_progress.dec()
+            _current_request.reset(token)
+
+            route = route_label(scope)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            RESPONSE_SIZE.labels(method, route).observe(body_size)
+            REQUEST_DB_QUERIES.labels(route).observe(stats.db_queries)
+            REQUEST_DB_TIME.labels(route).observe(stats.db_seconds)
+            REQUEST_REDIS_CALLS.labels(route).observe(stats.redis_calls)
+
+
+def route_label(scope: Scope) -> str:
+    """Path template of the matched route (set in the scope by the router)."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text format.
+
+    Aggregates all worker processes when PROMETHEUS_MULTIPROC_DIR is set.
+
+    Returns:
+        Payload and its content type
+    """
+    if os.environ.get(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def shutdown_metrics() -> None:
+    """Drop the live gauges of this worker from the multiprocess aggregate."""
+    if METRICS_AVAILABLE and os.environ.get(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,184 @@
+"""
+Pharmacy Ownership Cache
+Cached user -> pharmacies map used by every access check
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.pharmacy import Pharmacy
+from app.models.user import UserRole
+
+settings = get_settings()
+
+
+class PharmacyOwnershipCache:
+    """
+    In-process cache of pharmacy ownership.
+
+    Keeps two maps, both loaded lazily from the database:
+    - user id -> frozenset of owned pharmacy ids (for O(1) access checks)
+    - pharmacy id -> owner id (to tell "not found" from "not yours",
+      and for admins)
+
+    Entries expire after `ttl_seconds`, which bounds staleness across worker
+    processes; within a process, pharmacy create/delete/transfer must call
+    invalidate_pharmacy().
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._owned: "OrderedDict[UUID, Tuple[float, FrozenSet[UUID]]]" = OrderedDict()
+        self._owners: "OrderedDict[UUID, Tuple[float, UUID]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_owned_pharmacy_ids(self, db: Session, user_id: UUID) -> FrozenSet[UUID]:
+        """
+        Get the ids of all pharmacies (active or not) owned by a user.
+
+        Args:
+            db: Database session
+            user_id: Owner id
+
+        Returns:
+            Owned pharmacy ids
+        """
+        cached = self._get(self._owned, user_id)
+        if cached is not None:
+            return cached
+
+        rows = db.query(Pharmacy.id).filter(Pharmacy.user_id == user_id).all()
+        owned = frozenset(row.id for row in rows)
+        self._set(self._owned, user_id, owned)
+        return owned
+
+    def get_owner_id(self, db: Session, pharmacy_id: UUID) -> Optional[UUID]:
+        """
+        Get the owner of a pharmacy.
+
+        Args:
+            db: Database session
+            pharmacy_id: Pharmacy id
+
+        Returns:
+            Owner id, or None if the pharmacy does not exist
+        """
+        cached = self._get(self._owners, pharmacy_id)
+        if cached is not None:
+            return cached
+
+        row = db.query(Pharmacy.user_id).filter(Pharmacy.id == pharmacy_id).first()
+        if row is None:
+            return None  # Not cached: the pharmacy may be created later
+
+        self._set(self._owners, pharmacy_id, row.user_id)
+        return row.user_id
+
+    def invalidate_pharmacy(self, pharmacy_id: UUID, *user_ids: Optional[UUID]) -> None:
+        """
+        Forget a pharmacy after it was created, deleted or transferred.
+
+        Args:
+            pharmacy_id: Pharmacy id
+            *user_ids: Owners whose sets must be reloaded (old and new)
+        """
+        with self._lock:
+            owner = self._owners.pop(pharmacy_id, None)
+            for user_id in {owner, *user_ids}:
+                if user_id is not None:
+                    self._owned.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached ownership data."""
+        with self._lock:
+            self._owned.clear()
+            self._owners.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters."""
+        return {
+            "users": len(self._owned),
+            "pharmacies": len(self._owners),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _get(self, entries: OrderedDict, key: UUID):
+        """Get a fresh cached value, or None."""
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                self.misses += 1
+                entries.pop(key, None)
+                return None
+            entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _set(self, entries: OrderedDict, key: UUID, value) -> None:
+        """Cache a value, evicting the least recently used ones."""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            entries[key] = (time.monotonic(), value)
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+
+def check_pharmacy_access(db: Session, pharmacy_id: UUID, current_user) -> None:
+    """
+    Verify a user may access a pharmacy, without loading the pharmacy row.
+
+    Owners are checked with a set lookup on their cached pharmacy ids; the
+    pharmacy -> owner map is consulted only for admins and denials.
+
+    Args:
+        db: Database session
+        pharmacy_id: UUID of the pharmacy
+        current_user: The authenticated user (anything with id and role)
+
+    Raises:
+        HTTPException: If pharmacy not found or access denied
+    """
+    if current_user.role != UserRole.ADMIN:
+        if pharmacy_id in pharmacy_ownership.get_owned_pharmacy_ids(db, current_user.id):
+            return
+
+    owner_id = pharmacy_ownership.get_owner_id(db, pharmacy_id)
+
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pharmacy not found"
+        )
+
+    # Admin can access all pharmacies
+    if current_user.role == UserRole.ADMIN:
+        return
+
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+
+    # Owner per the DB but missing from a stale cached set
+    pharmacy_ownership.invalidate_pharmacy(pharmacy_id, current_user.id)
+
+
+# Singleton instance
+pharmacy_ownership = PharmacyOwnershipCache(
+    ttl_seconds=settings.OWNERSHIP_CACHE_TTL_SECONDS,
+    max_entries=settings.OWNERSHIP_CACHE_MAX_ENTRIES
+)
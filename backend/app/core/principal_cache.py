@@ -0,0 +1,127 @@
+"""
+Authenticated Principal Cache
+Short-TTL cache of the user data needed for authorization
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+from uuid import UUID
+
+from app.config import get_settings
+from app.models.user import UserRole
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Authenticated user as seen by authorization checks.
+
+    Exposes the same `id`, `role` and `is_active` attributes as User, so
+    handlers that only need identity and role work without a DB row.
+    """
+
+    id: UUID
+    role: UserRole
+    is_active: bool
+
+
+PrincipalKey = Tuple[str, Optional[str]]  # (sub, jti)
+
+
+class PrincipalCache:
+    """
+    In-process LRU cache of principals keyed by token (sub + jti).
+
+    Entries live at most `ttl_seconds`, which bounds how long another worker
+    process may keep serving a principal after a change. Within a process,
+    invalidate_user() drops every cached token of a user immediately.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, Principal]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[PrincipalKey]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sub: str, jti: Optional[str]) -> Optional[Principal]:
+        """
+        Get a cached principal for a token.
+
+        Args:
+            sub: Token subject (user id)
+            jti: Token id
+
+        Returns:
+            The principal, or None if missing or expired
+        """
+        if self.ttl_seconds <= 0:
+            return None
+
+        key = (sub, jti)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                self.misses += 1
+                if entry is not None:
+                    self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, sub: str, jti: Optional[str], principal: Principal) -> None:
+        """Cache a principal for a token, evicting the least recently used ones."""
+        if self.ttl_seconds <= 0:
+            return
+
+        key = (sub, jti)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), principal)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(sub, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest, _ = next(iter(self._entries.items()))
+                self._remove(oldest)
+
+    def invalidate_user(self, user_id: UUID | str) -> None:
+        """Drop every cached token of a user (role, status or password changed)."""
+        sub = str(user_id)
+        with self._lock:
+            for key in self._keys_by_user.pop(sub, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def _remove(self, key: PrincipalKey) -> None:
+        """Remove an entry and its user index (lock held)."""
+        self._entries.pop(key, None)
+        keys = self._keys_by_user.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[key[0]]
+
+
+# Singleton instance
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,204 @@
+"""
+Query Profiler
+Per-request statement counts, N+1 detection and a slow-query log with EXPLAIN plans
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.metrics import route_label
+
+settings = get_settings()
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+# Bind parameter styles of the supported drivers: ?, :name, %(name)s, %s, $1
+_PLACEHOLDER = r"(?:\?|:\w+|%\(\w+\)s|%s|\$\d+)"
+_IN_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so the same query with other values compares equal.
+
+    Literals become ?, placeholder lists of any length become (...), and
+    whitespace is collapsed.
+    """
+    shape = _IN_LIST.sub("(...)", statement)
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryProfile:
+    """Statements executed during a request (or a block of code)."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []  # (statement, seconds)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements.append((statement, elapsed))
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(elapsed for _, elapsed in self.statements)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Statement shapes executed at least `threshold` times (likely N+1).
+
+        Returns:
+            (shape, executions), most repeated first
+        """
+        shapes = Counter(statement_shape(statement) for statement, _ in self.statements)
+        return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+    def summary(self) -> str:
+        """Human readable list of the statements, for logs and test failures."""
+        lines = [f"{self.count} statements, {self.total_seconds * 1000:.1f}ms"]
+        lines += [f"  {elapsed * 1000:7.1f}ms  {_WHITESPACE.sub(' ', statement)}" for statement, elapsed in self.statements]
+        return "\n".join(lines)
+
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+_installed = False
+
+
+def install_query_profiler() -> None:
+    """Start recording statements of all engines (idempotent)."""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._profiler_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, "_profiler_started_at", None)
+    if started_at is None:
+        return
+    elapsed = time.perf_counter() - started_at
+
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold and elapsed * 1000 >= threshold:
+        _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+
+def _log_slow_query(conn, statement: str, parameters, executemany: bool, elapsed: float) -> None:
+    """Print a slow statement with its plan (SELECTs only, never re-executed)."""
+    message = f"Warning: slow query ({elapsed * 1000:.1f}ms): {_WHITESPACE.sub(' ', statement)}"
+    plan = None
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and statement.lstrip().upper().startswith("SELECT"):
+        plan = explain(conn, statement, parameters)
+    print(f"{message}\n{plan}" if plan else message)
+
+
+def explain(conn, statement: str, parameters) -> Optional[str]:
+    """
+    Plan of a statement, read on the raw DBAPI connection so it is not
+    recorded itself.
+
+    Returns:
+        The plan, one line per row, or None if it could not be obtained
+    """
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join("  " + " ".join(str(value) for value in row) for row in cursor.fetchall())
+    except Exception as e:
+        return f"  (no plan: {e})"
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def capture_queries(engine: Engine) -> Iterator[QueryProfile]:
+    """
+    Record every statement run on an engine inside the block, from any thread.
+
+    Used by tests to enforce query budgets.
+
+    Yields:
+        The profile, filled when the block exits
+    """
+    profile = QueryProfile()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        context._budget_started_at = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "_budget_started_at", None)
+        profile.record(statement, time.perf_counter() - started_at if started_at else 0.0)
+
+    event.listen(engine, "before_cursor_execute", before)
+    event.listen(engine, "after_cursor_execute", after)
+    try:
+        yield profile
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+        event.remove(engine, "after_cursor_execute", after)
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware profiling the statements of each request.
+
+    Adds the statement count as a response header and prints a warning when
+    a statement shape repeats QUERY_N_PLUS_ONE_THRESHOLD times or more in
+    one request. Meant for development and CI: only added when
+    QUERY_PROFILER_ENABLED is set.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        install_query_profiler()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(profile.count).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            for shape, count in profile.repeated(settings.QUERY_N_PLUS_ONE_THRESHOLD):
+                print(
+                    f"Warning: possible N+1 in {scope['method']} {route_label(scope)}: "
+                    f"{count}x {shape}"
+                )
@@ -0,0 +1,190 @@
+"""
+Shared Redis Pool
+Single lifecycle-managed async Redis connection pool for all subsystems
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit, urlunsplit
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+from app.core.metrics import record_redis_call
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class RedisUnavailableError(Exception):
+    """Raised when Redis is not started, marked unhealthy or a command fails."""
+
+
+class RedisPool:
+    """
+    Async Redis client backed by one bounded connection pool per worker.
+
+    Started in the application startup event and closed on shutdown. After a
+    failure the pool is marked unhealthy and callers fail fast with
+    RedisUnavailableError for `retry_backoff` seconds, instead of paying a
+    connection timeout on every request while Redis is down.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int,
+        socket_timeout: float,
+        connect_timeout: float,
+        retry_backoff: float
+    ):
+        self.url = url
+        self.max_connections = max_connections
+        self.socket_timeout = socket_timeout
+        self.connect_timeout = connect_timeout
+        self.retry_backoff = retry_backoff
+
+        self.client: Optional[redis.Redis] = None
+        self.healthy = False
+        self.last_error: Optional[str] = None
+        self._unhealthy_since: Optional[float] = None
+
+        self.commands_total = 0
+        self.errors_total = 0
+        self.total_latency_seconds = 0.0
+
+    async def start(self) -> None:
+        """Create the pool and check Redis is reachable (never raises)."""
+        if self.client is None:
+            self.client = redis.Redis(
+                connection_pool=redis.ConnectionPool.from_url(
+                    self.url,
+                    max_connections=self.max_connections,
+                    socket_timeout=self.socket_timeout,
+                    socket_connect_timeout=self.connect_timeout,
+                    encoding="utf-8",
+                    decode_responses=True
+                )
+            )
+        if not await self.ping():
+            print(f"Warning: Redis not available at {self._safe_url()} ({self.last_error})")
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        self.healthy = False
+
+    def get_client(self) -> redis.Redis:
+        """
+        Get the shared client for direct use.
+
+        Returns:
+            The Redis client
+
+        Raises:
+            RedisUnavailableError: If not started or within the unhealthy backoff
+        """
+        if self.client is None:
+            raise RedisUnavailableError("Redis pool not started")
+        if (
+            self._unhealthy_since is not None
+            and time.monotonic() - self._unhealthy_since < self.retry_backoff
+        ):
+            raise RedisUnavailableError(f"Redis unavailable: {self.last_error}")
+        return self.client
+
+    async def call(self, operation: Callable[[redis.Redis], Awaitable[T]]) -> T:
+        """
+        Run an operation on the shared client, tracking health and metrics.
+
+        Args:
+            operation: Coroutine function taking the client (one round-trip,
+                e.g. a single command, pipeline or script)
+
+        Returns:
+            The operation result
+
+        Raises:
+            RedisUnavailableError: If Redis is unavailable or the call fails
+        """
+        client = self.get_client()
+        started_at = time.perf_counter()
+        try:
+            result = await operation(client)
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self.errors_total += 1
+            self._mark_unhealthy(e)
+            raise RedisUnavailableError(f"Redis call failed: {e}") from e
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.commands_total += 1
+            self.total_latency_seconds += elapsed
+            record_redis_call(elapsed)
+
+        self._mark_healthy()
+        return result
+
+    async def ping(self) -> bool:
+        """
+        Check Redis now, ignoring the backoff, and update the health state.
+
+        Returns:
+            True if Redis answered
+        """
+        if self.client is None:
+            return False
+        try:
+            await self.client.ping()
+        except (RedisError, OSError, asyncio.TimeoutError) as e:
+            self._mark_unhealthy(e)
+            return False
+        self._mark_healthy()
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Health state, pool usage and command counters."""
+        pool = self.client.connection_pool if self.client is not None else None
+        commands = self.commands_total
+        return {
+            "url": self._safe_url(),
+            "started": self.client is not None,
+            "healthy": self.healthy,
+            "last_error": self.last_error,
+            "max_connections": self.max_connections,
+            "connections_in_use": len(getattr(pool, "_in_use_connections", ())) if pool else 0,
+            "connections_idle": len(getattr(pool, "_available_connections", ())) if pool else 0,
+            "commands_total": commands,
+            "errors_total": self.errors_total,
+            "avg_latency_ms": round(self.total_latency_seconds / commands * 1000, 3) if commands else 0.0,
+        }
+
+    def _mark_healthy(self) -> None:
+        self.healthy = True
+        self._unhealthy_since = None
+
+    def _mark_unhealthy(self, error: Exception) -> None:
+        self.healthy = False
+        self.last_error = str(error) or type(error).__name__
+        self._unhealthy_since = time.monotonic()
+
+    def _safe_url(self) -> str:
+        """Redis URL without credentials."""
+        parts = urlsplit(self.url)
+        netloc = parts.hostname or ""
+        if parts.port:
+            netloc = f"{netloc}:{parts.port}"
+        return urlunsplit((parts.scheme, netloc, parts.path, "", ""))
+
+
+# Singleton instance
+redis_pool = RedisPool(
+    url=settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+    retry_backoff=settings.REDIS_RETRY_BACKOFF_SECONDS
+)
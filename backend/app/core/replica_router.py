@@ -0,0 +1,211 @@
+"""
+Read Replica Router
+Lag-aware choice of a read replica, with read-your-writes stickiness on the primary
+"""
+import hashlib
+import itertools
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.redis_pool import RedisUnavailableError, redis_pool
+
+settings = get_settings()
+
+# Seconds the replica is behind: 0 when it has replayed everything it
+# received (an idle primary writes nothing, so the replay timestamp alone
+# would grow forever), NULL when no WAL stream is active. A replica whose
+# receiver disconnected has also replayed all it received, so without the
+# stream check it would look current forever.
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicationStoppedError(Exception):
+    """Raised when a replica has no active WAL stream from the primary."""
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaRouter:
+    """
+    Picks the engine for read-only requests.
+
+    A monitor thread measures the lag of each replica every
+    `check_interval` seconds. Reads go round-robin to the replicas within
+    `max_lag` seconds; when none is (lagging, down, or not checked yet)
+    they fall back to the primary. Requests never wait on a lag check.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], max_lag: float, check_interval: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+
+        self._lag: Dict[Engine, Optional[float]] = {replica: None for replica in replicas}
+        self._errors: Dict[Engine, Optional[str]] = {replica: None for replica in replicas}
+        self._healthy: List[Engine] = []
+        self._cycle = itertools.cycle([])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.primary_fallbacks = 0
+
+    def start(self) -> None:
+        """Check the replicas once, then keep checking in the background."""
+        if not self.replicas or self._thread is not None:
+            return
+        self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-lag-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def pick(self) -> Engine:
+        """A replica within the lag budget, or the primary."""
+        if not self.replicas:
+            return self.primary
+        with self._lock:
+            if not self._healthy:
+                self.primary_fallbacks += 1
+                return self.primary
+            return next(self._cycle)
+
+    def check(self) -> None:
+        """Measure the lag of every replica and update the healthy set."""
+        for replica in self.replicas:
+            try:
+                self._lag[replica] = self.measure_lag(replica)
+                self._errors[replica] = None
+            except Exception as e:
+                self._lag[replica] = None
+                self._errors[replica] = str(e)
+                print(f"Warning: read replica {_safe_url(replica)} unavailable: {e}")
+
+        healthy = [
+            replica for replica in self.replicas
+            if self._lag[replica] is not None and self._lag[replica] <= self.max_lag
+        ]
+        with self._lock:
+            if healthy != self._healthy:
+                self._healthy = healthy
+                self._cycle = itertools.cycle(healthy)
+
+    @staticmethod
+    def measure_lag(replica: Engine) -> float:
+        """
+        Replication lag in seconds (0 for databases without replication).
+
+        Raises:
+            ReplicationStoppedError: If the replica is not streaming from the
+                primary (disconnected receiver, or not a replica at all)
+        """
+        if replica.dialect.name != "postgresql":
+            return 0.0
+        with replica.connect() as conn:
+            lag = conn.execute(POSTGRES_LAG_QUERY).scalar()
+        if lag is None:
+            raise ReplicationStoppedError("no active WAL stream from the primary")
+        return float(lag)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag and state of each replica, and reads sent to the primary instead."""
+        with self._lock:
+            healthy = set(self._healthy)
+        return {
+            "max_lag_seconds": self.max_lag,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [
+                {
+                    "url": _safe_url(replica),
+                    "healthy": replica in healthy,
+                    "lag_seconds": self._lag[replica],
+                    "error": self._errors[replica],
+                }
+                for replica in self.replicas
+            ],
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+
+def _safe_url(engine: Engine) -> str:
+    return engine.url.render_as_string(hide_password=True)
+
+
+def _writer_key(request_headers) -> Optional[str]:
+    """Key of the client behind a request: its credentials, hashed."""
+    authorization = request_headers.get("authorization")
+    if not authorization:
+        return None
+    return "rw:" + hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+async def wrote_recently(request: Request) -> bool:
+    """
+    Whether the client of a request wrote within READ_YOUR_WRITES_SECONDS
+    (its reads then stay on the primary). Anonymous clients never write.
+
+    Unknown when Redis is unavailable: answers True, so reads stay consistent.
+    """
+    key = _writer_key(request.headers)
+    if key is None:
+        return False
+    try:
+        return bool(await redis_pool.call(lambda client: client.exists(key)))
+    except RedisUnavailableError:
+        return True
+
+
+class ReadYourWritesMiddleware:
+    """
+    Remember the clients that just wrote, so their next reads see the write.
+
+    Marks the credentials of every successful unsafe request for
+    READ_YOUR_WRITES_SECONDS (in Redis, shared by all workers). Only added
+    when read replicas are configured.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        key = _writer_key(Request(scope).headers)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            # Marked before the response leaves, so the client's next read
+            # (on any worker) already sees the marker
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                try:
+                    await redis_pool.call(lambda client: client.set(key, 1, ex=settings.READ_YOUR_WRITES_SECONDS))
+                except RedisUnavailableError:
+                    pass  # Reads of writers stay on the primary while Redis is unavailable
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,216 @@
+"""
+Sampling Profiler
+On-demand stack sampler for live workers, with flamegraph-compatible output
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# Leaf frames of threads waiting for work (event loop, thread pools, queues)
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("_base.py", "result"),
+}
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a profiling session is already running in this worker."""
+
+
+class SamplingProfiler:
+    """
+    Stack sampler for the worker process it runs in.
+
+    A background thread reads the stacks of all other threads every
+    `interval` seconds and counts them in the collapsed format ("frame;frame
+    count" per line, root first), which flamegraph.pl, speedscope and
+    inferno read directly. Idle threads are skipped.
+
+    A session samples continuously for a bounded window or, with a sample
+    rate, only while a sampled request is in flight. When no session runs
+    there is no sampler thread, and the middleware costs one attribute check
+    per request.
+    """
+
+    def __init__(self, max_seconds: float):
+        self.max_seconds = max_seconds
+
+        self.sample_rate: Optional[float] = None  # Set while a request-sampled session runs
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._requests_in_flight = 0
+        self._requests_sampled = 0
+        self._session: Dict[str, Any] = {}
+        self._result: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration: float, interval: float, sample_rate: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Start a session.
+
+        Args:
+            duration: Seconds to run, capped at max_seconds
+            interval: Seconds between samples
+            sample_rate: Share of requests to profile (None samples all the time)
+
+        Returns:
+            The session status
+
+        Raises:
+            ProfilerBusyError: If a session is already running
+        """
+        with self._lock:
+            if self.running:
+                raise ProfilerBusyError("A profiling session is already running in this worker")
+            self._stacks = Counter()
+            self._samples = 0
+            self._requests_in_flight = 0
+            self._requests_sampled = 0
+            self._stop.clear()
+            self._session = {
+                "pid": os.getpid(),
+                "started_at": time.time(),
+                "duration_seconds": min(duration, self.max_seconds),
+                "interval_ms": interval * 1000,
+                "sample_rate": sample_rate,
+            }
+            self._thread = threading.Thread(
+                target=self._run, args=(self._session["duration_seconds"], interval),
+                name="sampling-profiler", daemon=True
+            )
+            self.sample_rate = sample_rate
+            self._thread.start()
+        return self.get_status()
+
+    def stop(self) -> Optional[Dict[str, Any]]:
+        """Stop the running session early and return its result."""
+        thread = self._thread
+        self._stop.set()
+        if thread is not None:
+            thread.join()
+        return self._result
+
+    def wait(self) -> Optional[Dict[str, Any]]:
+        """Wait for the running session to end and return its result."""
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        return self._result
+
+    def get_status(self) -> Dict[str, Any]:
+        """Running state and progress of the current or last session."""
+        return {
+            **self._session,
+            "running": self.running,
+            "samples": self._samples,
+            "requests_sampled": self._requests_sampled,
+        }
+
+    @property
+    def result(self) -> Optional[Dict[str, Any]]:
+        """Last finished session: its status and collapsed stacks."""
+        return self._result
+
+    def request_started(self) -> bool:
+        """Decide whether to profile a request (call request_finished if so)."""
+        rate = self.sample_rate
+        if rate is None or random.random() >= rate:
+            return False
+        with self._lock:
+            self._requests_in_flight += 1
+            self._requests_sampled += 1
+        return True
+
+    def request_finished(self) -> None:
+        with self._lock:
+            self._requests_in_flight -= 1
+
+    def _run(self, duration: float, interval: float) -> None:
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + duration
+        gated = self.sample_rate is not None
+        labels: Dict[Any, str] = {}  # Code object -> frame label
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            if not gated or self._requests_in_flight > 0:
+                self._sample(own_id, labels)
+            self._stop.wait(interval)
+
+        self.sample_rate = None
+        self._result = {
+            **self.get_status(),
+            "running": False,
+            "collapsed": "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common()),
+        }
+
+    def _sample(self, own_id: int, labels: Dict[Any, str]) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id or _is_idle(frame):
+                continue
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                frames.append(label)
+                frame = frame.f_back
+            frames.append(names.get(thread_id, str(thread_id)))
+            self._stacks[";".join(reversed(frames))] += 1
+        self._samples += 1
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def _frame_label(code) -> str:
+    """Function and where it is defined ("name (path:line)", no semicolons)."""
+    filename = code.co_filename
+    for prefix in sys.path:
+        if prefix and filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip(os.sep)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class ProfilingMiddleware:
+    """Mark the requests picked for profiling while a request-sampled session runs."""
+
+    def __init__(self, app: ASGIApp, profiler: Optional[SamplingProfiler] = None):
+        self.app = app
+        self.profiler = profiler or sampling_profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.profiler.sample_rate is None or scope["type"] != "http" or not self.profiler.request_started():
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.profiler.request_finished()
+
+
+# Singleton instance (one per worker process)
+sampling_profiler = SamplingProfiler(max_seconds=settings.PROFILER_MAX_SECONDS)
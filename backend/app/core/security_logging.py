@@ -4,12 +4,24 @@ Implements comprehensive security event logging with structured JSON format
 """
 import json
 import logging
-from datetime import datetime
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
 from enum import Enum
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
+from app.config import get_settings
+from app.services.security_event_store import SecurityEventRetention, SecurityEventStore
+
+settings = get_settings()
+
+# Window of the failed-login aggregations attached to brute-force alerts
+BRUTE_FORCE_WINDOW = timedelta(hours=1)
+
 
 class SecurityEventType(str, Enum):
     """Security event types for categorization and filtering."""
@@ -106,20 +118,251 @@ class SecurityEvent(BaseModel):
         return self.model_dump(exclude_none=True)
 
 
+class SecurityRecord:
+    """
+    Security event serialized once, on the request path.
+
+    Lightweight replacement for LogRecord in the security log queue: holds
+    the level, the final JSON line and the event fields (for the event store).
+    """
+
+    __slots__ = ("levelno", "line", "event")
+
+    def __init__(
+        self,
+        levelno: int,
+        event_json: str,
+        created: Optional[float] = None,
+        event: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Build the log line for an event.
+
+        Args:
+            levelno: Logging level (logging.INFO, ...)
+            event_json: Event serialized as JSON
+            created: Event time (default: now)
+            event: Event fields, with a datetime timestamp (None: not stored)
+        """
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(created or time.time()))
+        self.levelno = levelno
+        self.line = (
+            f'{{"timestamp": "{timestamp}", "level": "{logging.getLevelName(levelno)}", '
+            f'"event": {event_json}}}'
+        )
+        self.event = event
+
+    @classmethod
+    def from_fields(cls, event_type: SecurityEventType, level: SecurityEventLevel, message: str, **fields: Any) -> "SecurityRecord":
+        """
+        Serialize an event straight from its fields, skipping SecurityEvent validation.
+
+        Produces the same JSON as SecurityEvent.to_json().
+        """
+        event: Dict[str, Any] = {
+            "timestamp": datetime.utcnow(),
+            "event_type": event_type.value,
+            "level": level.value,
+        }
+        for name in ("username", "user_id", "ip_address", "user_agent", "resource", "action", "result"):
+            if fields.get(name) is not None:
+                event[name] = fields[name]
+        event["message"] = message
+        for name in ("details", "session_id"):
+            if fields.get(name) is not None:
+                event[name] = fields[name]
+
+        return cls(LEVEL_MAP[level], json.dumps(event, separators=(",", ":"), default=_json_default), event=event)
+
+
+def _json_default(value: Any) -> str:
+    """JSON fallback matching pydantic's datetime format."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+LEVEL_MAP = {
+    SecurityEventLevel.INFO: logging.INFO,
+    SecurityEventLevel.WARNING: logging.WARNING,
+    SecurityEventLevel.ERROR: logging.ERROR,
+    SecurityEventLevel.CRITICAL: logging.CRITICAL,
+}
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler on a bounded queue that drops (and counts) events when full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued_total = 0
+        self.dropped_total = 0
+
+    def prepare(self, record) -> SecurityRecord:
+        """Pass security records through; convert plain log records."""
+        if isinstance(record, SecurityRecord):
+            return record
+        return SecurityRecord(record.levelno, json.dumps(self.format(record)), record.created)
+
+    def enqueue(self, record: SecurityRecord) -> None:
+        """Queue a record without blocking; drop it if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued_total += 1
+        except queue.Full:
+            self.dropped_total += 1
+
+
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """Size-rotated file handler writing a batch of records with one write and flush."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.written_total = 0
+        self.batches_total = 0
+        self.rotations_total = 0
+
+    def format(self, record: SecurityRecord) -> str:
+        return record.line
+
+    def emit(self, record: SecurityRecord) -> None:
+        self.emit_batch([record])
+
+    def emit_batch(self, records: List[SecurityRecord]) -> None:
+        """Append records to the file, rotating first if it would exceed maxBytes."""
+        if not records:
+            return
+        data = "".join(record.line + "\n" for record in records)
+
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            position = self.stream.tell()
+            if self.maxBytes > 0 and position > 0 and position + len(data) >= self.maxBytes:
+                self.doRollover()
+                self.rotations_total += 1
+            self.stream.write(data)
+            self.stream.flush()
+            self.written_total += len(records)
+            self.batches_total += 1
+        except Exception:
+            self.handleError(records[0])
+        finally:
+            self.release()
+
+
+class SecurityEventStoreHandler(logging.Handler):
+    """Appends batches of events to the queryable security event store."""
+
+    def __init__(self, store: "SecurityEventStore"):
+        super().__init__(logging.INFO)
+        self.store = store
+        self.stored_total = 0
+        self.errors_total = 0
+
+    def emit(self, record: SecurityRecord) -> None:
+        self.emit_batch([record])
+
+    def emit_batch(self, records: List[SecurityRecord]) -> None:
+        """Insert the structured events of a batch; never raises."""
+        events = [record.event for record in records if record.event is not None]
+        if not events:
+            return
+        try:
+            self.stored_total += self.store.append(events)
+        except Exception as e:
+            self.errors_total += 1
+            if self.errors_total == 1:
+                print(f"Warning: Could not store security events: {e}")
+
+
+class SecurityConsoleHandler(logging.StreamHandler):
+    """Console handler for pre-serialized security records."""
+
+    def format(self, record: SecurityRecord) -> str:
+        return record.line
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that drains up to `batch_size` records per wake-up."""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def enqueue_sentinel(self) -> None:
+        # Block rather than fail if the queue is full at shutdown
+        self.queue.put(self._sentinel)
+
+    def handle_batch(self, records: List[SecurityRecord]) -> None:
+        """Dispatch a batch to each handler, honouring handler levels."""
+        for handler in self.handlers:
+            accepted = [record for record in records if record.levelno >= handler.level]
+            if not accepted:
+                continue
+            if isinstance(handler, (BatchingRotatingFileHandler, SecurityEventStoreHandler)):
+                handler.emit_batch(accepted)
+            else:
+                for record in accepted:
+                    handler.handle(record)
+
+    def _monitor(self) -> None:
+        """Block for one record, then drain what is already queued (up to batch_size)."""
+        q = self.queue
+        has_task_done = hasattr(q, "task_done")
+        stop = False
+        while not stop:
+            batch: List[SecurityRecord] = []
+            record = self.dequeue(True)
+            while True:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(record)
+                if has_task_done:
+                    q.task_done()
+                if stop or len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.dequeue(False)
+                except queue.Empty:
+                    break
+            self.handle_batch(batch)
+
+
 class SecurityLogger:
     """
     Security logger with structured JSON logging and file rotation.
 
     Provides methods for logging various security events with
     consistent format and automatic categorization.
+
+    Logging never blocks the request path: events are serialized once into
+    SecurityRecord objects and put on a bounded queue (dropped and counted
+    when full). A background QueueListener writes them to a size-rotated
+    file in batches.
     """
 
-    def __init__(self, log_file_path: str = "/var/log/turnotec/security.log"):
+    def __init__(
+        self,
+        log_file_path: str = "/var/log/turnotec/security.log",
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        backup_count: Optional[int] = None,
+        event_store: Optional["SecurityEventStore"] = None
+    ):
         """
         Initialize the security logger.
 
         Args:
             log_file_path: Path to the security log file
+            queue_size: Max queued events before dropping (default: settings)
+            batch_size: Max events written per batch (default: settings)
+            max_bytes: Rotate the file at this size (default: settings)
+            backup_count: Rotated files to keep (default: settings)
+            event_store: Also append events to this queryable store
         """
         # Try to create log directory, fallback to local logs if permission denied
         log_path = Path(log_file_path)
@@ -141,24 +384,69 @@ class SecurityLogger:
         # Remove existing handlers to avoid duplicates
         self.logger.handlers.clear()
 
-        # File handler with JSON formatter
-        file_handler = logging.FileHandler(self.log_file_path, encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-
-        # JSON formatter
-        formatter = logging.Formatter(
-            '{"timestamp": "%(asctime)s", "level": "%(levelname)s", "event": %(message)s}',
-            datefmt="%Y-%m-%dT%H:%M:%S"
+        # Request path: bounded queue, never blocks
+        self.queue: queue.Queue = queue.Queue(queue_size or settings.SECURITY_LOG_QUEUE_SIZE)
+        self.queue_handler = DroppingQueueHandler(self.queue)
+        self.logger.addHandler(self.queue_handler)
+
+        # Background thread: batched, size-rotated file with JSON lines
+        self.file_handler = BatchingRotatingFileHandler(
+            self.log_file_path,
+            maxBytes=max_bytes if max_bytes is not None else settings.SECURITY_LOG_MAX_BYTES,
+            backupCount=backup_count if backup_count is not None else settings.SECURITY_LOG_BACKUP_COUNT,
+            encoding="utf-8",
+            delay=True
         )
-        file_handler.setFormatter(formatter)
-
-        self.logger.addHandler(file_handler)
+        self.file_handler.setLevel(logging.INFO)
 
         # Also add console handler for development
-        console_handler = logging.StreamHandler()
+        console_handler = SecurityConsoleHandler()
         console_handler.setLevel(logging.WARNING)
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+
+        handlers: List[logging.Handler] = [self.file_handler, console_handler]
+
+        # Queryable store, written from the same background thread
+        self.event_store = event_store
+        self.store_handler: Optional[SecurityEventStoreHandler] = None
+        if event_store is not None:
+            self.store_handler = SecurityEventStoreHandler(event_store)
+            handlers.append(self.store_handler)
+
+        self.listener = BatchingQueueListener(
+            self.queue,
+            *handlers,
+            batch_size=batch_size or settings.SECURITY_LOG_BATCH_SIZE
+        )
+        self._lock = threading.Lock()
+        self._running = True
+        self.listener.start()
+
+    def close(self) -> None:
+        """Flush queued events and stop the background writer."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            self.listener.stop()
+        self.file_handler.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Queue depth and enqueue/drop/write counters."""
+        return {
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "enqueued_total": self.queue_handler.enqueued_total,
+            "dropped_total": self.queue_handler.dropped_total,
+            "written_total": self.file_handler.written_total,
+            "batches_total": self.file_handler.batches_total,
+            "rotations_total": self.file_handler.rotations_total,
+            "stored_total": self.store_handler.stored_total if self.store_handler else 0,
+            "store_errors_total": self.store_handler.errors_total if self.store_handler else 0,
+        }
+
+    def _emit(self, record: SecurityRecord) -> None:
+        """Queue a pre-serialized record for the background writer."""
+        self.queue_handler.enqueue(record)
 
     def log_event(self, event: SecurityEvent) -> None:
         """
@@ -168,17 +456,10 @@ class SecurityLogger:
             event: SecurityEvent instance to log
         """
         # Map event level to logging level
-        level_map = {
-            SecurityEventLevel.INFO: logging.INFO,
-            SecurityEventLevel.WARNING: logging.WARNING,
-            SecurityEventLevel.ERROR: logging.ERROR,
-            SecurityEventLevel.CRITICAL: logging.CRITICAL,
-        }
-
-        log_level = level_map.get(event.level, logging.INFO)
+        log_level = LEVEL_MAP.get(event.level, logging.INFO)
 
         # Log as JSON
-        self.logger.log(log_level, event.to_json())
+        self._emit(SecurityRecord(log_level, event.to_json(), event=event.to_dict()))
 
     def log_authentication(
         self,
@@ -202,7 +483,7 @@ class SecurityLogger:
         """
         level = SecurityEventLevel.INFO if success else SecurityEventLevel.WARNING
 
-        event = SecurityEvent(
+        record = SecurityRecord.from_fields(
             event_type=event_type,
             level=level,
             username=username,
@@ -213,7 +494,7 @@ class SecurityLogger:
             details=details
         )
 
-        self.log_event(event)
+        self._emit(record)
 
     def log_authorization_failure(
         self,
@@ -235,7 +516,7 @@ class SecurityLogger:
             ip_address: Client IP address
             details: Additional details
         """
-        event = SecurityEvent(
+        record = SecurityRecord.from_fields(
             event_type=SecurityEventType.ACCESS_DENIED,
             level=SecurityEventLevel.WARNING,
             username=username,
@@ -248,7 +529,7 @@ class SecurityLogger:
             details=details
         )
 
-        self.log_event(event)
+        self._emit(record)
 
     def log_admin_action(
         self,
@@ -272,7 +553,7 @@ class SecurityLogger:
             ip_address: Client IP address
             details: Additional details (e.g., changed fields)
         """
-        event = SecurityEvent(
+        record = SecurityRecord.from_fields(
             event_type=event_type,
             level=SecurityEventLevel.INFO,
             username=username,
@@ -285,7 +566,7 @@ class SecurityLogger:
             details=details
         )
 
-        self.log_event(event)
+        self._emit(record)
 
     def log_security_incident(
         self,
@@ -307,7 +588,7 @@ class SecurityLogger:
             username: Associated username (if any)
             details: Additional incident details
         """
-        event = SecurityEvent(
+        record = SecurityRecord.from_fields(
             event_type=event_type,
             level=severity,
             username=username,
@@ -316,7 +597,7 @@ class SecurityLogger:
             details=details
         )
 
-        self.log_event(event)
+        self._emit(record)
 
 
 # Global security logger instance
@@ -335,10 +616,44 @@ def get_security_logger(log_file_path: str = "/var/log/turnotec/security.log") -
     """
     global _security_logger
     if _security_logger is None:
-        _security_logger = SecurityLogger(log_file_path)
+        event_store = None
+        if settings.SECURITY_EVENT_STORE_ENABLED:
+            from app.database import SessionLocal
+            event_store = SecurityEventStore(SessionLocal)
+        _security_logger = SecurityLogger(log_file_path, event_store=event_store)
     return _security_logger
 
 
+_retention: Optional[SecurityEventRetention] = None
+
+
+def start_security_event_retention() -> None:
+    """Purge stored events older than SECURITY_EVENT_RETENTION_DAYS, periodically."""
+    global _retention
+    if _retention is not None or not settings.SECURITY_EVENT_RETENTION_DAYS:
+        return
+    event_store = get_security_logger().event_store
+    if event_store is None:
+        return
+    _retention = SecurityEventRetention(
+        event_store,
+        retention=timedelta(days=settings.SECURITY_EVENT_RETENTION_DAYS),
+        interval=settings.SECURITY_EVENT_PURGE_INTERVAL_SECONDS
+    )
+    _retention.start()
+
+
+def shutdown_security_logger() -> None:
+    """Stop the retention job, then flush and stop the global security logger."""
+    global _security_logger, _retention
+    if _retention is not None:
+        _retention.stop()
+        _retention = None
+    if _security_logger is not None:
+        _security_logger.close()
+        _security_logger = None
+
+
 # Convenience functions for common security events
 
 def log_login_success(
@@ -397,15 +712,35 @@ def log_brute_force_detected(
     ip_address: str,
     attempts: int
 ) -> None:
-    """Log detected brute force attack."""
+    """
+    Log detected brute force attack.
+
+    When the event store is enabled the alert carries failed-login
+    aggregations over BRUTE_FORCE_WINDOW (failures from the IP, usernames
+    it targeted, failures on the account), not just the lockout counter.
+    """
     logger = get_security_logger()
+    details: Dict[str, Any] = {"attempts": attempts}
+    message = f"Brute force attack detected: {attempts} attempts on {username} from {ip_address}"
+
+    if logger.event_store is not None:
+        try:
+            summary = logger.event_store.brute_force_summary(ip_address, username, BRUTE_FORCE_WINDOW)
+            details.update(summary)
+            message += (
+                f" ({summary['ip_failures']} failures on {summary['ip_distinct_usernames']} accounts"
+                f" from this IP in the last {summary['window_minutes']} minutes)"
+            )
+        except Exception as e:
+            print(f"Warning: Could not aggregate security events: {e}")
+
     logger.log_security_incident(
         event_type=SecurityEventType.BRUTE_FORCE_DETECTED,
         severity=SecurityEventLevel.CRITICAL,
-        message=f"Brute force attack detected: {attempts} attempts on {username} from {ip_address}",
+        message=message,
         username=username,
         ip_address=ip_address,
-        details={"attempts": attempts}
+        details=details
     )
 
 
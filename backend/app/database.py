@@ -1,22 +1,34 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
+from fastapi import Depends, Request
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import get_settings
+from app.core.db_pool import create_pooled_engine
+from app.core.replica_router import ReplicaRouter, wrote_recently
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+# Pool size, pre-ping and PgBouncer mode come from the DB_* settings
+engine = create_pooled_engine(settings.DATABASE_URL, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read replicas for read-only public traffic and listings (none by default)
+replica_engines = [
+    create_pooled_engine(url, f"replica{index}")
+    for index, url in enumerate(settings.DATABASE_REPLICA_URLS)
+]
+
+replica_router = ReplicaRouter(
+    primary=engine,
+    replicas=replica_engines,
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+)
+
 Base = declarative_base()
 
 
@@ -27,3 +39,28 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_read_engine(request: Request) -> Engine:
+    """
+    Engine for a read-only request: a replica within the lag budget, or the
+    primary if none is, or if the client wrote in the last
+    READ_YOUR_WRITES_SECONDS.
+    """
+    if not replica_engines or await wrote_recently(request):
+        return engine
+    return replica_router.pick()
+
+
+def get_read_db(read_engine: Engine = Depends(get_read_engine)):
+    """
+    Get a database session for read-only endpoints (may be a replica).
+
+    Never write through it: the data can lag the primary by up to
+    REPLICA_MAX_LAG_SECONDS.
+    """
+    db = Session(bind=read_engine, autoflush=False)
+    try:
+        yield db
+    finally:
+        db.close()
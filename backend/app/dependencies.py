@@ -11,6 +11,7 @@ from app.database import get_db
 from app.config import Settings, get_settings
 from app.utils.security import decode_token
 from app.models.user import User, UserRole
+from app.core.principal_cache import Principal, principal_cache
 
 # Type aliases for dependency injection
 DatabaseSession = Annotated[Session, Depends(get_db)]
@@ -23,16 +24,20 @@ security = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> Principal:
     """
     Extract and validate current user from JWT token.
 
+    The user's id, role and active flag are cached per token (sub + jti)
+    for a short TTL, so most authenticated requests do no DB work for auth.
+    Use get_current_user_record when the full User row is needed.
+
     Args:
         credentials: HTTP bearer credentials containing JWT token
         db: Database session
 
     Returns:
-        The authenticated user
+        The authenticated principal
 
     Raises:
         HTTPException: If token is invalid or user not found
@@ -60,15 +65,54 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    jti: str | None = payload.get("jti")
+    principal = principal_cache.get(user_id_str, jti)
 
-    if user is None or not user.is_active:
+    if principal is None:
+        row = db.query(User.id, User.role, User.is_active).filter(User.id == user_id).first()
+        if row is None:
+            raise credentials_exception
+
+        principal = Principal(id=row.id, role=row.role, is_active=row.is_active)
+        principal_cache.set(user_id_str, jti, principal)
+
+    if not principal.is_active:
         raise credentials_exception
 
+    return principal
+
+
+async def get_current_user_record(
+    principal: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Load the full User row of the authenticated user.
+
+    Args:
+        principal: The authenticated principal
+        db: Database session
+
+    Returns:
+        The authenticated user
+
+    Raises:
+        HTTPException: If the user no longer exists or is inactive
+    """
+    user = db.query(User).filter(User.id == principal.id).first()
+
+    if user is None or not user.is_active:
+        principal_cache.invalidate_user(principal.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     return user
 
 
-async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def require_admin(current_user: Principal = Depends(get_current_user)) -> Principal:
     """
     Require admin role for the current user.
 
@@ -76,7 +120,7 @@ async def require_admin(current_user: User = Depends(get_current_user)) -> User:
         current_user: The authenticated user
 
     Returns:
-        The authenticated user (if admin)
+        The authenticated principal (if admin)
 
     Raises:
         HTTPException: If user does not have admin role
@@ -90,5 +134,6 @@ async def require_admin(current_user: User = Depends(get_current_user)) -> User:
 
 
 # Type aliases for authenticated users
-CurrentUser = Annotated[User, Depends(get_current_user)]
-AdminUser = Annotated[User, Depends(require_admin)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+CurrentUserRecord = Annotated[User, Depends(get_current_user_record)]
+AdminUser = Annotated[Principal, Depends(require_admin)]
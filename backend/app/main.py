@@ -2,15 +2,28 @@
 
 import time
 import uuid
-from fastapi import FastAPI, Request, HTTPException, status
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
-from redis import Redis
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 from app.config import get_settings
 from app.api.v1 import api_router
+from app.api.metrics import router as metrics_router
+from app.api.uploads import router as uploads_router
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import METRICS_PATH, MetricsMiddleware, shutdown_metrics
+from app.core.query_profiler import QueryProfilerMiddleware, install_query_profiler
+from app.core.sampling_profiler import ProfilingMiddleware, sampling_profiler
+from app.core.redis_pool import RedisUnavailableError, redis_pool
+from app.core.replica_router import ReadYourWritesMiddleware
+from app.core.security_logging import shutdown_security_logger, start_security_event_retention
+from app.database import replica_router
+from app.services.image_variants import image_variant_pool
+from app.services.scraping_service import scraping_service
+from app.utils.fast_json import FastJSONResponse
+from app.utils.security import PasswordHashPoolBusyError, password_hash_pool
+from app.utils.uploads import UPLOAD_DIR
 
 settings = get_settings()
 
@@ -108,6 +121,7 @@ app = FastAPI(
     - Docs: https://docs.turnotec.com
     """,
     version="1.0.0",
+    default_response_class=FastJSONResponse,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     contact={
@@ -149,62 +163,82 @@ async def add_request_id(request: Request, call_next):
 
 
 # Rate limiting middleware (optional - requires Redis)
+async def _count_request(client, key: str) -> int:
+    """Count a request in the current window (one pipelined round-trip)."""
+    pipe = client.pipeline(transaction=False)
+    pipe.set(key, 0, ex=60, nx=True)  # Start the window with its expiry
+    pipe.incr(key)
+    _, count = await pipe.execute()
+    return count
+
+
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     """
-    Rate limiting middleware using Redis.
-    Limit: 100 requests per minute per IP.
+    Rate limiting middleware using the shared Redis pool.
+    Limit: RATE_LIMIT_PER_MINUTE requests per minute per IP (0 disables it).
     If Redis is unavailable, requests are allowed through without limiting.
     """
     # Get client IP
     client_ip = request.client.host if request.client else "unknown"
 
-    # Skip rate limiting for health checks and root
-    if request.url.path.startswith("/health") or request.url.path == "/":
+    # Skip rate limiting for health checks, metrics scrapes and root
+    if request.url.path.startswith("/health") or request.url.path in ("/", METRICS_PATH):
+        return await call_next(request)
+
+    if not settings.RATE_LIMIT_PER_MINUTE:
         return await call_next(request)
 
     # Try to apply rate limiting, but don't block if Redis is down
     try:
-        redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True, socket_connect_timeout=1)
-
-        # Test connection
-        redis_client.ping()
-
-        # Rate limit key
-        rate_limit_key = f"rate_limit:{client_ip}"
-
-        # Get current request count
-        current_requests = redis_client.get(rate_limit_key)
-
-        if current_requests is None:
-            # First request in this minute
-            redis_client.setex(rate_limit_key, 60, 1)
-        elif int(current_requests) >= 100:
-            # Rate limit exceeded
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Maximum 100 requests per minute."
-            )
-        else:
-            # Increment counter
-            redis_client.incr(rate_limit_key)
-
-        redis_client.close()
-
-    except HTTPException:
-        # Re-raise rate limit exceeded errors
-        raise
-    except Exception as e:
-        # If Redis is down or connection fails, allow request through
+        current_requests = await redis_pool.call(lambda client: _count_request(client, f"rate_limit:{client_ip}"))
+    except RedisUnavailableError as e:
         # Only log once per startup to avoid spam
         if not hasattr(rate_limit_middleware, '_redis_error_logged'):
             print(f"Rate limiting disabled: Redis not available ({e})")
             rate_limit_middleware._redis_error_logged = True
+    else:
+        if current_requests > settings.RATE_LIMIT_PER_MINUTE:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": f"Rate limit exceeded. Maximum {settings.RATE_LIMIT_PER_MINUTE} requests per minute."},
+                headers={"Retry-After": "60"}
+            )
 
     response = await call_next(request)
     return response
 
 
+# Statement counts and N+1 warnings per request (development/CI), or just the slow-query log
+if settings.QUERY_PROFILER_ENABLED:
+    app.add_middleware(QueryProfilerMiddleware)
+elif settings.SLOW_QUERY_THRESHOLD_MS:
+    install_query_profiler()
+
+# Keeps the reads of clients that just wrote on the primary
+if settings.DATABASE_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# gzip/brotli for clients that accept it (checks COMPRESSION_ENABLED per request)
+app.add_middleware(CompressionMiddleware)
+
+# Picks requests for the admin sampling profiler (a no-op unless a session runs)
+app.add_middleware(ProfilingMiddleware)
+
+# Request metrics (outermost, so it also times the middleware above)
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PasswordHashPoolBusyError)
+async def password_hash_busy_handler(request: Request, exc: PasswordHashPoolBusyError):
+    """Shed load when the password hashing queue is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication service busy, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -226,10 +260,12 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Include API v1 router
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
-# Mount static files for uploads
-UPLOAD_DIR = Path("uploads")
+# Serve uploaded files (ETag, Range, immutable caching, optional X-Accel-Redirect)
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.include_router(uploads_router)
+
+# Prometheus metrics
+app.include_router(metrics_router)
 
 
 @app.get("/")
@@ -247,9 +283,21 @@ async def startup_event():
     """Application startup event."""
     print("TurnoTec API starting up...")
     print(f"Environment: {'Production' if not settings.DEBUG else 'Development'}")
+    await redis_pool.start()
+    await scraping_service.start()
+    await run_in_threadpool(replica_router.start)
+    start_security_event_retention()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event."""
     print("TurnoTec API shutting down...")
+    await scraping_service.close()
+    await redis_pool.close()
+    password_hash_pool.shutdown()
+    image_variant_pool.shutdown()
+    shutdown_security_logger()
+    shutdown_metrics()
+    sampling_profiler.stop()
+    replica_router.stop()
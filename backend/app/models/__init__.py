@@ -5,6 +5,9 @@ from app.models.pharmacy import Pharmacy
 from app.models.device import Device, DeviceStatus
 from app.models.shift import Shift
 from app.models.display_config import DisplayConfig, DisplayMode
+from app.models.scrape_snapshot import ScrapePayload, ScrapeSnapshot
+from app.models.security_event import SecurityEventRecord
+from app.models.upload_blob import UploadBlob
 
 __all__ = [
     "User",
@@ -15,4 +18,8 @@ __all__ = [
     "Shift",
     "DisplayConfig",
     "DisplayMode",
+    "ScrapePayload",
+    "ScrapeSnapshot",
+    "SecurityEventRecord",
+    "UploadBlob",
 ]
@@ -2,7 +2,7 @@
 
 import uuid
 from enum import Enum
-from sqlalchemy import Column, DateTime, String, ForeignKey
+from sqlalchemy import Column, DateTime, String, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, ENUM
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -38,6 +38,12 @@ class Device(Base):
     # Relationships
     pharmacy = relationship("Pharmacy", back_populates="devices")
 
+    # Indexes for performance: listings are ordered by last_seen, newest first
+    __table_args__ = (
+        Index('idx_device_status_last_seen', 'status', last_seen.desc()),
+        Index('idx_device_pharmacy_last_seen', 'pharmacy_id', last_seen.desc()),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<Device {self.serial_number}>"
@@ -1,6 +1,6 @@
 """Display configuration model."""
 
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
 import enum
@@ -23,6 +23,7 @@ class DisplayConfig(Base):
 
     # Header configuration
     logo_path = Column(String(500), nullable=True)  # Path al logo
+    logo_variants = Column(JSON, nullable=True)  # Varianti ridimensionate del logo
     pharmacy_name = Column(String(200), nullable=False)
     pharmacy_hours = Column(Text, nullable=True)  # JSON con orari strutturati
     subtitle_text = Column(String(200), default="Farmacie di turno")  # Sottotitolo personalizzabile
@@ -32,6 +33,7 @@ class DisplayConfig(Base):
 
     # Image mode configuration
     image_path = Column(String(500), nullable=True)  # Path immagine principale
+    image_variants = Column(JSON, nullable=True)  # Varianti per risoluzione display (WebP/AVIF)
 
     # Scraped mode configuration
     scraping_cap = Column(String(10), nullable=True)  # CAP per ricerca
@@ -1,7 +1,7 @@
 """Pharmacy model."""
 
 import uuid
-from sqlalchemy import Boolean, Column, DateTime, String, ForeignKey, Float
+from sqlalchemy import Boolean, Column, DateTime, String, ForeignKey, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -39,6 +39,21 @@ class Pharmacy(Base):
     devices = relationship("Device", back_populates="pharmacy")
     display_config = relationship("DisplayConfig", back_populates="pharmacy", uselist=False, cascade="all, delete-orphan")
 
+    # Indexes for performance
+    __table_args__ = (
+        # Ownership lookups (RBAC): index-only on PostgreSQL
+        Index('idx_pharmacy_user', 'user_id', postgresql_include=['id']),
+        # Listings: active pharmacies by name, all or one owner's
+        Index(
+            'idx_pharmacy_active_name', 'name',
+            postgresql_where=is_active == True, sqlite_where=is_active == True
+        ),
+        Index(
+            'idx_pharmacy_user_active_name', 'user_id', 'name',
+            postgresql_where=is_active == True, sqlite_where=is_active == True
+        ),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<Pharmacy {self.name}>"
@@ -0,0 +1,46 @@
+"""Scraped duty-pharmacy snapshot models."""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+
+from app.database import Base
+
+
+class ScrapePayload(Base):
+    """Content-addressed, zlib-compressed list of scraped pharmacies."""
+
+    __tablename__ = "scrape_payloads"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 of the canonical JSON
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed canonical JSON
+    pharmacy_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ScrapePayload {self.content_hash[:12]}>"
+
+
+class ScrapeSnapshot(Base):
+    """Result of one scrape for an area (CAP or city) and a search slot."""
+
+    __tablename__ = "scrape_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    area = Column(String(200), nullable=False)  # Normalized CAP or city
+    slot = Column(DateTime, nullable=False)  # Search date + time rounded to 30 minutes
+    content_hash = Column(String(64), ForeignKey("scrape_payloads.content_hash"), nullable=False)
+    fetched_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    payload = relationship("ScrapePayload")
+
+    # The unique constraint doubles as the (area, slot) lookup index
+    __table_args__ = (
+        UniqueConstraint('area', 'slot', name='uq_scrape_snapshot_area_slot'),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<ScrapeSnapshot {self.area} at {self.slot}>"
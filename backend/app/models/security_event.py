@@ -0,0 +1,33 @@
+"""Security event model (append-only audit store)."""
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, JSON, String, Text
+
+from app.database import Base
+
+
+class SecurityEventRecord(Base):
+    """One security event, as written by the security logger."""
+
+    __tablename__ = "security_events"
+
+    # BIGINT on PostgreSQL; SQLite only autoincrements INTEGER primary keys
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    occurred_at = Column(DateTime, nullable=False)  # UTC
+    event_type = Column(String(50), nullable=False)
+    level = Column(String(10), nullable=False)
+    username = Column(String(255))
+    ip_address = Column(String(45))  # Fits IPv6
+    message = Column(Text)
+    details = Column(JSON)
+
+    # Windowed aggregations filter on one dimension plus a time range
+    __table_args__ = (
+        Index("idx_security_event_type_time", "event_type", "occurred_at"),
+        Index("idx_security_event_username_time", "username", "occurred_at"),
+        Index("idx_security_event_ip_time", "ip_address", "occurred_at"),
+        Index("idx_security_event_time", "occurred_at"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<SecurityEventRecord {self.event_type} at {self.occurred_at}>"
@@ -28,9 +28,10 @@ class Shift(Base):
     # Relationships
     pharmacy = relationship("Pharmacy", back_populates="shifts")
 
-    # Indexes for performance
+    # Indexes for performance: one pharmacy's shifts by day, in display
+    # order (end_time included so the current-shift check needs no heap row)
     __table_args__ = (
-        Index('idx_shift_pharmacy_date', 'pharmacy_id', 'date'),
+        Index('idx_shift_pharmacy_date_start', 'pharmacy_id', 'date', 'start_time', postgresql_include=['end_time']),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,20 @@
+"""Uploaded file model (content-addressed storage)."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String
+
+from app.database import Base
+
+
+class UploadBlob(Base):
+    """One stored file, shared by every record pointing at its URL."""
+
+    __tablename__ = "upload_blobs"
+
+    # /uploads/<subfolder>/<sha256><ext>: the URL is derived from the content
+    url = Column(String(500), primary_key=True)
+    sha256 = Column(String(64), nullable=False, index=True)
+    size = Column(BigInteger, nullable=False)
+    refcount = Column(Integer, nullable=False, default=1)  # Records using the file
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
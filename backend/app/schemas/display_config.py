@@ -1,7 +1,7 @@
 """Display configuration schemas."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from enum import Enum
 
 
@@ -53,6 +53,9 @@ class DisplayConfigResponse(DisplayConfigBase):
     pharmacy_id: str
     logo_path: Optional[str]
     image_path: Optional[str]
+    # Variante ("1080p", "720p", "thumb") -> formato ("webp", "avif") -> URL
+    logo_variants: Optional[Dict[str, Dict[str, str]]] = None
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
 
     class Config:
         from_attributes = True
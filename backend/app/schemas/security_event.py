@@ -0,0 +1,46 @@
+"""Security event schemas for the admin API."""
+from __future__ import annotations
+
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class SecurityEventResponse(BaseModel):
+    """Schema for a stored security event."""
+
+    id: int
+    occurred_at: datetime
+    event_type: str
+    level: str
+    username: Optional[str]
+    ip_address: Optional[str]
+    message: Optional[str]
+    details: Optional[Dict[str, Any]]
+
+    class Config:
+        """Pydantic config."""
+        from_attributes = True
+
+
+class SecurityEventAggregateItem(BaseModel):
+    """Schema for the events of one group value."""
+
+    key: Optional[str]
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+
+    class Config:
+        """Pydantic config."""
+        from_attributes = True
+
+
+class SecurityEventAggregateResponse(BaseModel):
+    """Schema for windowed security event aggregations."""
+
+    group_by: str
+    event_type: Optional[str]
+    window_minutes: int
+    items: List[SecurityEventAggregateItem]
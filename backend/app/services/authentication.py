@@ -8,9 +8,11 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from fastapi import Request, HTTPException, status
 from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 from passlib.context import CryptContext
 import redis.asyncio as redis
 
+from app.utils.security import password_hash_pool
 from app.core.account_lockout import AccountLockoutManager, get_lockout_manager
 from app.core.security_logging import (
     log_login_success,
@@ -177,29 +179,24 @@ class AuthenticationService:
         ip_address = self._get_client_ip(request)
         user_agent = request.headers.get("user-agent", "unknown")
 
-        # Check if account is locked out
-        try:
-            is_locked = await self.lockout_manager.is_locked_out(username)
-            if is_locked:
-                remaining_time = await self.lockout_manager.get_lockout_remaining_time(username)
-
-                # Log account locked attempt
-                log_account_locked(
-                    username=username,
-                    failed_attempts=await self.lockout_manager.get_failed_attempts_count(username),
-                    ip_address=ip_address
-                )
-
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "error": "account_locked",
-                        "message": f"Account temporarily locked. Try again in {remaining_time} seconds.",
-                        "locked_until_seconds": remaining_time
-                    }
-                )
-        except HTTPException:
-            raise
+        # Check if account is locked out (one Redis round-trip)
+        lockout_state = await self.lockout_manager.check(username)
+        if lockout_state.locked:
+            # Log account locked attempt
+            log_account_locked(
+                username=username,
+                failed_attempts=lockout_state.failed_attempts,
+                ip_address=ip_address
+            )
+
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "error": "account_locked",
+                    "message": f"Account temporarily locked. Try again in {lockout_state.remaining_seconds} seconds.",
+                    "locked_until_seconds": lockout_state.remaining_seconds
+                }
+            )
 
         # Check if user exists
         if not db_user:
@@ -223,8 +220,10 @@ class AuthenticationService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Verify password
-        password_valid = self.verify_password(password, db_user.get("hashed_password", ""))
+        # Verify password off the event loop
+        password_valid = await password_hash_pool.run(
+            self.verify_password, password, db_user.get("hashed_password", "")
+        )
 
         if not password_valid:
             # Record failed attempt
@@ -233,7 +232,9 @@ class AuthenticationService:
 
                 # Check if approaching lockout
                 if attempt_info["remaining_attempts"] <= 2:
-                    log_brute_force_detected(
+                    # Aggregates the event store with sync queries: off the event loop
+                    await run_in_threadpool(
+                        log_brute_force_detected,
                         username=username,
                         ip_address=ip_address,
                         attempts=attempt_info["failed_attempts"]
@@ -256,8 +257,9 @@ class AuthenticationService:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Authentication successful - reset failed attempts
-        await self.lockout_manager.reset_failed_attempts(username)
+        # Authentication successful - reset failed attempts, if any
+        if lockout_state.failed_attempts:
+            await self.lockout_manager.reset_failed_attempts(username)
 
         # Log successful login
         log_login_success(
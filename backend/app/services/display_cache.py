@@ -0,0 +1,94 @@
+"""Short-TTL cache of serialized display payloads, stored precompressed."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from app.config import get_settings
+from app.core.compression import PrecompressedBody
+
+settings = get_settings()
+
+
+class CachedDisplayPayload(PrecompressedBody):
+    """A display payload version, its compressed variants and its ETag."""
+
+    def __init__(self, body: bytes):
+        super().__init__(body)
+        self.etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+class DisplayPayloadCache:
+    """
+    In-process LRU cache of display payloads keyed by pharmacy.
+
+    Displays poll the same payload many times a minute; a version is built
+    and compressed once, then served until it expires. The TTL bounds how
+    stale current shifts can be, and how long another worker process keeps
+    serving a payload after a change. Within a process, shift changes drop
+    their pharmacy and pharmacy changes drop everything (nearby lists).
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CachedDisplayPayload]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pharmacy_id: UUID) -> Optional[CachedDisplayPayload]:
+        """Cached payload of a pharmacy, or None if missing or expired."""
+        if self.ttl_seconds <= 0:
+            return None
+
+        key = str(pharmacy_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+                self.misses += 1
+                if entry is not None:
+                    del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, pharmacy_id: UUID, body: bytes) -> CachedDisplayPayload:
+        """Store a new payload version of a pharmacy and return it."""
+        payload = CachedDisplayPayload(body)
+        if self.ttl_seconds <= 0:
+            return payload
+
+        with self._lock:
+            self._entries[str(pharmacy_id)] = (time.monotonic(), payload)
+            self._entries.move_to_end(str(pharmacy_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, pharmacy_id: UUID) -> None:
+        """Drop the payload of a pharmacy (its shifts changed)."""
+        with self._lock:
+            self._entries.pop(str(pharmacy_id), None)
+
+    def clear(self) -> None:
+        """Drop all payloads (a pharmacy changed: it may be in nearby lists)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache size and hit/miss counters."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Singleton instance
+display_cache = DisplayPayloadCache(
+    ttl_seconds=settings.DISPLAY_CACHE_TTL_SECONDS,
+    max_entries=settings.DISPLAY_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,273 @@
+"""Resized, recompressed variants of uploaded display images."""
+
+import io
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.display_config import DisplayConfig
+from app.utils import uploads
+from app.utils.uploads import DERIVED_DIRNAME, UPLOAD_URL_PREFIX, upload_path
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional: without it no variants are generated
+    Image = None
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:  # Only needed to rasterize PDFs
+    pdfium = None
+
+settings = get_settings()
+
+# Variant name -> bounding box; images are scaled down to fit, never up
+VARIANT_SIZES: Dict[str, Tuple[int, int]] = {
+    "1080p": (1920, 1080),
+    "720p": (1280, 720),
+    "thumb": (320, 320),
+}
+
+# Variants generated per upload column; logos are small on screen
+FIELD_VARIANTS: Dict[str, Tuple[str, ...]] = {
+    "image_path": ("1080p", "720p", "thumb"),
+    "logo_path": ("720p", "thumb"),
+}
+
+# Column holding the variant URLs of each upload column
+VARIANT_COLUMNS = {
+    "image_path": "image_variants",
+    "logo_path": "logo_variants",
+}
+
+# Encoder options per output format
+ENCODER_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 60, "speed": 8},
+}
+
+# Variants are stored next to their source, as <subfolder>/variants/<sha256>-<name>.<format>,
+# and deleted with it when its last reference is released
+VARIANTS_DIRNAME = DERIVED_DIRNAME
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Output formats supported by the installed Pillow."""
+    if Image is None:
+        return ()
+    return tuple(fmt for fmt in ENCODER_OPTIONS if features.check(fmt))
+
+
+def load_source_image(path: Path, max_size: Tuple[int, int]) -> "Image.Image":
+    """
+    Open an uploaded image, or the first page of a PDF, ready for resizing.
+
+    JPEGs are decoded at a reduced scale when much larger than needed
+    (draft mode), and the EXIF orientation is applied.
+
+    Raises:
+        ValueError: If the file is a PDF and pypdfium2 is not installed
+    """
+    if path.suffix.lower() == ".pdf":
+        if pdfium is None:
+            raise ValueError("pypdfium2 is required to rasterize PDFs")
+        pdf = pdfium.PdfDocument(str(path))
+        try:
+            page = pdf[0]
+            width, height = page.get_size()
+            scale = min(max_size[0] / width, max_size[1] / height)
+            return page.render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+
+    image = Image.open(path)
+    image.draft("RGB", max_size)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+    return image
+
+
+def generate_variants(source: Path, variant_names: Tuple[str, ...]) -> Dict[str, Dict[str, Path]]:
+    """
+    Write the variants of an uploaded image in every available format.
+
+    Uploads are content-addressed, so variants already on disk (same
+    content uploaded before) are reused instead of encoded again.
+
+    Args:
+        source: Uploaded file (JPEG, PNG or PDF)
+        variant_names: Keys of VARIANT_SIZES to generate
+
+    Returns:
+        Variant name -> format -> written file
+    """
+    formats = available_formats()
+    if not formats or not variant_names:
+        return {}
+
+    out_dir = source.parent / VARIANTS_DIRNAME
+    variants = {
+        name: {fmt: out_dir / f"{source.stem}-{name}.{fmt}" for fmt in formats}
+        for name in variant_names
+    }
+    missing = [name for name, targets in variants.items() if not all(t.exists() for t in targets.values())]
+    if not missing:
+        return variants
+
+    largest = max((VARIANT_SIZES[name] for name in missing), key=lambda size: size[0] * size[1])
+    base = load_source_image(source, largest)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    for name in missing:
+        image = base.copy()
+        image.thumbnail(VARIANT_SIZES[name], Image.Resampling.LANCZOS)
+        for fmt, target in variants[name].items():
+            _save_atomic(image, target, fmt)
+    return variants
+
+
+def variant_urls(variants: Dict[str, Dict[str, Path]]) -> Dict[str, Dict[str, str]]:
+    """Map variant files to their /uploads URLs."""
+    root = uploads.UPLOAD_DIR.resolve()
+    return {
+        name: {
+            fmt: UPLOAD_URL_PREFIX + path.resolve().relative_to(root).as_posix()
+            for fmt, path in formats.items()
+        }
+        for name, formats in variants.items()
+    }
+
+
+class ImageVariantPool:
+    """
+    Background generation of display config image variants.
+
+    Resizing and encoding run in a small thread pool (Pillow releases the
+    GIL while decoding, resampling and encoding), off the request path.
+    When done, the variant URLs are stored on the display config, unless
+    the upload was replaced in the meantime.
+    """
+
+    def __init__(self, max_workers: int, session_factory: Optional[Callable[[], Session]] = None):
+        """
+        Args:
+            max_workers: Worker threads (created lazily)
+            session_factory: Creates database sessions (default: SessionLocal)
+        """
+        self.max_workers = max_workers
+        self.session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Set[Future] = set()
+        self._lock = threading.Lock()
+        self._warned = False
+
+        self.completed = 0
+        self.failed = 0
+
+    def submit(self, config_id: int, field: str, source_url: str) -> Optional[Future]:
+        """
+        Queue variant generation for an uploaded file.
+
+        Args:
+            config_id: Display config id
+            field: Upload column ("image_path" or "logo_path")
+            source_url: /uploads URL of the uploaded file
+
+        Returns:
+            The job, or None if Pillow is not installed
+        """
+        if Image is None:
+            if not self._warned:
+                self._warned = True
+                print("Warning: Pillow not installed, image variants disabled")
+            return None
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="image-variants"
+                )
+            future = self._executor.submit(self._process, config_id, field, source_url)
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for all queued jobs (used by tests and shutdown)."""
+        with self._lock:
+            pending = set(self._pending)
+        wait(pending, timeout=timeout)
+
+    def shutdown(self) -> None:
+        """Finish queued jobs and stop the worker threads."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Queue depth and job counters."""
+        return {
+            "pending": len(self._pending),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def _discard(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def _process(self, config_id: int, field: str, source_url: str) -> None:
+        """Generate the variants, then store their URLs (never raises)."""
+        try:
+            source = upload_path(source_url)
+            if source is None or not source.exists():
+                return
+            # Not stored if the upload was replaced meanwhile; the files then
+            # go away with the source, when its last reference is released
+            urls = variant_urls(generate_variants(source, FIELD_VARIANTS[field]))
+            self._store(config_id, field, source_url, urls)
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Warning: Could not generate variants for {source_url}: {e}")
+
+    def _store(self, config_id: int, field: str, source_url: str, urls: Dict[str, Dict[str, str]]) -> bool:
+        """Save variant URLs if the config still points at the source file."""
+        if self.session_factory is None:
+            from app.database import SessionLocal
+            self.session_factory = SessionLocal
+
+        with self.session_factory() as db:
+            updated = db.query(DisplayConfig).filter(
+                DisplayConfig.id == config_id,
+                getattr(DisplayConfig, field) == source_url
+            ).update({VARIANT_COLUMNS[field]: urls}, synchronize_session=False)
+            db.commit()
+        return updated > 0
+
+
+def _save_atomic(image: "Image.Image", target: Path, fmt: str) -> None:
+    """Encode to a temp file next to target, then rename into place."""
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **ENCODER_OPTIONS[fmt])
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=".variant-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(buffer.getbuffer())
+        os.replace(tmp_name, target)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+# Singleton instance
+image_variant_pool = ImageVariantPool(max_workers=settings.IMAGE_VARIANT_WORKERS)
@@ -0,0 +1,305 @@
+"""Stale-while-revalidate cache and circuit breaker for scraped duty data."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.services.scraping_service import PharmacyShiftInfo, ScrapingService, scraping_service
+from app.services.snapshot_store import normalize_area
+
+settings = get_settings()
+
+
+class CircuitOpenError(Exception):
+    """Raised when the upstream is skipped because the circuit is open."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Upstream circuit open, retry in {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker for the scraping upstream.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused for `reset_timeout` seconds. Then a single trial
+    request is let through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current breaker state."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def retry_after(self) -> int:
+        """Seconds until the next trial request is allowed."""
+        if self.opened_at is None:
+            return 0
+        return max(0, int(self.reset_timeout - (time.monotonic() - self.opened_at)) + 1)
+
+    def allow_request(self) -> bool:
+        """Return True if a request to the upstream may be attempted now."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        """Forget an interrupted trial request without judging the upstream."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful upstream call."""
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit past the threshold."""
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+@dataclass
+class ScrapeResult:
+    """Pharmacies served for a search, with their freshness."""
+
+    pharmacies: List[PharmacyShiftInfo]
+    area: str
+    slot: datetime
+    fetched_at: datetime
+    stale: bool = False
+    refreshed: bool = False  # True if fetched from the upstream by this call
+
+
+@dataclass
+class _CacheEntry:
+    pharmacies: List[PharmacyShiftInfo]
+    fetched_at: datetime
+    stored_at: float
+
+
+CacheKey = Tuple[str, datetime]
+SnapshotLoader = Callable[[str, datetime], Optional[Tuple[List[PharmacyShiftInfo], datetime]]]
+RefreshHook = Callable[[str, datetime, List[PharmacyShiftInfo]], None]
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache of scrape results served stale-while-revalidate.
+
+    - Fresh entries are served directly.
+    - Stale entries are served immediately (stale=True) while a single
+      background task per key refreshes them.
+    - On a miss the snapshot persisted for the same slot, if any, is
+      served as stale and refreshed in background like a stale entry.
+    - Otherwise the upstream is awaited; if it fails, or the circuit is
+      open, the last good persisted snapshot is served as stale.
+    """
+
+    def __init__(
+        self,
+        service: ScrapingService,
+        ttl_seconds: float,
+        max_entries: int,
+        breaker: CircuitBreaker
+    ):
+        self.service = service
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.breaker = breaker
+        self.on_refresh: Optional[RefreshHook] = None  # Called after background refreshes
+
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._refreshing: Set[CacheKey] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+
+    async def get(
+        self,
+        cap: Optional[str] = None,
+        city: Optional[str] = None,
+        search_date: Optional[date] = None,
+        search_time: Optional[dt_time] = None,
+        persisted: Optional[SnapshotLoader] = None,
+        fallback: Optional[SnapshotLoader] = None
+    ) -> ScrapeResult:
+        """
+        Get pharmacies for a search, preferring cached data.
+
+        Args:
+            cap: CAP per la ricerca
+            city: Città per la ricerca
+            search_date: Data per la ricerca (default: oggi)
+            search_time: Ora per la ricerca (default: ora corrente)
+            persisted: Loader of the snapshot persisted for exactly (area, slot)
+            fallback: Loader of the last good persisted snapshot for (area, slot)
+
+        Returns:
+            Served pharmacies with their freshness
+
+        Raises:
+            CircuitOpenError: If the circuit is open and nothing can be served
+            Exception: Upstream error if it fails and nothing can be served
+        """
+        _, _, slot = self.service.resolve_search_slot(search_date, search_time)
+        area = normalize_area(cap, city)
+        key = (area, slot)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry.stored_at < self.ttl_seconds:
+                self.hits += 1
+                return ScrapeResult(entry.pharmacies, area, slot, entry.fetched_at)
+
+            self.stale_hits += 1
+            self._schedule_refresh(key, cap, city, search_date, search_time)
+            return ScrapeResult(entry.pharmacies, area, slot, entry.fetched_at, stale=True)
+
+        self.misses += 1
+        snapshot = persisted(area, slot) if persisted else None
+        if snapshot is not None:
+            self.stale_hits += 1
+            self._schedule_refresh(key, cap, city, search_date, search_time)
+            pharmacies, fetched_at = snapshot
+            return ScrapeResult(pharmacies, area, slot, fetched_at, stale=True)
+
+        try:
+            pharmacies = await self._fetch(key, cap, city, search_date, search_time)
+        except Exception:
+            snapshot = fallback(area, slot) if fallback else None
+            if snapshot is None:
+                raise
+            self.fallbacks += 1
+            pharmacies, fetched_at = snapshot
+            return ScrapeResult(pharmacies, area, slot, fetched_at, stale=True)
+
+        return ScrapeResult(pharmacies, area, slot, self._entries[key].fetched_at, refreshed=True)
+
+    async def _fetch(
+        self,
+        key: CacheKey,
+        cap: Optional[str],
+        city: Optional[str],
+        search_date: Optional[date],
+        search_time: Optional[dt_time]
+    ) -> List[PharmacyShiftInfo]:
+        """Call the upstream through the circuit breaker and cache the result."""
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(self.breaker.retry_after())
+
+        try:
+            pharmacies = await self.service.search_pharmacies(
+                cap=cap,
+                city=city,
+                search_date=search_date,
+                search_time=search_time
+            )
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        self._store(key, pharmacies)
+        return pharmacies
+
+    def _store(self, key: CacheKey, pharmacies: List[PharmacyShiftInfo]) -> None:
+        """Insert an entry, evicting the least recently used ones."""
+        self._entries[key] = _CacheEntry(pharmacies, datetime.utcnow(), time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _schedule_refresh(
+        self,
+        key: CacheKey,
+        cap: Optional[str],
+        city: Optional[str],
+        search_date: Optional[date],
+        search_time: Optional[dt_time]
+    ) -> None:
+        """Start one background refresh per key, unless the circuit is open."""
+        if key in self._refreshing or self.breaker.state == CircuitBreaker.OPEN:
+            return
+
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                pharmacies = await self._fetch(key, cap, city, search_date, search_time)
+                if self.on_refresh:
+                    # The hook writes through a sync session: keep it off the event loop
+                    await run_in_threadpool(self.on_refresh, key[0], key[1], pharmacies)
+            except Exception as e:
+                print(f"Background scraping refresh failed for {key[0]}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache and circuit breaker statistics."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fallbacks": self.fallbacks,
+            "refreshing": len(self._refreshing),
+            "circuit_state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+        }
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+
+# Singleton instance
+scrape_cache = StaleWhileRevalidateCache(
+    scraping_service,
+    ttl_seconds=settings.SCRAPING_CACHE_TTL_SECONDS,
+    max_entries=settings.SCRAPING_CACHE_MAX_ENTRIES,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.SCRAPING_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.SCRAPING_BREAKER_RESET_SECONDS
+    )
+)
@@ -0,0 +1,229 @@
+"""Match scraped pharmacies to our Pharmacy rows and compute real distances."""
+
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.pharmacy import Pharmacy
+from app.services.scraping_service import PharmacyShiftInfo
+from app.utils.geo import haversine_meters
+
+settings = get_settings()
+
+# Minimum similarity (0-1) for a fuzzy name/address match
+MATCH_THRESHOLD = 0.82
+
+# Common Italian street abbreviations found on farmaciediturno.org
+_ABBREVIATIONS = {
+    "V": "VIA",
+    "VLE": "VIALE",
+    "P": "PIAZZA",
+    "PZA": "PIAZZA",
+    "PZZA": "PIAZZA",
+    "CSO": "CORSO",
+    "C": "CORSO",
+    "LGO": "LARGO",
+    "S": "SAN",
+}
+
+# Words that carry no identity in pharmacy names
+_NAME_STOPWORDS = {"FARMACIA", "FARMACIE", "DR", "DOTT", "DOTTSSA", "DELLA", "DEL", "DI", "SNC", "SAS", "SRL"}
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """
+    Normalize a name or address for comparison.
+
+    Upper-cases, strips accents and punctuation, expands common street
+    abbreviations and collapses whitespace.
+    """
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFKD", value)
+    text = "".join(c for c in text if not unicodedata.combining(c)).upper()
+    # Dotted abbreviations: P.ZZA -> PZZA, C.SO -> CSO, V.LE -> VLE
+    text = re.sub(r"\b([A-Z])\.(ZZA|ZA|SO|LE|GO)\b", r"\1\2", text)
+    text = re.sub(r"[^A-Z0-9 ]+", " ", text)
+    return " ".join(_ABBREVIATIONS.get(word, word) for word in text.split())
+
+
+def _normalize_name(value: Optional[str]) -> str:
+    """Normalize a pharmacy name, dropping generic words."""
+    return " ".join(w for w in normalize_text(value).split() if w not in _NAME_STOPWORDS)
+
+
+@dataclass(frozen=True)
+class PharmacyMatch:
+    """Our pharmacy matched to a scraped entry."""
+
+    pharmacy_id: UUID
+    latitude: Optional[float]
+    longitude: Optional[float]
+    score: float
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    pharmacy_id: UUID
+    name: str
+    address: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+MatchKey = Tuple[str, str, str]
+
+
+class PharmacyMatcher:
+    """
+    Fuzzy matcher with an LRU/TTL cache of match results.
+
+    Results are cached per normalized (name, address, postal_code), negative
+    results included, so fuzzy matching runs once per unique scraped
+    pharmacy rather than once per request. Candidates are loaded once per
+    postal code. Call clear() when pharmacies are created, changed or removed.
+
+    The cache is per worker process and clear() only reaches the worker
+    that handled the write: the others keep their matches (negative ones,
+    coordinates and distances included) until the TTL expires, so keep it
+    short (PHARMACY_MATCH_CACHE_TTL_SECONDS).
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._matches: "OrderedDict[MatchKey, Tuple[float, Optional[PharmacyMatch]]]" = OrderedDict()
+        self._candidates: Dict[str, Tuple[float, List[_Candidate]]] = {}
+        self.match_runs = 0  # Number of fuzzy matching runs (cache misses)
+
+    def clear(self) -> None:
+        """Drop cached matches and candidates."""
+        self._matches.clear()
+        self._candidates.clear()
+
+    def match(self, db: Session, scraped: PharmacyShiftInfo) -> Optional[PharmacyMatch]:
+        """
+        Find our pharmacy corresponding to a scraped entry.
+
+        Args:
+            db: Database session
+            scraped: Scraped pharmacy
+
+        Returns:
+            The match, or None if no pharmacy is similar enough
+        """
+        postal_code = scraped.postal_code.strip()
+        key = (_normalize_name(scraped.name), normalize_text(scraped.address), postal_code)
+        now = time.monotonic()
+
+        cached = self._matches.get(key)
+        if cached is not None and now - cached[0] < self.ttl_seconds:
+            self._matches.move_to_end(key)
+            return cached[1]
+
+        self.match_runs += 1
+        result = self._best_match(key, self._get_candidates(db, postal_code, now))
+
+        self._matches[key] = (now, result)
+        self._matches.move_to_end(key)
+        while len(self._matches) > self.max_entries:
+            self._matches.popitem(last=False)
+
+        return result
+
+    def _get_candidates(self, db: Session, postal_code: str, now: float) -> List[_Candidate]:
+        """Load (and cache) active pharmacies sharing a postal code."""
+        cached = self._candidates.get(postal_code)
+        if cached is not None and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+
+        rows = db.query(
+            Pharmacy.id, Pharmacy.name, Pharmacy.address, Pharmacy.latitude, Pharmacy.longitude
+        ).filter(
+            Pharmacy.postal_code == postal_code,
+            Pharmacy.is_active == True
+        ).all()
+
+        candidates = [
+            _Candidate(row.id, _normalize_name(row.name), normalize_text(row.address), row.latitude, row.longitude)
+            for row in rows
+        ]
+        self._candidates[postal_code] = (now, candidates)
+        return candidates
+
+    @staticmethod
+    def _best_match(key: MatchKey, candidates: List[_Candidate]) -> Optional[PharmacyMatch]:
+        """Score candidates on name and address similarity."""
+        name, address, _ = key
+        best: Optional[PharmacyMatch] = None
+
+        for candidate in candidates:
+            name_score = SequenceMatcher(None, name, candidate.name).ratio()
+            if address and candidate.address:
+                address_score = SequenceMatcher(None, address, candidate.address).ratio()
+                # Same street address is strong evidence even if names differ
+                score = max(0.5 * name_score + 0.5 * address_score, address_score if address_score == 1.0 else 0.0)
+            else:
+                score = name_score
+
+            if score >= MATCH_THRESHOLD and (best is None or score > best.score):
+                best = PharmacyMatch(candidate.pharmacy_id, candidate.latitude, candidate.longitude, score)
+
+        return best
+
+
+def enrich_pharmacies(
+    db: Session,
+    pharmacies: List[PharmacyShiftInfo],
+    origin: Optional[Pharmacy] = None,
+    matcher: Optional["PharmacyMatcher"] = None
+) -> List[PharmacyShiftInfo]:
+    """
+    Attach our pharmacy id, coordinates and real distance to scraped entries.
+
+    Args:
+        db: Database session
+        pharmacies: Scraped pharmacies (left untouched)
+        origin: Pharmacy of the requesting display, used for distances
+        matcher: Matcher to use (default: module-level cached matcher)
+
+    Returns:
+        Enriched copies of the scraped pharmacies
+    """
+    matcher = matcher or pharmacy_matcher
+    has_origin = origin is not None and origin.latitude is not None and origin.longitude is not None
+
+    enriched = []
+    for scraped in pharmacies:
+        match = matcher.match(db, scraped)
+        if match is None:
+            enriched.append(scraped)
+            continue
+
+        update = {
+            "pharmacy_id": match.pharmacy_id,
+            "latitude": match.latitude,
+            "longitude": match.longitude,
+        }
+        if has_origin and match.latitude is not None and match.longitude is not None:
+            meters = haversine_meters(origin.latitude, origin.longitude, match.latitude, match.longitude)
+            update["distance_from_pharmacy_km"] = round(meters / 1000, 2)
+
+        enriched.append(scraped.model_copy(update=update))
+
+    return enriched
+
+
+# Singleton instance
+pharmacy_matcher = PharmacyMatcher(
+    ttl_seconds=settings.PHARMACY_MATCH_CACHE_TTL_SECONDS,
+    max_entries=settings.PHARMACY_MATCH_CACHE_MAX_ENTRIES
+)
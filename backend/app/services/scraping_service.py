@@ -2,10 +2,13 @@
 
 import httpx
 from bs4 import BeautifulSoup
-from typing import List, Optional
-from datetime import datetime, date, time as dt_time
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, date, time as dt_time, timedelta
 from pydantic import BaseModel
 import re
+from uuid import UUID
+
+from app.config import get_settings
 
 
 class PharmacyShiftInfo(BaseModel):
@@ -22,6 +25,15 @@ class PharmacyShiftInfo(BaseModel):
     distance_km: Optional[float] = None
     image_url: Optional[str] = None
     details_url: Optional[str] = None
+    # Arricchimento: farmacia corrispondente nel nostro database
+    pharmacy_id: Optional[UUID] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    distance_from_pharmacy_km: Optional[float] = None
+
+
+# Campi aggiunti dall'arricchimento, esclusi dagli snapshot
+ENRICHMENT_FIELDS = {"pharmacy_id", "latitude", "longitude", "distance_from_pharmacy_km"}
 
 
 class ScrapingService:
@@ -30,55 +42,140 @@ class ScrapingService:
     BASE_URL = "https://www.farmaciediturno.org"
     SEARCH_URL = f"{BASE_URL}/ricercaditurno.asp"
 
-    def __init__(self):
+    DEFAULT_HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+        "Accept-Language": "it-IT,it;q=0.9,en-US;q=0.8,en;q=0.7",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Accept-Charset": "utf-8",
+        "Referer": "https://www.farmaciediturno.org/",
+        "Origin": "https://www.farmaciediturno.org",
+        "DNT": "1",
+        "Upgrade-Insecure-Requests": "1",
+        "Sec-Fetch-Dest": "document",
+        "Sec-Fetch-Mode": "navigate",
+        "Sec-Fetch-Site": "same-origin",
+        "Sec-Fetch-User": "?1",
+        "Cache-Control": "max-age=0"
+    }
+
+    # Upper bound on remembered Last-Modified/ETag entries (oldest evicted first)
+    MAX_CACHED_VALIDATORS = 512
+
+    def __init__(
+        self,
+        http2: Optional[bool] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None
+    ):
+        """
+        Configura il servizio; il client HTTP viene creato da start().
+
+        I parametri non indicati vengono letti dalle impostazioni SCRAPING_*.
+        """
+        settings = get_settings()
+        self.timeout = httpx.Timeout(settings.SCRAPING_TIMEOUT_SECONDS)
+        self.http2 = settings.SCRAPING_HTTP2 if http2 is None else http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.SCRAPING_MAX_CONNECTIONS,
+            max_keepalive_connections=max_keepalive_connections or settings.SCRAPING_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=keepalive_expiry or settings.SCRAPING_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.client: Optional[httpx.AsyncClient] = None
+
+        # Validators (Last-Modified / ETag) and parsed result per search form
+        self._validators: Dict[Tuple[str, ...], Tuple[Optional[str], Optional[str], List[PharmacyShiftInfo]]] = {}
+
+        # Counters exposed by get_pool_stats()
+        self._requests_total = 0
+        self._not_modified_total = 0
+        self._errors_total = 0
+
+    async def start(self):
+        """Create the pooled HTTP client (called on application startup)."""
+        if self.client is not None:
+            return
+
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401 - required by httpx for HTTP/2
+            except ImportError:
+                print("Warning: 'h2' not installed, scraping client falls back to HTTP/1.1")
+                http2 = False
+
         self.client = httpx.AsyncClient(
-            timeout=30.0,
+            http2=http2,
+            limits=self.limits,
+            timeout=self.timeout,
             follow_redirects=True,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-                "Accept-Language": "it-IT,it;q=0.9,en-US;q=0.8,en;q=0.7",
-                "Accept-Encoding": "gzip, deflate, br",
-                "Accept-Charset": "utf-8",
-                "Referer": "https://www.farmaciediturno.org/",
-                "Origin": "https://www.farmaciediturno.org",
-                "DNT": "1",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "same-origin",
-                "Sec-Fetch-User": "?1",
-                "Cache-Control": "max-age=0"
-            }
+            headers=self.DEFAULT_HEADERS
         )
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client (called on application shutdown)."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the HTTP client, starting it if used outside the app lifecycle."""
+        if self.client is None:
+            await self.start()
+        return self.client
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """
+        Statistiche del connection pool e delle richieste verso l'upstream.
 
-    async def search_pharmacies(
+        Returns:
+            Dizionario con limiti configurati, connessioni aperte/idle,
+            richieste in coda e contatori di richieste, 304 ed errori
+        """
+        stats: Dict[str, Any] = {
+            "started": self.client is not None,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "requests_total": self._requests_total,
+            "not_modified_total": self._not_modified_total,
+            "errors_total": self._errors_total,
+            "cached_validators": len(self._validators),
+            "connections": 0,
+            "idle_connections": 0,
+            "http2_connections": 0,
+            "queued_requests": 0,
+        }
+
+        # httpx does not expose its httpcore pool publicly; read it defensively
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        if pool is not None:
+            connections = list(getattr(pool, "connections", []))
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+            stats["http2_connections"] = sum(1 for c in connections if "HTTP/2" in c.info())
+            stats["queued_requests"] = len(getattr(pool, "_requests", []))
+
+        return stats
+
+    def resolve_search_slot(
         self,
-        cap: Optional[str] = None,
-        city: Optional[str] = None,
         search_date: Optional[date] = None,
         search_time: Optional[dt_time] = None
-    ) -> List[PharmacyShiftInfo]:
+    ) -> Tuple[int, int, datetime]:
         """
-        Cerca farmacie di turno o aperte.
+        Risolve data/ora richieste nello slot di ricerca del sito.
 
         Args:
-            cap: CAP per la ricerca
-            city: Città per la ricerca
             search_date: Data per la ricerca (default: oggi)
             search_time: Ora per la ricerca (default: ora corrente)
 
         Returns:
-            Lista di farmacie trovate
+            Tupla (giorno, orario, slot): offset giorno per il form (1 = oggi),
+            orario in formato HHMM e datetime dello slot arrotondato a 30 minuti
         """
-        if not cap and not city:
-            raise ValueError("Deve essere specificato almeno CAP o città")
-
         # Default to current date/time if not specified
         if not search_date:
             search_date = datetime.now().date()
@@ -110,6 +207,35 @@ class ScrapingService:
 
         orario = hour * 100 + minute  # e.g., 23:30 = 2330
 
+        slot_date = today + timedelta(days=day_offset - 1)
+        slot = datetime.combine(slot_date, dt_time(hour, minute))
+
+        return day_offset, orario, slot
+
+    async def search_pharmacies(
+        self,
+        cap: Optional[str] = None,
+        city: Optional[str] = None,
+        search_date: Optional[date] = None,
+        search_time: Optional[dt_time] = None
+    ) -> List[PharmacyShiftInfo]:
+        """
+        Cerca farmacie di turno o aperte.
+
+        Args:
+            cap: CAP per la ricerca
+            city: Città per la ricerca
+            search_date: Data per la ricerca (default: oggi)
+            search_time: Ora per la ricerca (default: ora corrente)
+
+        Returns:
+            Lista di farmacie trovate
+        """
+        if not cap and not city:
+            raise ValueError("Deve essere specificato almeno CAP o città")
+
+        day_offset, orario, _ = self.resolve_search_slot(search_date, search_time)
+
         # Prepare form data matching the actual form structure
         form_data = {
             "indirizzo": cap if cap else city,
@@ -118,9 +244,27 @@ class ScrapingService:
             "md": "Avvia la ricerca"
         }
 
+        # Conditional request: reuse the parsed result if the upstream says 304
+        cache_key = tuple(sorted(form_data.items()))
+        headers = {}
+        cached = self._validators.get(cache_key)
+        if cached:
+            last_modified, etag, _ = cached
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            if etag:
+                headers["If-None-Match"] = etag
+
         try:
             # Make POST request to search
-            response = await self.client.post(self.SEARCH_URL, data=form_data)
+            client = await self._get_client()
+            self._requests_total += 1
+            response = await client.post(self.SEARCH_URL, data=form_data, headers=headers)
+
+            if response.status_code == 304 and cached:
+                self._not_modified_total += 1
+                return list(cached[2])
+
             response.raise_for_status()
 
             # The site uses ISO-8859-1 (Latin-1) encoding, not UTF-8
@@ -145,12 +289,25 @@ class ScrapingService:
                     print(f"Error parsing pharmacy box: {e}")
                     continue
 
+            # Remember validators only if the upstream supports them
+            last_modified = response.headers.get("last-modified")
+            etag = response.headers.get("etag")
+            if last_modified or etag:
+                self._validators.pop(cache_key, None)
+                if len(self._validators) >= self.MAX_CACHED_VALIDATORS:
+                    self._validators.pop(next(iter(self._validators)))
+                self._validators[cache_key] = (last_modified, etag, pharmacies)
+            else:
+                self._validators.pop(cache_key, None)
+
             return pharmacies
 
         except httpx.HTTPError as e:
+            self._errors_total += 1
             print(f"HTTP error during scraping: {e}")
             raise
         except Exception as e:
+            self._errors_total += 1
             print(f"Error during scraping: {e}")
             raise
 
@@ -271,5 +428,5 @@ class ScrapingService:
             return None
 
 
-# Singleton instance
+# Singleton instance (HTTP client started/closed by the app lifecycle)
 scraping_service = ScrapingService()
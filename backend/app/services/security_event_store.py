@@ -0,0 +1,285 @@
+"""Append-only store and windowed aggregations for security events."""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import distinct, func, insert
+from sqlalchemy.orm import Session
+
+from app.models.security_event import SecurityEventRecord
+
+# Columns security events can be grouped by
+GROUP_BY_COLUMNS = {
+    "ip_address": SecurityEventRecord.ip_address,
+    "username": SecurityEventRecord.username,
+    "event_type": SecurityEventRecord.event_type,
+}
+
+
+@dataclass
+class EventAggregate:
+    """Number of events for one group value within a window."""
+
+    key: Optional[str]
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+
+
+def _window_start(window: timedelta, now: Optional[datetime] = None) -> datetime:
+    """Start of a window ending now (UTC)."""
+    return (now or datetime.utcnow()) - window
+
+
+def count_events(
+    db: Session,
+    event_type: str,
+    window: timedelta,
+    username: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> int:
+    """
+    Count events of a type within a window.
+
+    Args:
+        db: Database session
+        event_type: Event type (SecurityEventType value)
+        window: Window length, ending now
+        username: Restrict to a username
+        ip_address: Restrict to an IP address
+        now: End of the window (default: utcnow)
+
+    Returns:
+        Number of matching events
+    """
+    query = db.query(func.count(SecurityEventRecord.id)).filter(
+        SecurityEventRecord.event_type == event_type,
+        SecurityEventRecord.occurred_at >= _window_start(window, now)
+    )
+    if username is not None:
+        query = query.filter(SecurityEventRecord.username == username)
+    if ip_address is not None:
+        query = query.filter(SecurityEventRecord.ip_address == ip_address)
+    return query.scalar() or 0
+
+
+def aggregate_events(
+    db: Session,
+    window: timedelta,
+    group_by: str = "ip_address",
+    event_type: Optional[str] = None,
+    min_count: int = 1,
+    limit: int = 20,
+    now: Optional[datetime] = None
+) -> List[EventAggregate]:
+    """
+    Count events per group value within a window, busiest first.
+
+    Example: failed logins per IP in the last hour is
+    aggregate_events(db, timedelta(hours=1), "ip_address", "login_failure").
+
+    Args:
+        db: Database session
+        window: Window length, ending now
+        group_by: One of GROUP_BY_COLUMNS
+        event_type: Restrict to an event type
+        min_count: Drop groups with fewer events
+        limit: Max groups returned
+        now: End of the window (default: utcnow)
+
+    Returns:
+        Aggregates ordered by count (descending)
+
+    Raises:
+        ValueError: If group_by is not supported
+    """
+    if group_by not in GROUP_BY_COLUMNS:
+        raise ValueError(f"Cannot group security events by {group_by!r}")
+
+    column = GROUP_BY_COLUMNS[group_by]
+    count = func.count(SecurityEventRecord.id).label("count")
+
+    query = db.query(
+        column.label("key"),
+        count,
+        func.min(SecurityEventRecord.occurred_at).label("first_seen"),
+        func.max(SecurityEventRecord.occurred_at).label("last_seen"),
+    ).filter(SecurityEventRecord.occurred_at >= _window_start(window, now))
+
+    if event_type is not None:
+        query = query.filter(SecurityEventRecord.event_type == event_type)
+
+    rows = query.group_by(column).having(count >= min_count).order_by(count.desc()).limit(limit).all()
+
+    return [EventAggregate(row.key, row.count, row.first_seen, row.last_seen) for row in rows]
+
+
+def list_events(
+    db: Session,
+    window: timedelta,
+    event_type: Optional[str] = None,
+    username: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    limit: int = 100,
+    now: Optional[datetime] = None
+) -> List[SecurityEventRecord]:
+    """List the most recent events within a window, with optional filters."""
+    query = db.query(SecurityEventRecord).filter(
+        SecurityEventRecord.occurred_at >= _window_start(window, now)
+    )
+    if event_type is not None:
+        query = query.filter(SecurityEventRecord.event_type == event_type)
+    if username is not None:
+        query = query.filter(SecurityEventRecord.username == username)
+    if ip_address is not None:
+        query = query.filter(SecurityEventRecord.ip_address == ip_address)
+    return query.order_by(SecurityEventRecord.occurred_at.desc()).limit(limit).all()
+
+
+class SecurityEventStore:
+    """
+    Writer and reader of the security event table.
+
+    Uses its own short-lived sessions, so it can be called from the
+    security logger's background thread.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session]):
+        """
+        Args:
+            session_factory: Creates database sessions (e.g. SessionLocal)
+        """
+        self.session_factory = session_factory
+
+    def append(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of events with a single executemany.
+
+        Args:
+            events: Event dicts as produced by the security logger
+
+        Returns:
+            Number of rows inserted
+        """
+        rows = [
+            {
+                "occurred_at": event["timestamp"],
+                "event_type": event["event_type"],
+                "level": event["level"],
+                "username": event.get("username"),
+                "ip_address": event.get("ip_address"),
+                "message": event.get("message"),
+                "details": event.get("details"),
+            }
+            for event in events
+        ]
+        if not rows:
+            return 0
+
+        with self.session_factory() as db:
+            db.execute(insert(SecurityEventRecord), rows)
+            db.commit()
+        return len(rows)
+
+    def purge_before(self, cutoff: datetime) -> int:
+        """
+        Delete events older than a cutoff (retention).
+
+        Args:
+            cutoff: Oldest timestamp to keep (UTC)
+
+        Returns:
+            Number of rows deleted
+        """
+        with self.session_factory() as db:
+            deleted = db.query(SecurityEventRecord).filter(
+                SecurityEventRecord.occurred_at < cutoff
+            ).delete(synchronize_session=False)
+            db.commit()
+        return deleted
+
+    def brute_force_summary(
+        self,
+        ip_address: Optional[str],
+        username: Optional[str],
+        window: timedelta
+    ) -> Dict[str, int]:
+        """
+        Failed-login aggregates used to qualify a brute-force alert.
+
+        Args:
+            ip_address: Attacking IP address
+            username: Targeted username
+            window: Window length, ending now
+
+        Returns:
+            Failures from the IP, distinct usernames it targeted and
+            failures on the username from any IP
+        """
+        since = _window_start(window)
+        with self.session_factory() as db:
+            ip_failures, ip_usernames = db.query(
+                func.count(SecurityEventRecord.id),
+                func.count(distinct(SecurityEventRecord.username))
+            ).filter(
+                SecurityEventRecord.event_type == "login_failure",
+                SecurityEventRecord.ip_address == ip_address,
+                SecurityEventRecord.occurred_at >= since
+            ).one()
+
+            username_failures = count_events(db, "login_failure", window, username=username) if username else 0
+
+        return {
+            "ip_failures": ip_failures,
+            "ip_distinct_usernames": ip_usernames,
+            "username_failures": username_failures,
+            "window_minutes": int(window.total_seconds() // 60),
+        }
+
+
+class SecurityEventRetention:
+    """
+    Purges events older than the retention period in a background thread.
+
+    Purges once when started, then every `interval` seconds. Each worker
+    process runs its own thread; concurrent purges delete the same rows.
+    """
+
+    def __init__(self, store: SecurityEventStore, retention: timedelta, interval: float):
+        self.store = store
+        self.retention = retention
+        self.interval = interval
+        self.purged_total = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="security-event-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def purge(self) -> int:
+        """Delete the expired events now; never raises."""
+        try:
+            deleted = self.store.purge_before(datetime.utcnow() - self.retention)
+        except Exception as e:
+            print(f"Warning: Could not purge security events: {e}")
+            return 0
+        self.purged_total += deleted
+        return deleted
+
+    def _run(self) -> None:
+        self.purge()
+        while not self._stop.wait(self.interval):
+            self.purge()
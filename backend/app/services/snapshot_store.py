@@ -0,0 +1,217 @@
+"""Persistent, deduplicated store for scraped duty-pharmacy snapshots."""
+
+import hashlib
+import json
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.scrape_snapshot import ScrapePayload, ScrapeSnapshot
+from app.services.scraping_service import ENRICHMENT_FIELDS, PharmacyShiftInfo
+
+# zlib level 6 is the default trade-off; payloads are small and read rarely
+COMPRESSION_LEVEL = 6
+
+
+@dataclass
+class SnapshotSaveResult:
+    """Outcome of persisting one scrape."""
+
+    snapshot: ScrapeSnapshot
+    changed: bool  # False if identical to the previous snapshot for the area
+    previous_hash: Optional[str] = None
+
+
+@dataclass
+class SnapshotDiff:
+    """Differences between two snapshots of the same area."""
+
+    from_hash: Optional[str]
+    to_hash: Optional[str]
+    added: List[PharmacyShiftInfo] = field(default_factory=list)
+    removed: List[PharmacyShiftInfo] = field(default_factory=list)
+    changed: List[PharmacyShiftInfo] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """True if at least one pharmacy was added, removed or changed."""
+        return bool(self.added or self.removed or self.changed)
+
+
+def normalize_area(cap: Optional[str] = None, city: Optional[str] = None) -> str:
+    """
+    Build the area key used to group snapshots.
+
+    Args:
+        cap: CAP used for the search
+        city: City used for the search (ignored if cap is given)
+
+    Returns:
+        Normalized area key (CAP, or upper-cased city)
+    """
+    if cap:
+        return cap.strip()
+    return " ".join((city or "").split()).upper()
+
+
+def pharmacy_key(pharmacy: PharmacyShiftInfo) -> str:
+    """Stable identity of a scraped pharmacy across snapshots."""
+    name = " ".join(pharmacy.name.split()).upper()
+    address = " ".join(pharmacy.address.split()).upper()
+    return f"{name}|{address}|{pharmacy.postal_code.strip()}"
+
+
+def _canonical_json(pharmacies: List[PharmacyShiftInfo]) -> bytes:
+    """Serialize pharmacies in a canonical, order-independent form (enrichment excluded)."""
+    items = sorted(
+        (p.model_dump(exclude=ENRICHMENT_FIELDS) for p in pharmacies),
+        key=lambda item: (item["name"], item["address"], item["postal_code"])
+    )
+    return json.dumps(items, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_payload(payload: ScrapePayload) -> List[PharmacyShiftInfo]:
+    """Decompress a stored payload back into pharmacy models."""
+    items = json.loads(zlib.decompress(payload.payload).decode("utf-8"))
+    return [PharmacyShiftInfo(**item) for item in items]
+
+
+def save_snapshot(
+    db: Session,
+    area: str,
+    slot: datetime,
+    pharmacies: List[PharmacyShiftInfo]
+) -> SnapshotSaveResult:
+    """
+    Persist a scrape, storing its payload only once per distinct content.
+
+    Re-scraping an already stored slot updates it in place.
+
+    Args:
+        db: Database session
+        area: Normalized area key (see normalize_area)
+        slot: Search slot the scrape refers to
+        pharmacies: Scraped pharmacies
+
+    Returns:
+        Saved snapshot and whether its content differs from the previous one
+    """
+    canonical = _canonical_json(pharmacies)
+    content_hash = hashlib.sha256(canonical).hexdigest()
+
+    # Deduplicate payloads by content hash
+    if db.get(ScrapePayload, content_hash) is None:
+        db.add(ScrapePayload(
+            content_hash=content_hash,
+            payload=zlib.compress(canonical, COMPRESSION_LEVEL),
+            pharmacy_count=len(pharmacies)
+        ))
+
+    snapshot = db.query(ScrapeSnapshot).filter(
+        ScrapeSnapshot.area == area,
+        ScrapeSnapshot.slot == slot
+    ).first()
+
+    if snapshot:
+        previous_hash = snapshot.content_hash
+        snapshot.content_hash = content_hash
+    else:
+        previous = get_previous_snapshot(db, area, slot)
+        previous_hash = previous.content_hash if previous else None
+        snapshot = ScrapeSnapshot(area=area, slot=slot, content_hash=content_hash)
+        db.add(snapshot)
+
+    db.commit()
+    db.refresh(snapshot)
+
+    return SnapshotSaveResult(
+        snapshot=snapshot,
+        changed=previous_hash != content_hash,
+        previous_hash=previous_hash
+    )
+
+
+def get_snapshot(db: Session, area: str, slot: datetime) -> Optional[ScrapeSnapshot]:
+    """Get the snapshot stored for an exact area and slot."""
+    return db.query(ScrapeSnapshot).filter(
+        ScrapeSnapshot.area == area,
+        ScrapeSnapshot.slot == slot
+    ).first()
+
+
+def get_previous_snapshot(db: Session, area: str, slot: datetime) -> Optional[ScrapeSnapshot]:
+    """Get the most recent snapshot for an area strictly before a slot."""
+    return db.query(ScrapeSnapshot).filter(
+        ScrapeSnapshot.area == area,
+        ScrapeSnapshot.slot < slot
+    ).order_by(ScrapeSnapshot.slot.desc()).first()
+
+
+def get_latest_snapshot(db: Session, area: str) -> Optional[ScrapeSnapshot]:
+    """Get the most recently fetched snapshot for an area."""
+    return db.query(ScrapeSnapshot).filter(
+        ScrapeSnapshot.area == area
+    ).order_by(ScrapeSnapshot.fetched_at.desc(), ScrapeSnapshot.slot.desc()).first()
+
+
+def list_snapshots(db: Session, area: str, limit: int = 50) -> List[ScrapeSnapshot]:
+    """List the snapshots of an area, most recent slot first."""
+    return db.query(ScrapeSnapshot).filter(
+        ScrapeSnapshot.area == area
+    ).order_by(ScrapeSnapshot.slot.desc()).limit(limit).all()
+
+
+def load_pharmacies(snapshot: Optional[ScrapeSnapshot]) -> List[PharmacyShiftInfo]:
+    """
+    Load the pharmacies stored in a snapshot.
+
+    Args:
+        snapshot: Snapshot to load (None yields an empty list)
+
+    Returns:
+        Scraped pharmacies
+    """
+    if snapshot is None:
+        return []
+    return _decode_payload(snapshot.payload)
+
+
+def diff_snapshots(
+    old: Optional[ScrapeSnapshot],
+    new: Optional[ScrapeSnapshot]
+) -> SnapshotDiff:
+    """
+    Compute what changed between two snapshots.
+
+    Identical content hashes short-circuit without decompressing payloads.
+
+    Args:
+        old: Earlier snapshot (None means "nothing")
+        new: Later snapshot (None means "nothing")
+
+    Returns:
+        Added, removed and changed pharmacies
+    """
+    old_hash = old.content_hash if old else None
+    new_hash = new.content_hash if new else None
+
+    diff = SnapshotDiff(from_hash=old_hash, to_hash=new_hash)
+    if old_hash == new_hash:
+        return diff
+
+    old_by_key: Dict[str, PharmacyShiftInfo] = {pharmacy_key(p): p for p in load_pharmacies(old)}
+    new_by_key: Dict[str, PharmacyShiftInfo] = {pharmacy_key(p): p for p in load_pharmacies(new)}
+
+    for key, pharmacy in new_by_key.items():
+        previous = old_by_key.get(key)
+        if previous is None:
+            diff.added.append(pharmacy)
+        elif previous != pharmacy:
+            diff.changed.append(pharmacy)
+
+    diff.removed = [p for key, p in old_by_key.items() if key not in new_by_key]
+
+    return diff
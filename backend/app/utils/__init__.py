@@ -3,6 +3,10 @@
 from app.utils.security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    password_hash_pool,
+    PasswordHashPoolBusyError,
     create_access_token,
     decode_token,
 )
@@ -10,6 +14,10 @@ from app.utils.security import (
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "password_hash_pool",
+    "PasswordHashPoolBusyError",
     "create_access_token",
     "decode_token",
 ]
@@ -0,0 +1,29 @@
+"""Geographic helpers."""
+
+from math import radians, sin, cos, sqrt, atan2
+
+EARTH_RADIUS_METERS = 6371000
+
+
+def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle distance between two points using the Haversine formula.
+
+    Args:
+        lat1: Latitude of the first point (degrees)
+        lon1: Longitude of the first point (degrees)
+        lat2: Latitude of the second point (degrees)
+        lon2: Longitude of the second point (degrees)
+
+    Returns:
+        Distance in meters
+    """
+    phi1, lambda1 = radians(lat1), radians(lon1)
+    phi2, lambda2 = radians(lat2), radians(lon2)
+
+    dlat = phi2 - phi1
+    dlon = lambda2 - lambda1
+
+    a = sin(dlat / 2) ** 2 + cos(phi1) * cos(phi2) * sin(dlon / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return EARTH_RADIUS_METERS * c
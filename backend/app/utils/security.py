@@ -1,8 +1,12 @@
 """Security utilities for password hashing and JWT token management."""
 
+import asyncio
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -11,6 +15,8 @@ from app.config import get_settings
 
 settings = get_settings()
 
+T = TypeVar("T")
+
 # Password hashing context with bcrypt (cost factor 12)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 
@@ -42,6 +48,157 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashPoolBusyError(Exception):
+    """Raised when too many hashing jobs are already waiting."""
+
+
+class PasswordHashPool:
+    """
+    Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt costs ~250 ms of CPU per call at 12 rounds; running it inline in an
+    async endpoint freezes the event loop. Jobs run on a dedicated thread pool
+    (bcrypt releases the GIL) and at most `max_workers + max_queue` jobs may be
+    pending: further ones are rejected with PasswordHashPoolBusyError instead
+    of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        self.pending = 0  # Submitted and not yet finished (running + queued)
+        self.running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return self.pending - self.running
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a hashing function on the pool.
+
+        Args:
+            func: Function to run (e.g. pwd_context.verify)
+            *args: Its arguments
+
+        Returns:
+            The function result
+
+        Raises:
+            PasswordHashPoolBusyError: If the pool queue is full
+        """
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHashPoolBusyError("Password hashing queue is full")
+            self.pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        submitted_at = time.perf_counter()
+
+        def job() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self.running += 1
+                self.total_wait_seconds += started_at - submitted_at
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.pending -= 1
+                    self.completed += 1
+                    self.total_run_seconds += time.perf_counter() - started_at
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_executor(), job)
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        return await future
+
+    def get_stats(self) -> dict[str, Any]:
+        """Pool size, queue depth and timing counters."""
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": completed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait_seconds / completed * 1000, 2) if completed else 0.0,
+                "avg_run_ms": round(self.total_run_seconds / completed * 1000, 2) if completed else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, waiting for running jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hash_pool = PasswordHashPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing pool, without blocking the event loop.
+
+    Args:
+        plain_password: The plain text password
+        hashed_password: The hashed password to verify against
+
+    Returns:
+        True if the password matches, False otherwise
+
+    Raises:
+        PasswordHashPoolBusyError: If the hashing queue is full
+    """
+    return await password_hash_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password on the hashing pool, without blocking the event loop.
+
+    Args:
+        password: The plain text password to hash
+
+    Returns:
+        The hashed password
+
+    Raises:
+        PasswordHashPoolBusyError: If the hashing queue is full
+    """
+    return await password_hash_pool.run(pwd_context.hash, password)
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """
     Create a JWT access token.
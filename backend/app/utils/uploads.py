@@ -0,0 +1,226 @@
+"""Content-addressed, reference-counted storage of uploaded files."""
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.upload_blob import UploadBlob
+
+settings = get_settings()
+
+# Root of all uploaded files, served under /uploads
+UPLOAD_DIR = Path(settings.UPLOAD_DIR)
+UPLOAD_URL_PREFIX = "/uploads/"
+
+# Files derived from an upload (e.g. resized variants) live in this
+# subdirectory, named "<upload stem>-<suffix>", and go away with it
+DERIVED_DIRNAME = "variants"
+
+# Session.info key of the URLs released in the current transaction
+_RELEASED_KEY = "released_uploads"
+
+
+@dataclass
+class StoredUpload:
+    """File written to the upload directory."""
+
+    url: str
+    path: Path
+    size: int
+    sha256: str
+    deduplicated: bool = False  # Same content was already stored
+
+
+def save_upload_file(
+    db: Session,
+    upload_file: UploadFile,
+    subfolder: str,
+    allowed_extensions: Iterable[str],
+    max_size: Optional[int] = None,
+    chunk_size: Optional[int] = None
+) -> StoredUpload:
+    """
+    Stream an upload to disk and store it under its content hash.
+
+    Chunks are written to a temp file in the target directory while the
+    SHA-256 is computed; the copy aborts as soon as `max_size` is exceeded.
+    The file is then named `<sha256><ext>`: if that content is already
+    stored the copy is discarded and the existing file reused, and its
+    reference count is incremented in the caller's transaction. Since a
+    URL always maps to the same bytes, it can be cached forever.
+
+    Args:
+        db: Database session (the caller commits)
+        upload_file: Uploaded file
+        subfolder: Directory under UPLOAD_DIR
+        allowed_extensions: Accepted lowercase extensions (e.g. {".png"})
+        max_size: Max size in bytes (default: settings)
+        chunk_size: Copy buffer size in bytes (default: settings)
+
+    Returns:
+        The stored file, with its public URL
+
+    Raises:
+        HTTPException: 400 if the extension is not allowed, 413 if too large
+    """
+    max_size = max_size or settings.UPLOAD_MAX_FILE_SIZE
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+
+    file_ext = Path(upload_file.filename).suffix.lower() if upload_file.filename else ""
+    if file_ext not in allowed_extensions:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed: {', '.join(sorted(allowed_extensions))}"
+        )
+
+    # Size known from the multipart parser: reject before copying anything
+    if upload_file.size is not None and upload_file.size > max_size:
+        raise _too_large(max_size)
+
+    save_dir = UPLOAD_DIR / subfolder
+    save_dir.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_name = tempfile.mkstemp(dir=save_dir, prefix=".upload-", suffix=".part")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            upload_file.file.seek(0)
+            while chunk := upload_file.file.read(chunk_size):
+                size += len(chunk)
+                if size > max_size:
+                    raise _too_large(max_size)
+                digest.update(chunk)
+                tmp.write(chunk)
+
+        sha256 = digest.hexdigest()
+        url = f"{UPLOAD_URL_PREFIX}{subfolder}/{sha256}{file_ext}"
+        _acquire(db, url, sha256, size)
+
+        # Referenced first, then placed: a concurrent release of the same
+        # content cannot remove the file after this point
+        file_path = save_dir / f"{sha256}{file_ext}"
+        deduplicated = file_path.exists()
+        if deduplicated:
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return StoredUpload(url=url, path=file_path, size=size, sha256=sha256, deduplicated=deduplicated)
+
+
+def delete_file_if_exists(db: Session, file_path: Optional[str]) -> None:
+    """
+    Release a reference to an uploaded file, given its /uploads URL.
+
+    The file (and its derived files) is deleted when no record uses it
+    anymore, once the caller's transaction has committed: a rolled back
+    release leaves it in place. Files stored before content addressing
+    have no reference count and are deleted on commit too.
+
+    Args:
+        db: Database session (the caller commits)
+        file_path: URL of the file
+    """
+    if upload_path(file_path) is None:
+        return
+
+    blob = db.query(UploadBlob).filter(UploadBlob.url == file_path).with_for_update().first()
+    if blob is not None:
+        blob.refcount -= 1
+        if blob.refcount > 0:
+            return
+        db.delete(blob)
+        db.flush()
+
+    db.info.setdefault(_RELEASED_KEY, set()).add(file_path)
+
+
+@event.listens_for(Session, "after_commit")
+def _delete_released_files(session: Session) -> None:
+    """Delete the files released by a committed transaction."""
+    released = session.info.pop(_RELEASED_KEY, None)
+    if not released:
+        return
+
+    # The session cannot emit SQL here: re-check on a fresh connection that
+    # no upload of the same content acquired the URL again meanwhile
+    try:
+        with session.get_bind().connect() as conn:
+            acquired = set(conn.scalars(select(UploadBlob.url).where(UploadBlob.url.in_(released))))
+    except Exception as e:
+        print(f"Warning: Could not check released uploads, keeping the files: {e}")
+        return
+
+    for file_path in released - acquired:
+        full_path = upload_path(file_path)
+        _unlink(full_path, file_path)
+        for derived in (full_path.parent / DERIVED_DIRNAME).glob(f"{full_path.stem}-*"):
+            _unlink(derived, file_path)
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_released_files(session: Session) -> None:
+    """Forget the releases of a rolled back transaction."""
+    session.info.pop(_RELEASED_KEY, None)
+
+
+def upload_path(file_path: Optional[str]) -> Optional[Path]:
+    """
+    Map an /uploads URL to its path on disk.
+
+    Returns:
+        The path, or None for other URLs and paths escaping UPLOAD_DIR
+    """
+    if not file_path or not file_path.startswith(UPLOAD_URL_PREFIX):
+        return None
+    full_path = (UPLOAD_DIR / file_path[len(UPLOAD_URL_PREFIX):]).resolve()
+    if not full_path.is_relative_to(UPLOAD_DIR.resolve()):
+        return None
+    return full_path
+
+
+def _acquire(db: Session, url: str, sha256: str, size: int) -> None:
+    """Increment the reference count of a URL, creating it if new."""
+    updated = db.query(UploadBlob).filter(UploadBlob.url == url).update(
+        {UploadBlob.refcount: UploadBlob.refcount + 1}, synchronize_session=False
+    )
+    if updated:
+        return
+
+    try:
+        with db.begin_nested():
+            db.add(UploadBlob(url=url, sha256=sha256, size=size, refcount=1))
+    except IntegrityError:
+        # Same content stored concurrently: count this reference on its row
+        db.query(UploadBlob).filter(UploadBlob.url == url).update(
+            {UploadBlob.refcount: UploadBlob.refcount + 1}, synchronize_session=False
+        )
+
+
+def _unlink(path: Path, file_path: str) -> None:
+    """Delete a file (never raises)."""
+    try:
+        path.unlink(missing_ok=True)
+    except Exception as e:
+        print(f"Warning: Could not delete file {file_path}: {e}")
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"File too large. Max size: {max_size / 1024 / 1024}MB"
+    )
@@ -0,0 +1,79 @@
+"""
+Compare two benchmark result files.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json [--tolerance 0.10]
+
+Exits with status 1 when a scenario's p95 latency grew, or its throughput
+dropped, by more than the tolerance, or when a run was rate limited.
+"""
+
+import argparse
+import json
+import sys
+from typing import List
+
+
+def find_regressions(baseline: dict, current: dict, tolerance: float) -> List[str]:
+    """
+    List scenarios that got slower than the baseline.
+
+    Args:
+        baseline: Reference result document
+        current: New result document
+        tolerance: Allowed relative change (0.10 = 10%)
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for name, before in baseline.get("scenarios", {}).items():
+        after = current.get("scenarios", {}).get(name)
+        if after is None or not before["requests"]:
+            continue
+
+        p95_before, p95_after = before["latency_ms"]["p95"], after["latency_ms"]["p95"]
+        if p95_after > p95_before * (1 + tolerance):
+            regressions.append(f"{name}: p95 {p95_before:.1f}ms -> {p95_after:.1f}ms")
+
+        rps_before, rps_after = before["throughput_rps"], after["throughput_rps"]
+        if rps_after < rps_before * (1 - tolerance):
+            regressions.append(f"{name}: throughput {rps_before:.1f} -> {rps_after:.1f} req/s")
+
+        if after["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {after['errors']}")
+
+        # Older result files have no rate_limited count
+        for label, result in (("baseline", before), ("current", after)):
+            if result.get("rate_limited"):
+                regressions.append(f"{name}: {result['rate_limited']} requests rate limited in the {label} run")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative change")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    for name, after in current.get("scenarios", {}).items():
+        before = baseline.get("scenarios", {}).get(name, {}).get("latency_ms", {})
+        print(
+            f"{name:<16} p95 {before.get('p95', 0):>9.1f} -> {after['latency_ms']['p95']:>9.1f} ms"
+            f"   {after['throughput_rps']:>8.1f} req/s"
+        )
+
+    regressions = find_regressions(baseline, current, args.tolerance)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""
+Deterministic bulk data generator for scale testing.
+
+Produces Italian pharmacy geography (pharmacies clustered in neighbourhoods
+of real cities, with matching CAPs), opening hours as weekly recurring
+shifts, a duty rotation with overnight shifts, devices and display configs.
+The same seed always yields the same rows (ids included).
+
+Rows are written with COPY on PostgreSQL and batched executemany elsewhere.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --database-url sqlite:///scale.db --pharmacies 50000 --shifts 5000000
+"""
+
+import argparse
+import csv
+import enum
+import io
+import json
+import math
+import random
+import sys
+import time as timer
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import Engine, create_engine, insert
+
+from app.database import Base
+from app.models.device import Device, DeviceStatus
+from app.models.display_config import DisplayConfig, DisplayMode
+from app.models.pharmacy import Pharmacy
+from app.models.shift import Shift
+from app.models.user import User, UserRole
+from app.utils.security import get_password_hash
+
+BATCH_SIZE = 50_000
+
+# City, province, first and last CAP, center latitude/longitude, population (thousands)
+CITIES = [
+    ("Roma", "RM", 118, 199, 41.9028, 12.4964, 2750),
+    ("Milano", "MI", 20121, 20162, 45.4642, 9.1900, 1370),
+    ("Napoli", "NA", 80121, 80147, 40.8518, 14.2681, 910),
+    ("Torino", "TO", 10121, 10156, 45.0703, 7.6869, 850),
+    ("Palermo", "PA", 90121, 90151, 38.1157, 13.3615, 630),
+    ("Genova", "GE", 16121, 16167, 44.4056, 8.9463, 560),
+    ("Bologna", "BO", 40121, 40141, 44.4949, 11.3426, 390),
+    ("Firenze", "FI", 50121, 50145, 43.7696, 11.2558, 360),
+    ("Bari", "BA", 70121, 70132, 41.1171, 16.8719, 315),
+    ("Catania", "CT", 95121, 95131, 37.5079, 15.0830, 300),
+    ("Verona", "VR", 37121, 37142, 45.4384, 10.9916, 255),
+    ("Venezia", "VE", 30121, 30176, 45.4408, 12.3155, 250),
+    ("Messina", "ME", 98121, 98168, 38.1938, 15.5540, 220),
+    ("Padova", "PD", 35121, 35143, 45.4064, 11.8768, 210),
+    ("Trieste", "TS", 34121, 34151, 45.6495, 13.7768, 200),
+    ("Brescia", "BS", 25121, 25136, 45.5416, 10.2118, 200),
+    ("Parma", "PR", 43121, 43126, 44.8015, 10.3279, 195),
+    ("Modena", "MO", 41121, 41126, 44.6471, 10.9252, 185),
+    ("Reggio Calabria", "RC", 89121, 89135, 38.1113, 15.6473, 170),
+    ("Cagliari", "CA", 9121, 9134, 39.2238, 9.1217, 150),
+]
+
+STREETS = [
+    "Via Roma", "Corso Italia", "Via Garibaldi", "Via Mazzini", "Via Dante Alighieri",
+    "Piazza del Duomo", "Via Cavour", "Viale Europa", "Via Giuseppe Verdi", "Corso Vittorio Emanuele",
+    "Via XX Settembre", "Via Marconi", "Piazza della Repubblica", "Via Matteotti", "Via San Francesco",
+]
+NAMES = [
+    "Centrale", "San Marco", "Sant'Antonio", "del Corso", "della Stazione", "Moderna",
+    "Internazionale", "al Duomo", "Santa Lucia", "del Popolo", "Europa", "San Giuseppe",
+]
+SURNAMES = ["Rossi", "Russo", "Ferrari", "Esposito", "Bianchi", "Romano", "Colombo", "Ricci", "Marino", "Greco"]
+
+# Weekly opening hours, as recurring shifts starting on the first day
+OPENING_RULE = "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR,SA"
+DAY_SHIFT = (time(8, 30), time(19, 30))
+# Overnight duty is two rows, since a shift must end after it starts
+NIGHT_SHIFTS = ((time(19, 30), time(23, 59)), (time(0, 0), time(8, 30)))
+DUTY_ROTATION_DAYS = 7  # Each pharmacy in a neighbourhood is on duty once a week
+
+DEVICE_STATUSES = [(DeviceStatus.ACTIVE, 85), (DeviceStatus.INACTIVE, 8), (DeviceStatus.MAINTENANCE, 4), (DeviceStatus.PENDING, 3)]
+DISPLAY_MODES = [(DisplayMode.SCRAPED, 60), (DisplayMode.IMAGE, 30), (DisplayMode.MANUAL, 10)]
+
+# 6-character display ids: a bijection of the row index over 36^6
+DISPLAY_ID_SPACE = 36 ** 6
+DISPLAY_ID_MULTIPLIER = 1_000_003  # Coprime with 36
+DISPLAY_ID_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+@dataclass
+class GeneratorConfig:
+    """Scale and shape of the generated data."""
+
+    pharmacies: int = 10_000
+    shifts: int = 1_000_000
+    devices: int = 5_000
+    display_config_ratio: float = 0.8  # Share of pharmacies with a display config
+    max_chain_size: int = 20  # Pharmacies per owner: mostly 1, a few chains
+    start_date: date = field(default_factory=date.today)  # Middle of the shift window
+    seed: int = 42
+    admin_username: str = "admin"
+    owner_prefix: str = "owner_"
+    password: str = "Password123!"
+
+
+def generate(engine: Engine, config: GeneratorConfig) -> Dict[str, int]:
+    """
+    Create the tables and write a full dataset.
+
+    Returns:
+        Rows written per table
+    """
+    rng = random.Random(config.seed)
+    Base.metadata.create_all(bind=engine)
+
+    password_hash = get_password_hash(config.password)
+    pharmacies = list(_pharmacies(rng, config))
+    users = list(_users(rng, config, pharmacies, password_hash))
+
+    counts = {}
+    with engine.begin() as conn:
+        counts["users"] = write_rows(conn, User, users)
+        counts["pharmacies"] = write_rows(conn, Pharmacy, pharmacies)
+        counts["devices"] = write_rows(conn, Device, _devices(rng, config, pharmacies))
+        counts["display_configs"] = write_rows(conn, DisplayConfig, _display_configs(rng, config, pharmacies))
+        counts["shifts"] = write_rows(conn, Shift, _shifts(rng, config, pharmacies))
+    return counts
+
+
+def write_rows(conn, model, rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Bulk-write rows in batches: COPY on PostgreSQL, executemany otherwise.
+
+    Returns:
+        Number of rows written
+    """
+    copy = conn.dialect.name == "postgresql"
+    count = 0
+    for batch in _batches(rows, BATCH_SIZE):
+        if copy:
+            _copy(conn, model.__table__, batch)
+        else:
+            conn.execute(insert(model), batch)
+        count += len(batch)
+    return count
+
+
+def display_id(index: int) -> str:
+    """Unique, random-looking 6-character display id of the n-th pharmacy."""
+    value = (index * DISPLAY_ID_MULTIPLIER + 7919) % DISPLAY_ID_SPACE
+    chars = []
+    for _ in range(6):
+        value, digit = divmod(value, 36)
+        chars.append(DISPLAY_ID_ALPHABET[digit])
+    return "".join(chars)
+
+
+def _pharmacies(rng: random.Random, config: GeneratorConfig) -> Iterator[Dict[str, Any]]:
+    """Pharmacies spread over cities by population, clustered by neighbourhood."""
+    weights = [city[6] for city in CITIES]
+    neighbourhoods = {
+        city[0]: [
+            (
+                city[4] + rng.gauss(0, 0.012 * math.sqrt(city[6] / 100)),
+                city[5] + rng.gauss(0, 0.016 * math.sqrt(city[6] / 100)),
+                city[2] + n % (city[3] - city[2] + 1),
+            )
+            for n in range(max(3, city[3] - city[2] + 1))
+        ]
+        for city in CITIES
+    }
+
+    for i in range(config.pharmacies):
+        name, province, _, _, _, _, _ = rng.choices(CITIES, weights)[0]
+        lat, lon, cap = rng.choice(neighbourhoods[name])
+        yield {
+            "id": _uuid(rng),
+            "user_id": None,  # Assigned with the owners
+            "display_id": display_id(i),
+            "name": f"Farmacia {rng.choice(NAMES) if rng.random() < 0.6 else rng.choice(SURNAMES)}",
+            "address": f"{rng.choice(STREETS)} {rng.randint(1, 250)}",
+            "city": name,
+            "postal_code": f"{cap:05d}",
+            "phone": f"+39 0{rng.randint(10, 99)} {rng.randint(100000, 9999999)}",
+            "email": f"farmacia{i}@example.it",
+            "latitude": round(lat + rng.gauss(0, 0.004), 6),
+            "longitude": round(lon + rng.gauss(0, 0.005), 6),
+            "opening_hours": "Lun-Sab 08:30-19:30",
+            "is_active": rng.random() < 0.97,
+        }
+
+
+def _users(rng: random.Random, config: GeneratorConfig, pharmacies: List[Dict[str, Any]], password_hash: str):
+    """Admin plus owners; most own one pharmacy, some own chains."""
+    yield _user(rng, config.admin_username, UserRole.ADMIN, password_hash)
+
+    owner_index = 0
+    position = 0
+    while position < len(pharmacies):
+        chain = 1 if rng.random() < 0.8 else rng.randint(2, config.max_chain_size)
+        owner = _user(rng, f"{config.owner_prefix}{owner_index}", UserRole.USER, password_hash)
+        for pharmacy in pharmacies[position:position + chain]:
+            pharmacy["user_id"] = owner["id"]
+        owner["city"] = pharmacies[position]["city"]
+        yield owner
+        owner_index += 1
+        position += chain
+
+
+def _user(rng: random.Random, username: str, role: UserRole, password_hash: str) -> Dict[str, Any]:
+    return {
+        "id": _uuid(rng),
+        "username": username,
+        "email": f"{username}@example.it",
+        "password_hash": password_hash,
+        "role": role,
+        "is_active": True,
+        "city": None,
+    }
+
+
+def _devices(rng: random.Random, config: GeneratorConfig, pharmacies: List[Dict[str, Any]]):
+    """Raspberry Pi devices; pending ones are not assigned yet."""
+    statuses, weights = zip(*DEVICE_STATUSES)
+    seen = datetime.combine(config.start_date, time(12, 0))
+    for i in range(config.devices):
+        status = rng.choices(statuses, weights)[0]
+        assigned = status != DeviceStatus.PENDING and pharmacies
+        yield {
+            "id": _uuid(rng),
+            "serial_number": f"RPI-{config.seed:04d}-{i:07d}",
+            "mac_address": ":".join(f"{b:02x}" for b in (0xB8, 0x27, 0xEB, (i >> 16) & 0xFF, (i >> 8) & 0xFF, i & 0xFF)),
+            "activation_code": f"A{config.seed % 100:02d}{i:07d}",
+            "pharmacy_id": pharmacies[i % len(pharmacies)]["id"] if assigned else None,
+            "status": status,
+            "firmware_version": rng.choice(["1.0.0", "1.1.0", "1.2.3"]),
+            "last_seen": seen - timedelta(seconds=rng.randint(0, 3600)) if assigned else None,
+            "activated_at": seen - timedelta(days=rng.randint(1, 700)) if assigned else None,
+        }
+
+
+def _display_configs(rng: random.Random, config: GeneratorConfig, pharmacies: List[Dict[str, Any]]):
+    modes, weights = zip(*DISPLAY_MODES)
+    for pharmacy in pharmacies:
+        if rng.random() >= config.display_config_ratio:
+            continue
+        yield {
+            "pharmacy_id": str(pharmacy["id"]),
+            "pharmacy_name": pharmacy["name"],
+            "subtitle_text": "Farmacie di turno",
+            "display_mode": rng.choices(modes, weights)[0],
+            "scraping_cap": pharmacy["postal_code"],
+            "scraping_city": pharmacy["city"],
+            "theme": rng.choice(["light", "dark"]),
+            "primary_color": "#0066CC",
+            "secondary_color": "#00A3E0",
+        }
+
+
+def _shifts(rng: random.Random, config: GeneratorConfig, pharmacies: List[Dict[str, Any]]):
+    """
+    One weekly recurring opening-hours row per pharmacy, then a duty roster
+    centered on start_date: a day shift each day, plus an overnight duty
+    (two rows) on the pharmacy's rotation day.
+    """
+    if not pharmacies or config.shifts <= 0:
+        return
+    per_pharmacy, extra = divmod(config.shifts, len(pharmacies))  # First pharmacies get one more
+    first_day = config.start_date - timedelta(days=per_pharmacy // 2)
+
+    for index, pharmacy in enumerate(pharmacies):
+        quota = per_pharmacy + (1 if index < extra else 0)
+        if not quota:
+            break
+        rotation = rng.randrange(DUTY_ROTATION_DAYS)
+        rows = 0
+
+        yield _shift(rng, pharmacy, first_day, *DAY_SHIFT, recurrence=OPENING_RULE)
+        rows += 1
+
+        day = first_day
+        while rows < quota:
+            if day.weekday() != 6:
+                yield _shift(rng, pharmacy, day, *DAY_SHIFT)
+                rows += 1
+            if rows + 2 <= quota and (day - first_day).days % DUTY_ROTATION_DAYS == rotation:
+                evening, morning = NIGHT_SHIFTS
+                yield _shift(rng, pharmacy, day, *evening, notes="Turno notturno")
+                yield _shift(rng, pharmacy, day + timedelta(days=1), *morning, notes="Turno notturno")
+                rows += 2
+            day += timedelta(days=1)
+
+
+def _shift(
+    rng: random.Random,
+    pharmacy: Dict[str, Any],
+    day: date,
+    start: time,
+    end: time,
+    recurrence: Optional[str] = None,
+    notes: Optional[str] = None
+) -> Dict[str, Any]:
+    return {
+        "id": _uuid(rng),
+        "pharmacy_id": pharmacy["id"],
+        "date": day,
+        "start_time": start,
+        "end_time": end,
+        "is_recurring": recurrence is not None,
+        "recurrence_rule": recurrence,
+        "notes": notes,
+    }
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy(conn, table, rows: List[Dict[str, Any]]) -> None:
+    """COPY a batch through the psycopg2 connection of the transaction."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row[column]) for column in columns])
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def _copy_value(value: Any) -> Any:
+    """CSV representation for COPY; empty unquoted fields are NULL."""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.name  # SQLAlchemy stores enum names
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate TurnoTec data at scale")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--pharmacies", type=int, default=GeneratorConfig.pharmacies)
+    parser.add_argument("--shifts", type=int, default=GeneratorConfig.shifts)
+    parser.add_argument("--devices", type=int, default=GeneratorConfig.devices)
+    parser.add_argument("--display-config-ratio", type=float, default=GeneratorConfig.display_config_ratio)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None, help="Middle of the shift window (default: today)")
+    parser.add_argument("--seed", type=int, default=GeneratorConfig.seed)
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig(
+        pharmacies=args.pharmacies,
+        shifts=args.shifts,
+        devices=args.devices,
+        display_config_ratio=args.display_config_ratio,
+        seed=args.seed,
+    )
+    if args.start_date:
+        config.start_date = args.start_date
+
+    started = timer.perf_counter()
+    counts = generate(create_engine(args.database_url), config)
+    print(f"Generated {counts} in {timer.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Benchmark fleet: bulk-seeded users, pharmacies, shifts and devices."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Engine, inspect, select
+
+from app.models.device import Device, DeviceStatus
+from app.models.pharmacy import Pharmacy
+from app.models.user import User
+from benchmarks.datagen import GeneratorConfig, generate
+
+# Credentials of the seeded accounts
+BENCH_ADMIN = "bench_admin"
+BENCH_OWNER_PREFIX = "bench_owner_"
+BENCH_PASSWORD = "BenchPassword1!"
+
+
+@dataclass
+class FleetSize:
+    """Number of rows to seed."""
+
+    pharmacies: int = 10_000
+    shifts: int = 1_000_000
+    devices: int = 5_000
+
+
+@dataclass
+class FleetTargets:
+    """Seeded rows the load scenarios pick from."""
+
+    pharmacy_ids: List[str] = field(default_factory=list)
+    devices: List[Tuple[str, str]] = field(default_factory=list)  # (id, serial number)
+    owners: List[str] = field(default_factory=list)
+
+
+def seed_fleet(engine: Engine, size: FleetSize, seed: int = 42) -> Dict[str, int]:
+    """
+    Create the tables and bulk-write a fleet (deterministic for a seed).
+
+    See benchmarks.datagen; all accounts share one bcrypt hash of
+    BENCH_PASSWORD.
+
+    Returns:
+        Rows written per table
+    """
+    return generate(engine, GeneratorConfig(
+        pharmacies=size.pharmacies,
+        shifts=size.shifts,
+        devices=size.devices,
+        seed=seed,
+        admin_username=BENCH_ADMIN,
+        owner_prefix=BENCH_OWNER_PREFIX,
+        password=BENCH_PASSWORD,
+    ))
+
+
+def load_targets(engine: Engine, limit: int = 10_000) -> FleetTargets:
+    """Read back the seeded ids used by the scenarios (empty if not seeded)."""
+    if not inspect(engine).has_table(Pharmacy.__tablename__):
+        return FleetTargets()
+
+    # Inactive pharmacies (seeded by datagen) answer 404 on the display route
+    bench_owner = User.username.like(f"{BENCH_OWNER_PREFIX}%")
+    with engine.connect() as conn:
+        pharmacy_ids = conn.execute(
+            select(Pharmacy.id).join(User, Pharmacy.user_id == User.id)
+            .where(bench_owner, Pharmacy.is_active == True)
+            .limit(limit)
+        ).scalars().all()
+        devices = conn.execute(
+            select(Device.id, Device.serial_number)
+            .join(Pharmacy, Device.pharmacy_id == Pharmacy.id)
+            .join(User, Pharmacy.user_id == User.id)
+            .where(bench_owner, Pharmacy.is_active == True, Device.status == DeviceStatus.ACTIVE)
+            .limit(limit)
+        ).all()
+        owners = conn.execute(select(User.username).where(bench_owner).limit(limit)).scalars().all()
+
+    return FleetTargets(
+        pharmacy_ids=[str(pharmacy_id) for pharmacy_id in pharmacy_ids],
+        devices=[(str(device_id), serial) for device_id, serial in devices],
+        owners=list(owners),
+    )
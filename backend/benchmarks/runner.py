@@ -0,0 +1,214 @@
+"""Concurrent load generation and latency statistics."""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fleet import BENCH_ADMIN, BENCH_PASSWORD, FleetTargets
+
+API = "/api/v1"
+
+# Default share of each scenario in the traffic mix (displays dominate)
+DEFAULT_MIX = {
+    "display_poll": 60,
+    "heartbeat": 25,
+    "list_pharmacies": 5,
+    "list_shifts": 5,
+    "list_devices": 3,
+    "login": 2,
+}
+
+
+@dataclass
+class ScenarioStats:
+    """
+    Latencies and outcomes of one scenario.
+
+    Rate-limited (429) responses are only counted: answered by the limiter
+    without running the endpoint, they would flatter latency and throughput.
+    """
+
+    latencies: List[float] = field(default_factory=list)  # Seconds
+    errors: int = 0
+    rate_limited: int = 0
+
+    def record(self, elapsed: float, status_code: int) -> None:
+        if status_code == 429:
+            self.rate_limited += 1
+            return
+        self.latencies.append(elapsed)
+        if status_code >= 400:
+            self.errors += 1
+
+
+class LoadContext:
+    """Shared state of a run: client, fleet targets and tokens."""
+
+    def __init__(self, client: httpx.AsyncClient, targets: FleetTargets, seed: int):
+        self.client = client
+        self.targets = targets
+        self.rng = random.Random(seed)
+        self.admin_headers: Dict[str, str] = {}
+        self.owner_headers: Dict[str, str] = {}
+
+    async def login(self, username: str) -> Dict[str, str]:
+        """Log in a seeded account and return its auth headers."""
+        response = await self.client.post(
+            f"{API}/auth/login", json={"username": username, "password": BENCH_PASSWORD}
+        )
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def display_poll(ctx: LoadContext) -> httpx.Response:
+    """Display device polling its pharmacy page."""
+    pharmacy_id = ctx.rng.choice(ctx.targets.pharmacy_ids)
+    return await ctx.client.get(f"{API}/display/{pharmacy_id}")
+
+
+async def heartbeat(ctx: LoadContext) -> httpx.Response:
+    """Device heartbeat."""
+    device_id, serial = ctx.rng.choice(ctx.targets.devices)
+    return await ctx.client.post(
+        f"{API}/devices/{device_id}/heartbeat",
+        json={"serial_number": serial, "firmware_version": "1.0.0", "status": "active"}
+    )
+
+
+async def list_pharmacies(ctx: LoadContext) -> httpx.Response:
+    """Admin dashboard listing, random page."""
+    skip = ctx.rng.randrange(0, max(1, len(ctx.targets.pharmacy_ids) - 20))
+    return await ctx.client.get(f"{API}/pharmacies/?skip={skip}&limit=20", headers=ctx.admin_headers)
+
+
+async def list_shifts(ctx: LoadContext) -> httpx.Response:
+    """Shift calendar of a pharmacy (one month)."""
+    pharmacy_id = ctx.rng.choice(ctx.targets.pharmacy_ids)
+    start = date.today() - timedelta(days=15)
+    return await ctx.client.get(
+        f"{API}/shifts/",
+        params={"pharmacy_id": pharmacy_id, "start_date": start.isoformat(), "end_date": (start + timedelta(days=30)).isoformat()},
+        headers=ctx.admin_headers
+    )
+
+
+async def list_devices(ctx: LoadContext) -> httpx.Response:
+    """Pharmacy owner listing their devices."""
+    return await ctx.client.get(f"{API}/devices/", headers=ctx.owner_headers)
+
+
+async def login(ctx: LoadContext) -> httpx.Response:
+    """Owner login (bcrypt verification)."""
+    username = ctx.rng.choice(ctx.targets.owners)
+    return await ctx.client.post(f"{API}/auth/login", json={"username": username, "password": BENCH_PASSWORD})
+
+
+SCENARIOS: Dict[str, Callable[[LoadContext], Awaitable[httpx.Response]]] = {
+    "display_poll": display_poll,
+    "heartbeat": heartbeat,
+    "list_pharmacies": list_pharmacies,
+    "list_shifts": list_shifts,
+    "list_devices": list_devices,
+    "login": login,
+}
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    targets: FleetTargets,
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    warmup: float = 0.0,
+    seed: int = 42
+) -> Dict[str, ScenarioStats]:
+    """
+    Drive the scenario mix with `concurrency` virtual clients.
+
+    Each virtual client picks a weighted scenario, sends it and loops, so
+    offered load adapts to the server (closed loop). Requests finishing
+    during the warmup are not recorded.
+
+    Returns:
+        Stats per scenario
+    """
+    ctx = LoadContext(client, targets, seed)
+    ctx.admin_headers = await ctx.login(BENCH_ADMIN)
+    if targets.owners:
+        ctx.owner_headers = await ctx.login(targets.owners[0])
+
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    stats = {name: ScenarioStats() for name in names}
+
+    started_at = time.perf_counter()
+    record_from = started_at + warmup
+    deadline = record_from + duration
+
+    async def virtual_client() -> None:
+        while True:
+            name = ctx.rng.choices(names, weights)[0]
+            request_started = time.perf_counter()
+            if request_started >= deadline:
+                return
+            try:
+                status_code = (await SCENARIOS[name](ctx)).status_code
+            except httpx.HTTPError:
+                status_code = 599
+            finished = time.perf_counter()
+            if request_started >= record_from:
+                stats[name].record(finished - request_started, status_code)
+
+    await asyncio.gather(*(virtual_client() for _ in range(concurrency)))
+    return stats
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentile with linear interpolation (values sorted ascending)."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def summarize(latencies: List[float], errors: int, rate_limited: int, duration: float) -> Dict[str, object]:
+    """Throughput and latency percentiles (milliseconds) of the requests not rate limited."""
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rate_limited": rate_limited,
+        "throughput_rps": round(len(values) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(values, 50) * 1000, 3),
+            "p95": round(percentile(values, 95) * 1000, 3),
+            "p99": round(percentile(values, 99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if values else 0.0,
+            "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        },
+    }
+
+
+def build_report(stats: Dict[str, ScenarioStats], duration: float, meta: Optional[dict] = None) -> dict:
+    """Result document: per-scenario and overall summaries."""
+    all_latencies = [value for scenario in stats.values() for value in scenario.latencies]
+    return {
+        "meta": meta or {},
+        "scenarios": {
+            name: summarize(scenario.latencies, scenario.errors, scenario.rate_limited, duration)
+            for name, scenario in stats.items()
+        },
+        "total": summarize(
+            all_latencies,
+            sum(scenario.errors for scenario in stats.values()),
+            sum(scenario.rate_limited for scenario in stats.values()),
+            duration
+        ),
+    }
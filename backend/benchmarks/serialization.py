@@ -0,0 +1,166 @@
+"""
+Compare the response_model serialization path with the fast JSON path.
+
+The response_model path is what FastAPI does for a handler returning
+pydantic models or ORM rows: dump, validate against the response model,
+dump again in JSON mode and render with the json module. The fast path
+reads the schema fields from the rows and renders once (orjson if
+installed). Both payloads are checked to decode to the same document
+before timing.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --iterations 2000 --rows 50
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from datetime import time as dtime
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.models.device import Device, DeviceStatus
+from app.models.pharmacy import Pharmacy
+from app.models.shift import Shift
+from app.schemas.device import DeviceResponse
+from app.schemas.display import DisplayDataResponse, DisplayPharmacyInfo, DisplayShiftInfo, NearbyPharmacyInfo
+from app.utils.fast_json import dumps, orjson, serialize_row, serialize_rows
+
+
+def make_rows(count: int):
+    """Transient ORM rows shaped like production data."""
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    pharmacy = Pharmacy(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), display_id="abc123", name="Farmacia Centrale",
+        address="Via Roma 1", city="Milano", postal_code="20121", phone="+39 02 1234567",
+        logo_url="/uploads/logos/a.png", latitude=45.4642, longitude=9.19, is_active=True
+    )
+    nearby = [
+        (Pharmacy(id=uuid.uuid4(), name=f"Farmacia {i}", address=f"Via Verdi {i}", city="Milano", phone="+39 02 7654321"), 100.0 * i)
+        for i in range(min(count, 10))
+    ]
+    shifts = [
+        Shift(id=uuid.uuid4(), pharmacy_id=pharmacy.id, date=date(2026, 10, 19) + timedelta(days=i % 7),
+              start_time=dtime(8, 30), end_time=dtime(19, 30), is_recurring=False, notes=None,
+              created_at=now, updated_at=None)
+        for i in range(count)
+    ]
+    devices = [
+        Device(id=uuid.uuid4(), serial_number=f"RPI-{i:06d}", mac_address=None, firmware_version="1.2.3",
+               activation_code=f"CODE{i:016d}", pharmacy_id=pharmacy.id, status=DeviceStatus.ACTIVE,
+               last_seen=now, created_at=now, activated_at=now)
+        for i in range(count)
+    ]
+    return pharmacy, nearby, shifts[:3], devices, now
+
+
+def display_response_model(pharmacy, nearby, shifts, now) -> bytes:
+    """Current path before the change: models, then response_model validation."""
+    model = DisplayDataResponse(
+        pharmacy=DisplayPharmacyInfo(
+            id=pharmacy.id, name=pharmacy.name, address=pharmacy.address,
+            city=pharmacy.city, phone=pharmacy.phone, logo_url=pharmacy.logo_url
+        ),
+        current_shifts=[
+            DisplayShiftInfo(date=s.date, start_time=s.start_time, end_time=s.end_time, notes=s.notes) for s in shifts
+        ],
+        nearby_pharmacies=[
+            NearbyPharmacyInfo(id=p.id, name=p.name, address=p.address, city=p.city, phone=p.phone, distance_meters=d)
+            for p, d in nearby
+        ],
+        messages=[],
+        updated_at=now,
+    )
+    adapter = TypeAdapter(DisplayDataResponse)
+    validated = adapter.validate_python(model.model_dump())
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+def display_fast(pharmacy, nearby, shifts, now) -> bytes:
+    return dumps({
+        "pharmacy": serialize_row(pharmacy, DisplayPharmacyInfo),
+        "current_shifts": serialize_rows(shifts, DisplayShiftInfo),
+        "nearby_pharmacies": [
+            {"id": p.id, "name": p.name, "address": p.address, "city": p.city, "phone": p.phone, "distance_meters": d}
+            for p, d in nearby
+        ],
+        "messages": [],
+        "updated_at": now,
+    })
+
+
+DEVICE_LIST = TypeAdapter(List[DeviceResponse])
+
+
+def devices_response_model(devices) -> bytes:
+    validated = DEVICE_LIST.validate_python(devices, from_attributes=True)
+    return JSONResponse(DEVICE_LIST.dump_python(validated, mode="json")).body
+
+
+def devices_fast(devices) -> bytes:
+    return dumps(serialize_rows(devices, DeviceResponse))
+
+
+def time_per_call(func: Callable[[], bytes], iterations: int) -> float:
+    """Best of three runs, microseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / iterations * 1_000_000
+
+
+def run(iterations: int, rows: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time both paths for the display payload and a device listing.
+
+    Returns:
+        Per payload: microseconds per call of each path and the speedup
+    """
+    pharmacy, nearby, shifts, devices, now = make_rows(rows)
+    cases = {
+        "display": (
+            lambda: display_response_model(pharmacy, nearby, shifts, now),
+            lambda: display_fast(pharmacy, nearby, shifts, now),
+        ),
+        f"devices_x{rows}": (lambda: devices_response_model(devices), lambda: devices_fast(devices)),
+    }
+
+    results = {}
+    for name, (current, fast) in cases.items():
+        if json.loads(current()) != json.loads(fast()):
+            raise AssertionError(f"{name}: fast path output differs from response_model output")
+        current_us = time_per_call(current, iterations)
+        fast_us = time_per_call(fast, iterations)
+        results[name] = {
+            "response_model_us": round(current_us, 2),
+            "fast_us": round(fast_us, 2),
+            "speedup": round(current_us / fast_us, 2),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serialization path micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=50, help="Rows in the listing payload")
+    args = parser.parse_args(argv)
+
+    print(f"JSON encoder: {'orjson' if orjson is not None else 'json'}")
+    for name, result in run(args.iterations, args.rows).items():
+        print(
+            f"{name:<14} response_model {result['response_model_us']:>9.1f} us   "
+            f"fast {result['fast_us']:>8.1f} us   x{result['speedup']:.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
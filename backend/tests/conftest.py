@@ -1,15 +1,20 @@
 """Pytest configuration and fixtures."""
 
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.config import get_settings
+from app.core.query_profiler import capture_queries
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 from app.models.user import User, UserRole
 from app.utils.security import get_password_hash, create_access_token
+from app.services.display_cache import display_cache
 
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -48,6 +53,8 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    display_cache.clear()
 
     with TestClient(app) as test_client:
         yield test_client
@@ -113,3 +120,30 @@ def auth_headers(user_token: str) -> dict[str, str]:
 def admin_headers(admin_token: str) -> dict[str, str]:
     """Generate authorization headers with admin token."""
     return {"Authorization": f"Bearer {admin_token}"}
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test when a block runs more statements than its budget, or
+    repeats a statement shape like an N+1.
+
+    Usage:
+        with query_budget(3):
+            client.get("/api/v1/devices/", headers=auth_headers)
+    """
+
+    @contextmanager
+    def check(max_queries: int, max_repeats: int | None = None):
+        max_repeats = max_repeats or get_settings().QUERY_N_PLUS_ONE_THRESHOLD
+        with capture_queries(engine) as profile:
+            yield profile
+
+        if profile.count > max_queries:
+            pytest.fail(f"Query budget exceeded ({max_queries}): {profile.summary()}")
+        repeated = profile.repeated(max_repeats)
+        if repeated:
+            shapes = "\n".join(f"  {count}x {shape}" for shape, count in repeated)
+            pytest.fail(f"Repeated statements (N+1?):\n{shapes}\n{profile.summary()}")
+
+    return check
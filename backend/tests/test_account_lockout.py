@@ -0,0 +1,78 @@
+"""Tests for the Redis-backed account lockout."""
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.core.account_lockout import AccountLockoutManager
+
+fakeredis = pytest.importorskip("fakeredis", reason="fakeredis[lua] is required for lockout tests")
+
+
+class CountingRedis(fakeredis.FakeAsyncRedis):
+    """Fake Redis counting script executions."""
+
+    script_calls = 0
+
+    async def evalsha(self, *args, **kwargs):
+        type(self).script_calls += 1
+        return await super().evalsha(*args, **kwargs)
+
+
+@pytest.fixture
+async def redis_client():
+    """Fresh fake Redis with Lua support."""
+    CountingRedis.script_calls = 0
+    client = CountingRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def lockout_manager(redis_client) -> AccountLockoutManager:
+    """Lockout manager using the fake Redis."""
+    return AccountLockoutManager(redis_client)
+
+
+class TestAccountLockout:
+    """Test lockout state kept in a single hash per user."""
+
+    async def test_failed_attempts_counted_in_one_hash(self, lockout_manager, redis_client):
+        """Test attempts are tracked in one expiring hash."""
+        info = await lockout_manager.record_failed_attempt("Mario")
+
+        assert info["failed_attempts"] == 1
+        assert info["remaining_attempts"] == lockout_manager.max_failed_attempts - 1
+        assert await redis_client.hgetall("auth:lockout_state:mario") == {"attempts": "1"}
+        assert 0 < await redis_client.ttl("auth:lockout_state:mario") <= lockout_manager.attempt_window_minutes * 60
+
+    async def test_lockout_after_max_attempts(self, lockout_manager, redis_client):
+        """Test the account locks with a native expiry and refuses further attempts."""
+        for _ in range(lockout_manager.max_failed_attempts - 1):
+            await lockout_manager.record_failed_attempt("mario")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await lockout_manager.record_failed_attempt("mario")
+        assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        state = await lockout_manager.check("mario")
+        assert state.locked
+        assert state.failed_attempts == lockout_manager.max_failed_attempts
+        assert 0 < state.remaining_seconds <= lockout_manager.lockout_duration_minutes * 60
+
+        with pytest.raises(HTTPException):
+            await lockout_manager.record_failed_attempt("mario")
+
+        await lockout_manager.unlock_account("mario")
+        assert not await lockout_manager.is_locked_out("mario")
+
+    async def test_check_is_one_round_trip(self, lockout_manager):
+        """Test a check reads the whole state with one script call."""
+        await lockout_manager.record_failed_attempt("mario")
+        calls_before = CountingRedis.script_calls
+
+        info = await lockout_manager.get_lockout_info("mario")
+
+        assert CountingRedis.script_calls - calls_before == 1
+        assert info["failed_attempts"] == 1
+        assert info["is_locked"] is False
+        assert info["remaining_time_seconds"] is None
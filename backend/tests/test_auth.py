@@ -1,5 +1,8 @@
 """Tests for authentication endpoints."""
 
+import asyncio
+import threading
+
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
@@ -7,7 +10,17 @@ from jose import jwt
 
 from app.config import get_settings
 from app.models.user import User, UserRole
-from app.utils.security import verify_password, get_password_hash, create_access_token, decode_token
+from app.core.principal_cache import principal_cache
+from app.utils.security import (
+    verify_password,
+    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    create_access_token,
+    decode_token,
+    PasswordHashPool,
+    PasswordHashPoolBusyError,
+)
 
 settings = get_settings()
 
@@ -30,6 +43,38 @@ class TestPasswordHashing:
 
         assert not verify_password("WrongPassword", hashed)
 
+    async def test_async_hashing_runs_on_pool(self):
+        """Test async helpers hash and verify off the event loop."""
+        hashed = await get_password_hash_async("TestPassword123!")
+
+        assert await verify_password_async("TestPassword123!", hashed)
+        assert not await verify_password_async("WrongPassword", hashed)
+
+    async def test_pool_rejects_when_queue_full(self):
+        """Test the pool is bounded and reports queue depth."""
+        pool = PasswordHashPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        try:
+            running = asyncio.ensure_future(pool.run(release.wait))
+            queued = asyncio.ensure_future(pool.run(release.wait))
+            await asyncio.sleep(0.05)
+
+            assert pool.get_stats()["queue_depth"] == 1
+            with pytest.raises(PasswordHashPoolBusyError):
+                await pool.run(release.wait)
+
+            release.set()
+            await asyncio.gather(running, queued)
+        finally:
+            release.set()
+            pool.shutdown()
+
+        stats = pool.get_stats()
+        assert stats["completed"] == 2
+        assert stats["rejected"] == 1
+        assert stats["max_queue_depth"] == 1
+
 
 class TestJWTTokens:
     """Test JWT token generation and validation."""
@@ -249,6 +294,43 @@ class TestGetCurrentUser:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class TestPrincipalCache:
+    """Test caching of the authenticated principal."""
+
+    def test_principal_cached_per_token(self, client: TestClient, db_session, test_user: User, auth_headers: dict):
+        """Test a cached principal is reused until the TTL or an invalidation."""
+        principal_cache.clear()
+        assert client.get("/api/v1/pharmacies", headers=auth_headers).status_code == status.HTTP_200_OK
+
+        # Changed behind the cache's back: still served from cache
+        test_user.is_active = False
+        db_session.commit()
+        assert client.get("/api/v1/pharmacies", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert principal_cache.get_stats()["hits"] >= 1
+
+        principal_cache.invalidate_user(test_user.id)
+        response = client.get("/api/v1/pharmacies", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_update_user_invalidates_principal(
+        self, client: TestClient, test_user: User, auth_headers: dict, admin_headers: dict
+    ):
+        """Test deactivating a user through the API takes effect immediately."""
+        principal_cache.clear()
+        assert client.get("/api/v1/pharmacies", headers=auth_headers).status_code == status.HTTP_200_OK
+
+        response = client.put(
+            f"/api/v1/users/{test_user.id}",
+            json={"is_active": False},
+            headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.get("/api/v1/pharmacies", headers=auth_headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 class TestAdminRole:
     """Test admin role requirement."""
 
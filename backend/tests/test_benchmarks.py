@@ -0,0 +1,186 @@
+"""Tests for the benchmark suite."""
+
+import json
+from datetime import date, time, timedelta
+from uuid import UUID
+
+from sqlalchemy import create_engine, select
+
+from app.models.device import Device
+from app.models.pharmacy import Pharmacy
+from app.models.shift import Shift
+from benchmarks import compare, datagen, fleet, query_plans, run, serialization
+from benchmarks.datagen import GeneratorConfig
+from benchmarks.runner import ScenarioStats, build_report, percentile
+
+
+class TestBenchmarkStats:
+    """Test latency statistics and regression detection."""
+
+    def test_percentile(self):
+        """Test percentiles interpolate between samples."""
+        values = [0.001 * i for i in range(1, 101)]
+
+        assert percentile(values, 50) == 0.0505
+        assert round(percentile(values, 99), 5) == 0.09901
+        assert percentile([], 95) == 0.0
+
+    def test_regressions(self):
+        """Test slower p95 and lower throughput are flagged."""
+        baseline = {"scenarios": {"display_poll": {
+            "requests": 100, "errors": 0, "throughput_rps": 100.0, "latency_ms": {"p95": 20.0}
+        }}}
+        current = {"scenarios": {"display_poll": {
+            "requests": 80, "errors": 0, "throughput_rps": 80.0, "latency_ms": {"p95": 30.0}
+        }}}
+
+        assert compare.find_regressions(baseline, baseline, 0.1) == []
+        assert len(compare.find_regressions(baseline, current, 0.1)) == 2
+
+    def test_rate_limited_requests_excluded(self):
+        """Test 429 responses are counted but left out of latency and throughput."""
+        stats = ScenarioStats()
+        stats.record(0.020, 200)
+        stats.record(0.001, 429)
+        stats.record(0.030, 500)
+
+        summary = build_report({"display_poll": stats}, duration=1.0)["total"]
+
+        assert summary["requests"] == 2
+        assert summary["throughput_rps"] == 2.0
+        assert summary["errors"] == 1
+        assert summary["rate_limited"] == 1
+        assert summary["latency_ms"]["p50"] == 25.0
+
+    def test_rate_limited_run_flagged(self):
+        """Test a rate-limited run is not compared silently."""
+        result = {"scenarios": {"display_poll": {
+            "requests": 100, "errors": 0, "rate_limited": 0, "throughput_rps": 100.0, "latency_ms": {"p95": 20.0}
+        }}}
+        limited = json.loads(json.dumps(result))
+        limited["scenarios"]["display_poll"]["rate_limited"] = 40
+
+        assert compare.find_regressions(result, limited, 0.1) == [
+            "display_poll: 40 requests rate limited in the current run"
+        ]
+
+
+class TestBenchmarkRun:
+    """Test a tiny end-to-end run."""
+
+    def test_run_writes_report(self, tmp_path):
+        """Test seeding, load and the JSON result file on SQLite."""
+        output = tmp_path / "results.json"
+
+        exit_code = run.main([
+            "--database-url", f"sqlite:///{tmp_path / 'bench.db'}",
+            "--pharmacies", "20", "--shifts", "200", "--devices", "10",
+            "--concurrency", "2", "--duration", "0.5", "--warmup", "0",
+            "--mix", "display_poll=3,heartbeat=1,list_devices=1",
+            "--output", str(output),
+        ])
+
+        report = json.loads(output.read_text())
+        assert exit_code == 0
+        assert report["meta"]["database"] == "sqlite"
+        assert report["total"]["rate_limited"] == 0
+        assert report["meta"]["fleet"]["seeded"]["shifts"] == 200
+        assert report["total"]["requests"] > 0
+        assert report["total"]["errors"] == 0
+        assert set(report["scenarios"]) == {"display_poll", "heartbeat", "list_devices"}
+
+
+    def test_targets_skip_inactive_pharmacies(self, tmp_path):
+        """Test the scenarios only target active pharmacies and their devices."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'fleet.db'}")
+        fleet.seed_fleet(engine, fleet.FleetSize(pharmacies=200, shifts=400, devices=100), seed=3)
+
+        targets = fleet.load_targets(engine)
+
+        with engine.connect() as conn:
+            inactive = {str(p) for p in conn.execute(select(Pharmacy.id).where(Pharmacy.is_active == False)).scalars()}
+            device_pharmacies = dict(conn.execute(select(Device.id, Device.pharmacy_id)).all())
+        assert inactive  # The generator seeds some
+        assert targets.pharmacy_ids and not inactive & set(targets.pharmacy_ids)
+        assert targets.devices
+        assert all(str(device_pharmacies[UUID(device_id)]) not in inactive for device_id, _ in targets.devices)
+
+
+class TestDataGenerator:
+    """Test the seeded bulk data generator."""
+
+    def _generate(self, tmp_path, name, seed=7):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        config = GeneratorConfig(pharmacies=50, shifts=600, devices=30, seed=seed, start_date=date(2026, 3, 2))
+        counts = datagen.generate(engine, config)
+        return engine, counts
+
+    def test_counts_and_determinism(self, tmp_path):
+        """Test requested row counts and identical output for the same seed."""
+        first, counts = self._generate(tmp_path, "a.db")
+        second, _ = self._generate(tmp_path, "b.db")
+
+        assert counts["pharmacies"] == 50
+        assert counts["shifts"] == 600
+        assert counts["devices"] == 30
+        assert 0 < counts["display_configs"] <= 50
+
+        query = select(Pharmacy.id, Pharmacy.display_id, Pharmacy.postal_code, Pharmacy.latitude).order_by(Pharmacy.display_id)
+        with first.connect() as a, second.connect() as b:
+            assert a.execute(query).all() == b.execute(query).all()
+
+    def test_geography_and_shifts(self, tmp_path):
+        """Test unique display ids, Italian CAPs and overnight shifts split at midnight."""
+        engine, _ = self._generate(tmp_path, "scale.db")
+
+        with engine.connect() as conn:
+            pharmacies = conn.execute(select(Pharmacy.display_id, Pharmacy.postal_code, Pharmacy.latitude)).all()
+            shifts = conn.execute(select(Shift.pharmacy_id, Shift.date, Shift.start_time, Shift.end_time, Shift.is_recurring)).all()
+
+        assert len({p.display_id for p in pharmacies}) == 50
+        assert all(len(p.display_id) == 6 and len(p.postal_code) == 5 for p in pharmacies)
+        assert all(36 < p.latitude < 47 for p in pharmacies)
+
+        assert all(s.end_time > s.start_time for s in shifts)
+        assert sum(s.is_recurring for s in shifts) == 50
+        evenings = {(s.pharmacy_id, s.date) for s in shifts if s.start_time == time(19, 30)}
+        mornings = {(s.pharmacy_id, s.date - timedelta(days=1)) for s in shifts if s.start_time == time(0, 0)}
+        assert evenings and evenings == mornings
+
+    def test_display_ids_unique_at_scale(self):
+        """Test display ids do not collide across a large index range."""
+        ids = {datagen.display_id(i) for i in range(200_000)}
+
+        assert len(ids) == 200_000
+
+
+class TestSerializationBenchmark:
+    """Test the serialization micro-benchmark."""
+
+    def test_paths_agree(self):
+        """Test both paths are timed after checking they produce the same document."""
+        results = serialization.run(iterations=3, rows=5)
+
+        assert set(results) == {"display", "devices_x5"}
+        assert all(result["fast_us"] > 0 for result in results.values())
+
+
+class TestQueryPlansBenchmark:
+    """Test the query plan benchmark."""
+
+    def test_new_indexes_are_used(self, tmp_path):
+        """Test the listings read in index order once the migration's indexes exist."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+        config = GeneratorConfig(pharmacies=200, shifts=3000, devices=100, start_date=date(2026, 3, 2))
+        datagen.generate(engine, config)
+
+        results = query_plans.run(engine, iterations=2, start_date=config.start_date)
+
+        assert "idx_shift_pharmacy_date " in results["shift_listing"]["before_plan"]
+        assert "idx_shift_pharmacy_date_start" in results["shift_listing"]["after_plan"]
+        assert "idx_pharmacy_active_name" in results["pharmacy_listing"]["after_plan"]
+        assert "idx_pharmacy_user_active_name" in results["owner_pharmacy_listing"]["after_plan"]
+        assert "idx_device_pharmacy_last_seen" in results["owner_device_listing"]["after_plan"]
+        for name in ("shift_listing", "pharmacy_listing", "owner_pharmacy_listing"):
+            assert "TEMP B-TREE" in results[name]["before_plan"]
+            assert "TEMP B-TREE" not in results[name]["after_plan"]
@@ -0,0 +1,173 @@
+"""Tests for response compression and precompressed display payloads."""
+
+import gzip
+import json
+
+from fastapi import status
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, PrecompressedBody, negotiate_encoding
+from app.models.pharmacy import Pharmacy
+from app.models.shift import Shift
+from app.models.user import User
+from app.services.display_cache import display_cache
+
+LARGE = {"items": [{"name": f"Farmacia Comunale {i}", "address": "Via Roma"} for i in range(100)]}
+
+
+def make_app() -> TestClient:
+    async def large(request):
+        return JSONResponse(LARGE, headers={"ETag": '"v1"'})
+
+    async def small(request):
+        return JSONResponse({"status": "ok"})
+
+    async def binary(request):
+        return PlainTextResponse("x" * 5000, media_type="application/octet-stream")
+
+    app = Starlette(routes=[Route("/large", large), Route("/small", small), Route("/binary", binary)])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+def make_display_pharmacy(db_session, user: User) -> Pharmacy:
+    """A pharmacy with ten neighbours, so its display payload is over the threshold."""
+    pharmacy = Pharmacy(
+        user_id=user.id, display_id="cz0000", name="Farmacia Centrale", city="Milano",
+        postal_code="20121", latitude=45.4642, longitude=9.19, is_active=True
+    )
+    db_session.add(pharmacy)
+    for i in range(1, 11):
+        db_session.add(Pharmacy(
+            user_id=user.id, display_id=f"cz{i:04d}", name=f"Farmacia Comunale {i}", address=f"Via Garibaldi {i}",
+            city="Milano", postal_code="20121", latitude=45.4642 + i * 0.001, longitude=9.19, is_active=True
+        ))
+    db_session.commit()
+    return pharmacy
+
+
+class TestNegotiation:
+    """Test Accept-Encoding negotiation."""
+
+    def test_prefers_brotli_then_gzip(self):
+        preferred = "br" if compression.brotli is not None else "gzip"
+
+        assert negotiate_encoding("gzip, deflate, br") == preferred
+        assert negotiate_encoding("gzip") == "gzip"
+        assert negotiate_encoding("*") == preferred
+
+    def test_weights_and_refusals(self):
+        assert negotiate_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+        assert negotiate_encoding("gzip;q=0") is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding(None) is None
+
+
+class TestCompressionMiddleware:
+    """Test the middleware on complete responses."""
+
+    def test_gzip_large_json(self):
+        response = make_app().get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert response.json() == LARGE
+
+    def test_brotli_large_json(self):
+        if compression.brotli is None:
+            return
+        response = make_app().get("/large", headers={"Accept-Encoding": "br"})
+
+        assert response.headers["content-encoding"] == "br"
+        assert response.json() == LARGE
+
+    def test_small_binary_or_unaccepted_left_alone(self):
+        client = make_app()
+
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        binary = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+        identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert small.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in binary.headers
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] == '"v1"'
+
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(compression.settings, "COMPRESSION_ENABLED", False)
+
+        response = make_app().get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+
+class TestPrecompressedDisplay:
+    """Test cached display payloads are compressed once per version."""
+
+    def test_compressed_once_per_version(self, client, db_session, test_user, monkeypatch):
+        pharmacy = make_display_pharmacy(db_session, test_user)
+        calls = []
+        original = compression.compress
+        monkeypatch.setattr(
+            compression, "compress", lambda body, encoding, precompress=False: calls.append(precompress) or original(body, encoding, precompress)
+        )
+
+        first = client.get(f"/api/v1/display/{pharmacy.id}", headers={"Accept-Encoding": "gzip"})
+        second = client.get(f"/api/v1/display/{pharmacy.id}", headers={"Accept-Encoding": "gzip"})
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["content-type"] == "application/json; charset=utf-8"
+        assert len(first.json()["nearby_pharmacies"]) == 10
+        assert second.content == first.content
+        assert calls == [True]
+
+        cached = display_cache.get(pharmacy.id)
+        body, encoding = cached.for_encoding("gzip")
+        assert encoding == "gzip"
+        assert gzip.decompress(body) == cached.body
+
+    def test_cache_hit_runs_no_query(self, client, db_session, test_user, query_budget):
+        pharmacy = make_display_pharmacy(db_session, test_user)
+        client.get(f"/api/v1/display/{pharmacy.id}")
+
+        with query_budget(0):
+            response = client.get(f"/api/v1/display/{pharmacy.id}")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_not_modified(self, client, db_session, test_user):
+        pharmacy = make_display_pharmacy(db_session, test_user)
+        etag = client.get(f"/api/v1/display/{pharmacy.id}").headers["etag"]
+
+        response = client.get(f"/api/v1/display/{pharmacy.id}", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    def test_shift_change_invalidates(self, client, db_session, test_user, auth_headers):
+        pharmacy = make_display_pharmacy(db_session, test_user)
+        client.get(f"/api/v1/display/{pharmacy.id}")
+        assert display_cache.get(pharmacy.id) is not None
+
+        response = client.post(
+            "/api/v1/shifts/",
+            json={"pharmacy_id": str(pharmacy.id), "date": "2026-10-20", "start_time": "08:30:00", "end_time": "19:30:00"},
+            headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert display_cache.get(pharmacy.id) is None
+        assert db_session.query(Shift).filter(Shift.pharmacy_id == pharmacy.id).count() == 1
+
+    def test_small_payload_sent_as_is(self):
+        payload = PrecompressedBody(b'{"ok":true}')
+
+        assert payload.for_encoding("gzip") == (b'{"ok":true}', None)
@@ -0,0 +1,90 @@
+"""Tests for the fast JSON response path."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import status
+
+from app.models.device import Device, DeviceStatus
+from app.models.pharmacy import Pharmacy
+from app.models.user import User
+from app.schemas.device import DeviceResponse
+from app.utils import fast_json
+from app.utils.fast_json import dumps, serialize_row
+
+
+def make_pharmacy(db_session, user: User) -> Pharmacy:
+    pharmacy = Pharmacy(
+        user_id=user.id, display_id="fj0001", name="Farmacia Città", city="Milano", postal_code="20121", is_active=True
+    )
+    db_session.add(pharmacy)
+    db_session.commit()
+    return pharmacy
+
+
+class TestSerialization:
+    """Test the fast path matches the response_model output."""
+
+    def test_row_matches_schema_dump(self):
+        """Test enums, UUIDs and UTC datetimes are written as pydantic would."""
+        device = Device(
+            id=uuid.uuid4(), serial_number="RPI-1", mac_address=None, firmware_version="1.0.0",
+            activation_code="CODE1234", pharmacy_id=None, status=DeviceStatus.MAINTENANCE,
+            last_seen=datetime(2026, 10, 19, 8, 30, 15, 250000, tzinfo=timezone.utc),
+            created_at=datetime(2026, 10, 19, 8, 0), activated_at=None
+        )
+
+        fast = json.loads(dumps(serialize_row(device, DeviceResponse)))
+
+        assert fast == DeviceResponse.model_validate(device).model_dump(mode="json")
+        assert fast["status"] == "maintenance"
+        assert fast["last_seen"] == "2026-10-19T08:30:15.250000Z"
+
+    def test_json_module_fallback(self, monkeypatch):
+        """Test the same document is produced without orjson."""
+        content = {"id": uuid.uuid4(), "name": "Farmacia Città", "at": datetime(2026, 10, 19, 8, 0)}
+        expected = json.loads(dumps(content))
+
+        monkeypatch.setattr(fast_json, "orjson", None)
+
+        assert json.loads(dumps(content)) == expected
+
+
+class TestFastEndpoints:
+    """Test the hot endpoints through the fast path."""
+
+    def test_device_list_and_heartbeat(self, client, db_session, test_user, auth_headers):
+        """Test listing and heartbeat payloads match the schema and declare UTF-8."""
+        pharmacy = make_pharmacy(db_session, test_user)
+        device = Device(serial_number="RPI-9", activation_code="CODE9999", pharmacy_id=pharmacy.id, status=DeviceStatus.ACTIVE)
+        db_session.add(device)
+        db_session.commit()
+
+        response = client.get("/api/v1/devices/", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json; charset=utf-8"
+        db_session.refresh(device)
+        assert response.json() == [DeviceResponse.model_validate(device).model_dump(mode="json")]
+
+        response = client.post(
+            f"/api/v1/devices/{device.id}/heartbeat",
+            json={"serial_number": "RPI-9", "firmware_version": "2.0.0", "status": "active"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["firmware_version"] == "2.0.0"
+        assert response.json()["status"] == "active"
+
+    def test_pharmacy_list_keeps_pagination(self, client, db_session, test_user, auth_headers):
+        """Test the paginated listing keeps its envelope and non-ASCII text."""
+        make_pharmacy(db_session, test_user)
+
+        response = client.get("/api/v1/pharmacies/", headers=auth_headers)
+
+        data = response.json()
+        assert response.status_code == status.HTTP_200_OK
+        assert {"items", "total", "skip", "limit", "has_more"} <= set(data)
+        assert data["items"][0]["name"] == "Farmacia Città"
+        assert "Città".encode() in response.content
@@ -0,0 +1,107 @@
+"""Tests for health endpoints and the shared Redis pool."""
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.redis_pool import RedisPool, RedisUnavailableError
+
+
+def make_unreachable_pool() -> RedisPool:
+    """Pool pointing at a port where nothing listens."""
+    return RedisPool(
+        url="redis://:secret@127.0.0.1:1/0",
+        max_connections=2,
+        socket_timeout=0.2,
+        connect_timeout=0.2,
+        retry_backoff=60
+    )
+
+
+class TestRedisPool:
+    """Test health tracking of the shared Redis pool."""
+
+    async def test_unreachable_redis_fails_fast(self):
+        """Test an unreachable Redis is marked unhealthy and skipped during the backoff."""
+        pool = make_unreachable_pool()
+        calls = []
+
+        async def operation(client):
+            calls.append(client)
+            return await client.get("key")
+
+        try:
+            await pool.start()
+            assert pool.healthy is False
+
+            with pytest.raises(RedisUnavailableError):
+                await pool.call(operation)
+            assert calls == []
+
+            stats = pool.get_stats()
+            assert stats["started"] is True
+            assert "secret" not in stats["url"]
+        finally:
+            await pool.close()
+
+    async def test_call_failure_marks_unhealthy(self):
+        """Test a failed command opens the backoff window."""
+        pool = make_unreachable_pool()
+        try:
+            await pool.start()
+            pool._mark_healthy()
+
+            with pytest.raises(RedisUnavailableError):
+                await pool.call(lambda client: client.get("key"))
+
+            assert pool.healthy is False
+            assert pool.get_stats()["errors_total"] == 1
+            with pytest.raises(RedisUnavailableError):
+                pool.get_client()
+        finally:
+            await pool.close()
+
+    def test_not_started(self):
+        """Test the client is refused before startup."""
+        with pytest.raises(RedisUnavailableError):
+            make_unreachable_pool().get_client()
+
+
+class TestHealthEndpoints:
+    """Test health endpoints."""
+
+    def test_health(self, client: TestClient):
+        """Test basic health check."""
+        response = client.get("/api/v1/health")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"status": "healthy"}
+
+    def test_redis_stats(self, client: TestClient, auth_headers: dict, admin_headers: dict):
+        """Test Redis pool statistics are exposed to admins only."""
+        assert client.get("/api/v1/health/redis").status_code == status.HTTP_403_FORBIDDEN
+        assert client.get("/api/v1/health/redis", headers=auth_headers).status_code == status.HTTP_403_FORBIDDEN
+
+        response = client.get("/api/v1/health/redis", headers=admin_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["started"] is True
+        assert "commands_total" in data
+
+    def test_replica_stats_require_admin(self, client: TestClient, auth_headers: dict, admin_headers: dict):
+        """Test replica URLs and errors are only shown to admins."""
+        assert client.get("/api/v1/health/replicas").status_code == status.HTTP_403_FORBIDDEN
+        assert client.get("/api/v1/health/replicas", headers=auth_headers).status_code == status.HTTP_403_FORBIDDEN
+
+        response = client.get("/api/v1/health/replicas", headers=admin_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "replicas" in response.json()
+
+    def test_detailed_health_hides_redis_errors(self, client: TestClient):
+        """Test the public detailed check only reports the Redis status."""
+        response = client.get("/api/v1/health/detailed")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["redis"] in ("healthy", "unhealthy")
@@ -0,0 +1,92 @@
+"""Tests for display image variants."""
+
+import io
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.models.pharmacy import Pharmacy
+from app.models.display_config import DisplayConfig
+from app.models.user import User
+from app.services import image_variants
+from app.services.image_variants import ImageVariantPool, generate_variants
+from app.utils import uploads
+from tests.conftest import TestingSessionLocal
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Redirect uploads to a temporary directory."""
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path)
+    return tmp_path
+
+
+def image_bytes(size=(4000, 3000), fmt="JPEG") -> bytes:
+    """Encoded solid-color image."""
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+class TestGenerateVariants:
+    """Test resizing and recompression."""
+
+    def test_large_jpeg_scaled_to_fit(self, tmp_path):
+        """Test each variant fits its bounding box and keeps the aspect ratio."""
+        source = tmp_path / "photo.jpg"
+        source.write_bytes(image_bytes())
+
+        variants = generate_variants(source, ("1080p", "thumb"))
+
+        with Image.open(variants["1080p"]["webp"]) as full:
+            assert full.size == (1440, 1080)
+        with Image.open(variants["thumb"]["webp"]) as thumb:
+            assert thumb.size == (320, 240)
+
+    def test_pdf_first_page_rasterized(self, tmp_path):
+        """Test the first page of a PDF becomes an image."""
+        pytest.importorskip("pypdfium2")
+        source = tmp_path / "turni.pdf"
+        source.write_bytes(image_bytes(size=(800, 1131), fmt="PDF"))
+
+        variants = generate_variants(source, ("720p",))
+
+        with Image.open(variants["720p"]["webp"]) as page:
+            assert page.height == 720
+
+
+class TestDisplayImageUpload:
+    """Test variants are generated after an upload."""
+
+    def test_variant_urls_exposed(
+        self, client: TestClient, auth_headers: dict, test_user: User, db_session, upload_dir, monkeypatch
+    ):
+        """Test the config exposes variant URLs once the background job ran."""
+        pool = ImageVariantPool(max_workers=1, session_factory=TestingSessionLocal)
+        monkeypatch.setattr("app.api.v1.display_config.image_variant_pool", pool)
+
+        pharmacy = Pharmacy(
+            user_id=test_user.id, display_id="IMG001", name="Image Pharmacy",
+            city="Milano", postal_code="20121", is_active=True
+        )
+        db_session.add(pharmacy)
+        db_session.commit()
+        db_session.add(DisplayConfig(pharmacy_id=str(pharmacy.id), pharmacy_name="Image Pharmacy"))
+        db_session.commit()
+
+        response = client.post(
+            f"/api/v1/display-config/{pharmacy.id}/upload-image",
+            files={"file": ("turni.jpg", image_bytes(), "image/jpeg")},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        pool.wait(timeout=30)
+
+        config = client.get(f"/api/v1/display-config/{pharmacy.id}").json()
+        assert set(config["image_variants"]) == set(image_variants.FIELD_VARIANTS["image_path"])
+        webp_url = config["image_variants"]["1080p"]["webp"]
+        assert uploads.upload_path(webp_url).exists()
+        assert pool.get_stats()["completed"] == 1
@@ -0,0 +1,103 @@
+"""Tests for request metrics and the Prometheus endpoint."""
+
+import uuid
+
+import pytest
+from fastapi import status
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from app.core.metrics import RequestStats, _current_request, record_redis_call  # noqa: E402
+
+ROUTE = "/api/v1/pharmacies/"
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of a sample in the default registry (0 if absent)."""
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestRequestMetrics:
+    """Test per-route request instrumentation."""
+
+    def test_request_recorded_with_route_template(self, client, auth_headers):
+        """Test latency, status, size and DB queries are labelled with the route template."""
+        before = sample("http_requests_total", method="GET", route=ROUTE, status="200")
+        queries_before = sample("http_request_db_queries_sum", route=ROUTE)
+        count_before = sample("http_request_duration_seconds_count", method="GET", route=ROUTE)
+
+        response = client.get(ROUTE, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert sample("http_requests_total", method="GET", route=ROUTE, status="200") == before + 1
+        assert sample("http_request_duration_seconds_count", method="GET", route=ROUTE) == count_before + 1
+        assert sample("http_request_db_queries_sum", route=ROUTE) > queries_before
+        assert sample("http_response_size_bytes_sum", method="GET", route=ROUTE) >= len(response.content)
+        assert sample("http_requests_in_progress", method="GET") == 0
+
+    def test_path_parameters_not_in_labels(self, client):
+        """Test ids in the path are folded into the route template."""
+        first, second = str(uuid.uuid4()), str(uuid.uuid4())
+        before = sample("http_requests_total", method="GET", route="/api/v1/display/{pharmacy_id}", status="404")
+
+        client.get(f"/api/v1/display/{first}")
+        client.get(f"/api/v1/display/{second}")
+
+        assert sample("http_requests_total", method="GET", route="/api/v1/display/{pharmacy_id}", status="404") == before + 2
+        assert sample("http_requests_total", method="GET", route=f"/api/v1/display/{first}", status="404") == 0
+
+    def test_unmatched_paths_share_one_label(self, client):
+        """Test unknown paths are counted under a single route label."""
+        before = sample("http_requests_total", method="GET", route="<unmatched>", status="404")
+
+        client.get("/no-such-path")
+
+        assert sample("http_requests_total", method="GET", route="<unmatched>", status="404") == before + 1
+
+    def test_redis_calls_counted_per_request(self):
+        """Test Redis round-trips are added to the current request only."""
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        try:
+            record_redis_call(0.002)
+            record_redis_call(0.001)
+        finally:
+            _current_request.reset(token)
+        record_redis_call(0.001)
+
+        assert stats.redis_calls == 2
+        assert stats.redis_seconds == pytest.approx(0.003)
+
+
+class TestMetricsEndpoint:
+    """Test the Prometheus exposition endpoint."""
+
+    def test_metrics_exposed(self, client):
+        """Test /metrics returns the text format."""
+        client.get("/health")
+
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "http_request_duration_seconds_bucket" in response.text
+        assert "db_query_duration_seconds" in response.text
+
+    def test_metrics_aggregated_across_workers(self, client, tmp_path, monkeypatch):
+        """Test multiprocess mode reads the samples written by all workers."""
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        from prometheus_client import Counter, values
+
+        values.ValueClass = values.get_value_class()
+        try:
+            registry = prometheus_client.CollectorRegistry()
+            Counter("worker_jobs_total", "Jobs", registry=registry).inc(3)
+        finally:
+            monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR")
+            values.ValueClass = values.get_value_class()
+
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        response = client.get("/metrics")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "worker_jobs_total 3.0" in response.text
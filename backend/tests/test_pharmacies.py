@@ -4,6 +4,7 @@ import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from app.core.pharmacy_ownership import PharmacyOwnershipCache, pharmacy_ownership
 from app.models.pharmacy import Pharmacy
 from app.models.user import User
 
@@ -220,3 +221,64 @@ class TestDeletePharmacy:
         )
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestPharmacyOwnership:
+    """Test the cached ownership map used by access checks."""
+
+    @pytest.fixture
+    def owned_pharmacy(self, test_user: User, db_session) -> Pharmacy:
+        """Pharmacy owned by the test user."""
+        pharmacy = Pharmacy(
+            user_id=test_user.id, display_id="OWN001", name="Own Pharmacy",
+            city="Milano", postal_code="20121", is_active=True
+        )
+        db_session.add(pharmacy)
+        db_session.commit()
+        return pharmacy
+
+    def test_owned_ids_cached(self, db_session, test_user: User, owned_pharmacy: Pharmacy):
+        """Test owned pharmacy ids are loaded once and invalidated on change."""
+        cache = PharmacyOwnershipCache(ttl_seconds=60, max_entries=100)
+
+        assert cache.get_owned_pharmacy_ids(db_session, test_user.id) == {owned_pharmacy.id}
+
+        other = Pharmacy(user_id=test_user.id, display_id="OWN002", name="Second", is_active=True)
+        db_session.add(other)
+        db_session.commit()
+        assert cache.get_owned_pharmacy_ids(db_session, test_user.id) == {owned_pharmacy.id}
+
+        cache.invalidate_pharmacy(other.id, test_user.id)
+        assert cache.get_owned_pharmacy_ids(db_session, test_user.id) == {owned_pharmacy.id, other.id}
+        assert cache.get_stats()["hits"] == 1
+
+    def test_access_checks(
+        self, client: TestClient, admin_user: User, owned_pharmacy: Pharmacy,
+        auth_headers: dict, admin_headers: dict, db_session
+    ):
+        """Test owner, admin, other user and missing pharmacy."""
+        foreign = Pharmacy(
+            user_id=admin_user.id, display_id="ADM001", name="Admin Pharmacy",
+            city="Milano", postal_code="20121", is_active=True
+        )
+        db_session.add(foreign)
+        db_session.commit()
+        pharmacy_ownership.clear()
+
+        assert client.get(f"/api/v1/pharmacies/{owned_pharmacy.id}", headers=auth_headers).status_code == status.HTTP_200_OK
+        assert client.get(f"/api/v1/pharmacies/{foreign.id}", headers=auth_headers).status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(f"/api/v1/pharmacies/{owned_pharmacy.id}", headers=admin_headers).status_code == status.HTTP_200_OK
+        response = client.get(
+            "/api/v1/pharmacies/00000000-0000-0000-0000-000000000000", headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_created_pharmacy_immediately_accessible(self, client: TestClient, auth_headers: dict, owned_pharmacy: Pharmacy):
+        """Test creating a pharmacy invalidates the owner's cached set."""
+        client.get(f"/api/v1/pharmacies/{owned_pharmacy.id}", headers=auth_headers)
+
+        response = client.post("/api/v1/pharmacies", json={"name": "New Pharmacy", "city": "Milano", "postal_code": "20121"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = client.get(f"/api/v1/pharmacies/{response.json()['id']}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,122 @@
+"""Tests for the sampling profiler and its admin endpoints."""
+
+import re
+import threading
+
+import pytest
+from fastapi import status
+
+from app.core.sampling_profiler import ProfilerBusyError, SamplingProfiler, sampling_profiler
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """CPU-bound work for the sampler to find."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def busy_thread():
+    """A thread spinning in busy_loop for the duration of the test."""
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+@pytest.fixture(autouse=True)
+def stop_profiler():
+    """Leave no session running between tests."""
+    yield
+    sampling_profiler.stop()
+
+
+class TestSamplingProfiler:
+    """Test stack sampling and the session bounds."""
+
+    def test_window_collects_collapsed_stacks(self, busy_thread):
+        """Test a window session finds the busy function, in the collapsed format."""
+        profiler = SamplingProfiler(max_seconds=5)
+
+        profiler.start(duration=0.3, interval=0.002)
+        result = profiler.wait()
+
+        assert result["samples"] > 10
+        lines = result["collapsed"].splitlines()
+        assert all(re.fullmatch(r"\S.* \d+", line) for line in lines)
+        busy = [line for line in lines if line.startswith("busy;")]
+        assert busy and "busy_loop (" in busy[0]
+
+    def test_duration_capped(self):
+        """Test sessions never run longer than max_seconds."""
+        profiler = SamplingProfiler(max_seconds=0.1)
+
+        status_ = profiler.start(duration=3600, interval=0.01)
+        profiler.wait()
+
+        assert status_["duration_seconds"] == 0.1
+        assert profiler.running is False
+
+    def test_one_session_at_a_time(self):
+        """Test a second session is refused while one runs."""
+        profiler = SamplingProfiler(max_seconds=5)
+        profiler.start(duration=5, interval=0.01)
+        try:
+            with pytest.raises(ProfilerBusyError):
+                profiler.start(duration=1, interval=0.01)
+        finally:
+            profiler.stop()
+
+    def test_request_sampling_only_while_picked_requests_run(self, busy_thread):
+        """Test a sampled session records nothing until a picked request is in flight."""
+        profiler = SamplingProfiler(max_seconds=5)
+        profiler.start(duration=5, interval=0.002, sample_rate=1.0)
+
+        threading.Event().wait(0.05)
+        assert profiler.get_status()["samples"] == 0
+
+        assert profiler.request_started() is True
+        threading.Event().wait(0.05)
+        profiler.request_finished()
+        result = profiler.stop()
+
+        assert result["samples"] > 0
+        assert result["requests_sampled"] == 1
+        assert profiler.sample_rate is None
+        assert profiler.request_started() is False
+
+
+class TestProfilingEndpoints:
+    """Test the admin profiling API."""
+
+    def test_admin_only(self, client, auth_headers):
+        """Test regular users cannot profile."""
+        response = client.get("/api/v1/profiling/sample", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_sample_window(self, client, admin_headers, busy_thread):
+        """Test a blocking window returns collapsed stacks as text."""
+        response = client.get("/api/v1/profiling/sample?duration_seconds=0.2&interval_ms=2", headers=admin_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "busy_loop (" in response.text
+
+    def test_session_lifecycle(self, client, admin_headers):
+        """Test start, conflict, stop and the flamegraph of a background session."""
+        response = client.post("/api/v1/profiling/start?duration_seconds=30&sample_rate=0.5", headers=admin_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["running"] is True
+        assert response.json()["sample_rate"] == 0.5
+
+        assert client.post("/api/v1/profiling/start", headers=admin_headers).status_code == status.HTTP_409_CONFLICT
+        assert client.get("/api/v1/profiling/flamegraph", headers=admin_headers).status_code == status.HTTP_404_NOT_FOUND
+
+        response = client.post("/api/v1/profiling/stop", headers=admin_headers)
+        assert response.json()["running"] is False
+
+        response = client.get("/api/v1/profiling/flamegraph", headers=admin_headers)
+        assert response.status_code == status.HTTP_200_OK
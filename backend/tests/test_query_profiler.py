@@ -0,0 +1,138 @@
+"""Tests for the query profiler and per-endpoint query budgets."""
+
+from datetime import datetime, time
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core import query_profiler
+from app.core.query_profiler import QueryProfilerMiddleware, capture_queries, statement_shape
+from app.models.device import Device, DeviceStatus
+from app.models.pharmacy import Pharmacy
+from app.models.shift import Shift
+from app.models.user import User
+from tests.conftest import engine
+
+
+@pytest.fixture
+def pharmacies(test_user: User, db_session) -> list[Pharmacy]:
+    """Three pharmacies of the test user, each with two devices and a shift."""
+    rows = []
+    for i in range(3):
+        pharmacy = Pharmacy(
+            user_id=test_user.id,
+            display_id=f"qp{i:04d}",
+            name=f"Farmacia Profiler {i}",
+            city="Milano",
+            postal_code="20121",
+            latitude=45.46 + i / 1000,
+            longitude=9.19,
+            is_active=True
+        )
+        db_session.add(pharmacy)
+        db_session.flush()
+        for j in range(2):
+            db_session.add(Device(
+                serial_number=f"QP-{i}-{j}",
+                activation_code=f"QPCODE{i}{j}",
+                pharmacy_id=pharmacy.id,
+                status=DeviceStatus.ACTIVE
+            ))
+        db_session.add(Shift(pharmacy_id=pharmacy.id, date=datetime.now().date(), start_time=time(0, 0), end_time=time(23, 59)))
+        rows.append(pharmacy)
+    db_session.commit()
+    return rows
+
+
+class TestStatementShape:
+    """Test statement normalization."""
+
+    def test_values_and_in_lists_ignored(self):
+        """Test literals and placeholder lists of any length share a shape."""
+        first = statement_shape("SELECT * FROM devices WHERE pharmacy_id IN (?, ?, ?) AND status = 'ACTIVE' LIMIT 10")
+        second = statement_shape("SELECT *  FROM devices\n WHERE pharmacy_id IN (?) AND status = 'INACTIVE' LIMIT 20")
+
+        assert first == second
+        assert statement_shape("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s)") == "SELECT * FROM t WHERE id IN (...)"
+
+
+class TestQueryProfile:
+    """Test statement capture and N+1 detection."""
+
+    def test_repeated_shapes_flagged(self, db_session, pharmacies):
+        """Test a per-row lookup loop is reported as repeated."""
+        ids = [pharmacy.id.hex for pharmacy in pharmacies]
+
+        with capture_queries(engine) as profile:
+            for pharmacy_id in ids:
+                db_session.execute(text("SELECT COUNT(*) FROM devices WHERE pharmacy_id = :id"), {"id": pharmacy_id})
+
+        assert profile.count == 3
+        assert profile.repeated(3) == [("SELECT COUNT(*) FROM devices WHERE pharmacy_id = ?", 3)]
+        assert profile.repeated(4) == []
+        assert "3 statements" in profile.summary()
+
+    def test_slow_query_logged_with_plan(self, db_session, pharmacies, monkeypatch, capsys):
+        """Test statements over the threshold are printed with their plan."""
+        monkeypatch.setattr(query_profiler.settings, "SLOW_QUERY_THRESHOLD_MS", 0.000001)
+        query_profiler.install_query_profiler()
+
+        db_session.execute(text("SELECT name FROM pharmacies WHERE display_id = :d"), {"d": "qp0001"}).all()
+
+        output = capsys.readouterr().out
+        assert "Warning: slow query" in output
+        assert "SELECT name FROM pharmacies" in output
+        assert "SEARCH pharmacies USING INDEX" in output
+
+    def test_middleware_adds_count_and_warns(self, db_session, pharmacies, monkeypatch, capsys):
+        """Test the middleware reports statement counts and repeated shapes per request."""
+        monkeypatch.setattr(query_profiler.settings, "QUERY_N_PLUS_ONE_THRESHOLD", 3)
+        ids = [pharmacy.id.hex for pharmacy in pharmacies]
+        profiled = FastAPI()
+        profiled.add_middleware(QueryProfilerMiddleware)
+
+        @profiled.get("/names")
+        def names():
+            return [
+                db_session.execute(text("SELECT name FROM pharmacies WHERE id = :id"), {"id": pharmacy_id}).scalar()
+                for pharmacy_id in ids
+            ]
+
+        response = TestClient(profiled).get("/names")
+
+        assert response.headers["X-DB-Query-Count"] == "3"
+        assert "Warning: possible N+1 in GET /names: 3x SELECT name FROM pharmacies WHERE id = ?" in capsys.readouterr().out
+
+
+class TestEndpointQueryBudgets:
+    """Statement budgets of the hot endpoints; a new per-row query fails these."""
+
+    def test_list_devices(self, client, auth_headers, pharmacies, query_budget):
+        """Test listing devices does not query per pharmacy or device."""
+        with query_budget(3):
+            response = client.get("/api/v1/devices/", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 6
+
+    def test_delete_pharmacy(self, client, auth_headers, pharmacies, query_budget):
+        """Test deleting a pharmacy updates its devices in one statement."""
+        with query_budget(5):
+            response = client.delete(f"/api/v1/pharmacies/{pharmacies[0].id}", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_display(self, client, pharmacies, query_budget):
+        """Test the display payload does not query per nearby pharmacy."""
+        with query_budget(4):
+            response = client.get(f"/api/v1/display/{pharmacies[0].id}")
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_budget_exceeded_fails(self, client, auth_headers, pharmacies, query_budget):
+        """Test going over budget fails the test with the statements listed."""
+        with pytest.raises(pytest.fail.Exception, match="Query budget exceeded"):
+            with query_budget(0):
+                client.get("/api/v1/devices/", headers=auth_headers)
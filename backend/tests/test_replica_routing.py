@@ -0,0 +1,219 @@
+"""Tests for read replica routing."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app import database
+from app.core import replica_router as routing
+from app.core.redis_pool import RedisUnavailableError
+from app.core.replica_router import ReadYourWritesMiddleware, ReplicaRouter, ReplicationStoppedError
+
+
+class FakeRedis:
+    """The two commands used for read-your-writes markers."""
+
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, ex=None):
+        self.keys[key] = ex
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+
+class FakePostgresReplica:
+    """Engine stand-in answering the lag query with a fixed value."""
+
+    class dialect:
+        name = "postgresql"
+
+    url = type("URL", (), {"render_as_string": lambda _, hide_password: "fake"})()
+
+    def __init__(self, lag):
+        self.lag = lag
+
+    def connect(self):
+        replica = self
+
+        class Connection:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, statement):
+                return type("Result", (), {"scalar": lambda _: replica.lag})()
+
+        return Connection()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+
+    async def call(operation):
+        return await operation(redis)
+
+    monkeypatch.setattr(routing.redis_pool, "call", call)
+    return redis
+
+
+@pytest.fixture
+def engines():
+    primary = create_engine("sqlite://")
+    replicas = [create_engine("sqlite://"), create_engine("sqlite://")]
+    yield primary, replicas
+    for engine in [primary, *replicas]:
+        engine.dispose()
+
+
+def make_request(authorization=None) -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestReplicaRouter:
+    """Test replica selection."""
+
+    def test_round_robin_over_healthy_replicas(self, engines):
+        primary, replicas = engines
+        router = ReplicaRouter(primary, replicas, max_lag=5, check_interval=60)
+
+        assert router.pick() is primary  # Not checked yet
+        router.check()
+
+        assert [router.pick() for _ in range(4)] == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+    def test_lagging_or_failing_replicas_fall_back_to_primary(self, engines, monkeypatch):
+        primary, replicas = engines
+        router = ReplicaRouter(primary, replicas, max_lag=5, check_interval=60)
+        lags = {replicas[0]: 12.0, replicas[1]: ConnectionError("connection refused")}
+
+        def measure_lag(replica):
+            lag = lags[replica]
+            if isinstance(lag, Exception):
+                raise lag
+            return lag
+
+        monkeypatch.setattr(router, "measure_lag", measure_lag)
+        router.check()
+
+        assert router.pick() is primary
+        stats = router.get_stats()
+        assert stats["primary_fallbacks"] == 1
+        assert [replica["lag_seconds"] for replica in stats["replicas"]] == [12.0, None]
+        assert stats["replicas"][1]["error"] == "connection refused"
+
+        lags[replicas[0]] = 0.5
+        router.check()
+
+        assert router.pick() is replicas[0]
+
+    def test_replica_without_wal_stream_is_unhealthy(self, engines):
+        primary, _ = engines
+        disconnected = FakePostgresReplica(lag=None)  # Lag query answers NULL without a stream
+        router = ReplicaRouter(primary, [disconnected], max_lag=5, check_interval=60)
+
+        assert ReplicaRouter.measure_lag(FakePostgresReplica(lag=1.5)) == 1.5
+        with pytest.raises(ReplicationStoppedError):
+            ReplicaRouter.measure_lag(disconnected)
+
+        router.check()
+
+        assert router.pick() is primary
+        assert router.get_stats()["replicas"] == [{
+            "url": "fake", "healthy": False, "lag_seconds": None, "error": "no active WAL stream from the primary"
+        }]
+
+    def test_no_replicas(self, engines):
+        primary, _ = engines
+        router = ReplicaRouter(primary, [], max_lag=5, check_interval=60)
+        router.start()
+
+        assert router.pick() is primary
+        assert router.get_stats()["replicas"] == []
+
+    def test_monitor_thread_stops(self, engines):
+        primary, replicas = engines
+        router = ReplicaRouter(primary, replicas, max_lag=5, check_interval=0.01)
+
+        router.start()
+        router.stop()
+
+        assert router.pick() in replicas
+
+
+class TestReadEngine:
+    """Test the read-only session dependency."""
+
+    @pytest.fixture
+    def routed(self, engines, monkeypatch):
+        primary, replicas = engines
+        router = ReplicaRouter(primary, replicas[:1], max_lag=5, check_interval=60)
+        router.check()
+        monkeypatch.setattr(database, "engine", primary)
+        monkeypatch.setattr(database, "replica_engines", replicas[:1])
+        monkeypatch.setattr(database, "replica_router", router)
+        return primary, replicas[0]
+
+    def test_anonymous_reads_use_replica(self, routed):
+        primary, replica = routed
+
+        assert asyncio.run(database.get_read_engine(make_request())) is replica
+
+    def test_recent_writer_reads_primary(self, routed, fake_redis):
+        primary, replica = routed
+        asyncio.run(fake_redis.set(routing._writer_key({"authorization": "Bearer abc"}), 1))
+
+        assert asyncio.run(database.get_read_engine(make_request("Bearer abc"))) is primary
+        assert asyncio.run(database.get_read_engine(make_request("Bearer other"))) is replica
+
+    def test_redis_down_reads_primary(self, routed, monkeypatch):
+        primary, _ = routed
+
+        async def call(operation):
+            raise RedisUnavailableError("down")
+
+        monkeypatch.setattr(routing.redis_pool, "call", call)
+
+        assert asyncio.run(database.get_read_engine(make_request("Bearer abc"))) is primary
+
+    def test_without_replicas_reads_primary(self):
+        assert asyncio.run(database.get_read_engine(make_request("Bearer abc"))) is database.engine
+
+
+class TestReadYourWritesMiddleware:
+    """Test writers are marked for READ_YOUR_WRITES_SECONDS."""
+
+    @pytest.fixture
+    def client(self):
+        async def ok(request):
+            return JSONResponse({"ok": True})
+
+        async def rejected(request):
+            return JSONResponse({"detail": "invalid"}, status_code=422)
+
+        app = Starlette(routes=[Route("/ok", ok, methods=["GET", "POST"]), Route("/rejected", rejected, methods=["POST"])])
+        app.add_middleware(ReadYourWritesMiddleware)
+        return TestClient(app)
+
+    def test_successful_write_marks_client(self, client, fake_redis):
+        client.post("/ok", headers={"Authorization": "Bearer abc"})
+
+        assert fake_redis.keys == {routing._writer_key({"authorization": "Bearer abc"}): routing.settings.READ_YOUR_WRITES_SECONDS}
+
+    def test_reads_failures_and_anonymous_not_marked(self, client, fake_redis):
+        client.get("/ok", headers={"Authorization": "Bearer abc"})
+        client.post("/rejected", headers={"Authorization": "Bearer abc"})
+        client.post("/ok")
+
+        assert fake_redis.keys == {}
@@ -0,0 +1,355 @@
+"""Tests for scraping API endpoints and snapshot store."""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.models.pharmacy import Pharmacy
+from app.models.scrape_snapshot import ScrapePayload, ScrapeSnapshot
+from app.services import snapshot_store
+from app.services.scraping_enrichment import PharmacyMatcher, enrich_pharmacies, normalize_text, pharmacy_matcher
+from app.services.scraping_cache import CircuitBreaker, CircuitOpenError, StaleWhileRevalidateCache, scrape_cache
+from app.services.scraping_service import PharmacyShiftInfo, ScrapingService, scraping_service
+
+
+SEARCH_HTML = """
+<div class="farmacia-box" itemscope itemtype="https://schema.org/Pharmacy">
+  <span itemprop="name" class="pharmacyname">Farmacia Centrale</span>
+  <div itemprop="address" itemscope itemtype="https://schema.org/PostalAddress">
+    <span itemprop="streetAddress">Via Roma 1</span>
+    <span itemprop="addressLocality">21049 TRADATE</span>
+    <span itemprop="addressRegion">VA</span>
+  </div>
+  <a class="btorario cturno">Turno</a>
+</div>
+"""
+
+
+def make_pharmacy(name: str, status_value: str = "TURNO", **kwargs) -> PharmacyShiftInfo:
+    """Build a scraped pharmacy entry."""
+    return PharmacyShiftInfo(
+        name=name,
+        address=kwargs.pop("address", "Via Roma 1"),
+        city="Tradate",
+        province="VA",
+        postal_code="21049",
+        status=status_value,
+        **kwargs
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_scrape_cache():
+    """Start every test with an empty scrape cache."""
+    scrape_cache.clear()
+    pharmacy_matcher.clear()
+    yield
+    scrape_cache.clear()
+    pharmacy_matcher.clear()
+
+
+@pytest.fixture
+def fake_scraper(monkeypatch):
+    """Replace the upstream scrape with a controllable result."""
+    result = {"pharmacies": [make_pharmacy("Farmacia Centrale")]}
+
+    async def fake_search(**kwargs):
+        return result["pharmacies"]
+
+    monkeypatch.setattr(scraping_service, "search_pharmacies", fake_search)
+    return result
+
+
+class TestSnapshotStore:
+    """Test snapshot persistence and diffing."""
+
+    def test_identical_snapshots_share_payload(self, db_session):
+        """Test unchanged content is stored once and reported as unchanged."""
+        pharmacies = [make_pharmacy("Farmacia A"), make_pharmacy("Farmacia B")]
+
+        first = snapshot_store.save_snapshot(db_session, "21049", datetime(2025, 11, 11, 20, 0), pharmacies)
+        second = snapshot_store.save_snapshot(
+            db_session, "21049", datetime(2025, 11, 11, 20, 30), list(reversed(pharmacies))
+        )
+
+        assert first.changed is True
+        assert second.changed is False
+        assert first.snapshot.content_hash == second.snapshot.content_hash
+        assert db_session.query(ScrapePayload).count() == 1
+        assert db_session.query(ScrapeSnapshot).count() == 2
+
+    def test_diff_reports_added_removed_changed(self, db_session):
+        """Test diff between two slots."""
+        old = snapshot_store.save_snapshot(
+            db_session, "21049", datetime(2025, 11, 11, 20, 0),
+            [make_pharmacy("Farmacia A"), make_pharmacy("Farmacia B")]
+        ).snapshot
+        new = snapshot_store.save_snapshot(
+            db_session, "21049", datetime(2025, 11, 11, 20, 30),
+            [make_pharmacy("Farmacia A", "APERTO"), make_pharmacy("Farmacia C")]
+        ).snapshot
+
+        diff = snapshot_store.diff_snapshots(old, new)
+
+        assert [p.name for p in diff.added] == ["Farmacia C"]
+        assert [p.name for p in diff.removed] == ["Farmacia B"]
+        assert [p.name for p in diff.changed] == ["Farmacia A"]
+        assert diff.has_changes
+
+
+class TestScrapingSnapshots:
+    """Test snapshot-aware scraping endpoints."""
+
+    def test_search_persists_snapshot(self, client: TestClient, fake_scraper, db_session, monkeypatch):
+        """Test search stores a snapshot and serves it while refreshing."""
+        monkeypatch.setattr(scrape_cache, "on_refresh", None)
+        body = {"cap": "21049", "search_date": datetime.now().date().isoformat(), "search_time": "20:00"}
+
+        first = client.post("/api/v1/scraping/search", json=body)
+        scrape_cache.clear()
+        second = client.post("/api/v1/scraping/search", json=body)  # Persisted slot, refreshed in background
+        cached = client.post("/api/v1/scraping/search", json=body)
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.json()["changed"] is True
+        assert second.json()["stale"] is True
+        assert first.json()["content_hash"] == second.json()["content_hash"]
+        assert cached.json()["content_hash"] == first.json()["content_hash"]
+        assert cached.json()["stale"] is False
+        assert db_session.query(ScrapeSnapshot).count() == 1
+
+    def test_diff_endpoint(self, client: TestClient, fake_scraper):
+        """Test diff endpoint against the previous slot."""
+        today = datetime.now().date().isoformat()
+
+        client.post("/api/v1/scraping/search", json={"cap": "21049", "search_date": today, "search_time": "20:00"})
+        fake_scraper["pharmacies"] = [make_pharmacy("Farmacia Centrale"), make_pharmacy("Farmacia Nuova")]
+        client.post("/api/v1/scraping/search", json={"cap": "21049", "search_date": today, "search_time": "20:30"})
+
+        response = client.get(
+            "/api/v1/scraping/snapshots/diff",
+            params={"cap": "21049", "to_slot": f"{today}T20:30"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["has_changes"] is True
+        assert [p["name"] for p in data["added"]] == ["Farmacia Nuova"]
+        assert data["removed"] == []
+
+    def test_diff_endpoint_not_found(self, client: TestClient):
+        """Test diff for a slot that was never scraped."""
+        response = client.get(
+            "/api/v1/scraping/snapshots/diff",
+            params={"cap": "21049", "to_slot": "2025-11-11T20:30"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestScrapingClient:
+    """Test the pooled scraping HTTP client."""
+
+    async def test_conditional_request_reuses_result(self):
+        """Test If-Modified-Since is sent and a 304 reuses the parsed result."""
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("if-modified-since"))
+            if request.headers.get("if-modified-since"):
+                return httpx.Response(304)
+            return httpx.Response(
+                200,
+                content=SEARCH_HTML.encode("iso-8859-1"),
+                headers={"Last-Modified": "Tue, 11 Nov 2025 20:00:00 GMT"}
+            )
+
+        service = ScrapingService(http2=False)
+        service.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            first = await service.search_pharmacies(cap="21049")
+            second = await service.search_pharmacies(cap="21049")
+        finally:
+            await service.close()
+
+        assert [p.name for p in first] == ["Farmacia Centrale"]
+        assert second == first
+        assert seen_headers == [None, "Tue, 11 Nov 2025 20:00:00 GMT"]
+
+        stats = service.get_pool_stats()
+        assert stats["requests_total"] == 2
+        assert stats["not_modified_total"] == 1
+        assert stats["started"] is False
+
+    def test_pool_stats_endpoint(self, client: TestClient):
+        """Test pool statistics are exposed."""
+        response = client.get("/api/v1/scraping/pool-stats")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["max_connections"] >= 1
+        assert "idle_connections" in data
+
+
+class TestStaleWhileRevalidate:
+    """Test stale-while-revalidate serving and the circuit breaker."""
+
+    async def test_stale_entry_served_and_refreshed(self, monkeypatch):
+        """Test an expired entry is served stale and refreshed in background."""
+        calls = []
+
+        async def fake_search(**kwargs):
+            calls.append(kwargs)
+            return [make_pharmacy(f"Farmacia {len(calls)}")]
+
+        service = ScrapingService(http2=False)
+        monkeypatch.setattr(service, "search_pharmacies", fake_search)
+        cache = StaleWhileRevalidateCache(service, ttl_seconds=0, max_entries=10, breaker=CircuitBreaker(3, 60))
+
+        first = await cache.get(cap="21049")
+        second = await cache.get(cap="21049")
+        await asyncio.gather(*cache._tasks)
+        third = await cache.get(cap="21049")
+
+        assert first.refreshed and not first.stale
+        assert second.stale
+        assert [p.name for p in second.pharmacies] == ["Farmacia 1"]
+        assert [p.name for p in third.pharmacies] == ["Farmacia 2"]
+
+    async def test_circuit_opens_and_serves_fallback(self, monkeypatch):
+        """Test repeated failures open the circuit and the persisted snapshot is served."""
+        calls = []
+
+        async def failing_search(**kwargs):
+            calls.append(kwargs)
+            raise httpx.ConnectTimeout("upstream down")
+
+        service = ScrapingService(http2=False)
+        monkeypatch.setattr(service, "search_pharmacies", failing_search)
+        cache = StaleWhileRevalidateCache(service, ttl_seconds=300, max_entries=10, breaker=CircuitBreaker(2, 60))
+        fallback = lambda area, slot: ([make_pharmacy("Farmacia Salvata")], datetime(2025, 11, 11, 20, 0))
+
+        for _ in range(2):
+            result = await cache.get(cap="21049", fallback=fallback)
+            assert result.stale
+            assert [p.name for p in result.pharmacies] == ["Farmacia Salvata"]
+
+        assert cache.breaker.state == CircuitBreaker.OPEN
+
+        # Open circuit: upstream is no longer called
+        await cache.get(cap="21049", fallback=fallback)
+        assert len(calls) == 2
+
+        with pytest.raises(CircuitOpenError):
+            await cache.get(cap="21049")
+
+    async def test_miss_serves_persisted_snapshot_before_upstream(self, monkeypatch):
+        """Test a miss with a persisted snapshot does not wait on the upstream."""
+        upstream = asyncio.Event()
+        refreshed = []
+
+        async def slow_search(**kwargs):
+            await upstream.wait()
+            return [make_pharmacy("Farmacia Nuova")]
+
+        service = ScrapingService(http2=False)
+        monkeypatch.setattr(service, "search_pharmacies", slow_search)
+        cache = StaleWhileRevalidateCache(service, ttl_seconds=300, max_entries=10, breaker=CircuitBreaker(3, 60))
+        cache.on_refresh = lambda area, slot, pharmacies: refreshed.append([p.name for p in pharmacies])
+        persisted = lambda area, slot: ([make_pharmacy("Farmacia Salvata")], datetime(2025, 11, 11, 20, 0))
+
+        result = await cache.get(cap="21049", persisted=persisted)
+
+        assert result.stale and not result.refreshed
+        assert [p.name for p in result.pharmacies] == ["Farmacia Salvata"]
+
+        upstream.set()
+        await asyncio.gather(*cache._tasks)
+        fresh = await cache.get(cap="21049", persisted=persisted)
+
+        assert refreshed == [["Farmacia Nuova"]]
+        assert not fresh.stale
+        assert [p.name for p in fresh.pharmacies] == ["Farmacia Nuova"]
+
+    def test_search_serves_last_snapshot_when_upstream_fails(self, client: TestClient, monkeypatch, db_session):
+        """Test the endpoint falls back to the last good snapshot instead of failing."""
+        snapshot_store.save_snapshot(db_session, "21049", datetime(2025, 11, 11, 20, 0), [make_pharmacy("Farmacia A")])
+
+        async def failing_search(**kwargs):
+            raise httpx.ConnectTimeout("upstream down")
+
+        monkeypatch.setattr(scraping_service, "search_pharmacies", failing_search)
+
+        response = client.post("/api/v1/scraping/search", json={"cap": "21049"})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["stale"] is True
+        assert [p["name"] for p in data["pharmacies"]] == ["Farmacia A"]
+
+
+class TestEnrichment:
+    """Test matching scraped pharmacies to our own."""
+
+    @pytest.fixture
+    def pharmacies(self, db_session, test_user):
+        """Two pharmacies in Tradate, about 1.1 km apart."""
+        rows = [
+            Pharmacy(
+                user_id=test_user.id, display_id="TRA001", name="Farmacia Centrale Dr. Rossi",
+                address="V. Roma, 1", city="Tradate", postal_code="21049",
+                latitude=45.7100, longitude=8.9070
+            ),
+            Pharmacy(
+                user_id=test_user.id, display_id="TRA002", name="Farmacia San Rocco",
+                address="Piazza Mazzini 3", city="Tradate", postal_code="21049",
+                latitude=45.7200, longitude=8.9070
+            ),
+        ]
+        db_session.add_all(rows)
+        db_session.commit()
+        return rows
+
+    def test_normalize_text(self):
+        """Test accents, punctuation and abbreviations are normalized."""
+        assert normalize_text("P.zza  Libertà, 3") == normalize_text("PZZA LIBERTA 3") == "PIAZZA LIBERTA 3"
+
+    def test_match_reuses_coordinates_and_computes_distance(self, db_session, pharmacies):
+        """Test scraped entries get our id, coordinates and distance from the origin."""
+        matcher = PharmacyMatcher()
+        scraped = [make_pharmacy("FARMACIA CENTRALE ROSSI", address="Via Roma 1"), make_pharmacy("Farmacia Sconosciuta", address="Via Verdi 9")]
+
+        enriched = enrich_pharmacies(db_session, scraped, origin=pharmacies[1], matcher=matcher)
+
+        assert enriched[0].pharmacy_id == pharmacies[0].id
+        assert enriched[0].latitude == 45.7100
+        assert enriched[0].distance_from_pharmacy_km == pytest.approx(1.11, abs=0.01)
+        assert enriched[1].pharmacy_id is None
+        assert scraped[0].pharmacy_id is None
+
+    def test_matching_runs_once_per_pharmacy(self, db_session, pharmacies):
+        """Test match results, negative ones included, are cached."""
+        matcher = PharmacyMatcher()
+        scraped = [make_pharmacy("Farmacia San Rocco", address="P.zza Mazzini 3"), make_pharmacy("Farmacia Sconosciuta")]
+
+        for _ in range(3):
+            enrich_pharmacies(db_session, scraped, matcher=matcher)
+
+        assert matcher.match_runs == 2
+
+    def test_enrichment_keeps_snapshot_hash(self, client: TestClient, fake_scraper, pharmacies):
+        """Test search enriches results without changing the content hash."""
+        body = {"cap": "21049", "search_time": "20:00"}
+
+        plain = client.post("/api/v1/scraping/search", json=body)
+        enriched = client.post("/api/v1/scraping/search", json={**body, "pharmacy_id": str(pharmacies[1].id)})
+
+        assert enriched.status_code == status.HTTP_200_OK
+        pharmacy = enriched.json()["pharmacies"][0]
+        assert pharmacy["pharmacy_id"] == str(pharmacies[0].id)
+        assert pharmacy["distance_from_pharmacy_km"] == pytest.approx(1.11, abs=0.01)
+        assert enriched.json()["content_hash"] == plain.json()["content_hash"]
@@ -0,0 +1,121 @@
+"""Tests for the security event store and its admin API."""
+
+from datetime import datetime, timedelta
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.security_logging import SecurityEventType, SecurityLogger
+from app.services.security_event_store import SecurityEventRetention, SecurityEventStore, aggregate_events, count_events
+from tests.conftest import TestingSessionLocal
+
+
+def login_failure(username: str, ip_address: str, minutes_ago: int = 0) -> dict:
+    """Event dict as produced by the security logger."""
+    return {
+        "timestamp": datetime.utcnow() - timedelta(minutes=minutes_ago),
+        "event_type": "login_failure",
+        "level": "warning",
+        "username": username,
+        "ip_address": ip_address,
+        "message": f"Authentication failed for {username}",
+    }
+
+
+class TestSecurityEventStore:
+    """Test appends and windowed aggregations."""
+
+    def test_aggregate_within_window(self, db_session):
+        """Test events are counted per IP, ignoring those outside the window."""
+        store = SecurityEventStore(TestingSessionLocal)
+        store.append([
+            login_failure("mario", "10.0.0.1"),
+            login_failure("luigi", "10.0.0.1"),
+            login_failure("mario", "10.0.0.2"),
+            login_failure("mario", "10.0.0.1", minutes_ago=120),
+        ])
+
+        aggregates = aggregate_events(db_session, timedelta(hours=1), "ip_address", "login_failure")
+
+        assert [(a.key, a.count) for a in aggregates] == [("10.0.0.1", 2), ("10.0.0.2", 1)]
+        assert count_events(db_session, "login_failure", timedelta(hours=3), username="mario") == 3
+
+    def test_brute_force_summary(self, db_session):
+        """Test the aggregates attached to brute-force alerts."""
+        store = SecurityEventStore(TestingSessionLocal)
+        store.append([login_failure(f"user{i}", "10.0.0.1") for i in range(3)])
+        store.append([login_failure("user0", "10.0.0.9")])
+
+        summary = store.brute_force_summary("10.0.0.1", "user0", timedelta(hours=1))
+
+        assert summary == {
+            "ip_failures": 3,
+            "ip_distinct_usernames": 3,
+            "username_failures": 2,
+            "window_minutes": 60,
+        }
+
+    def test_retention_purges_expired_events(self, db_session):
+        """Test the retention job deletes events older than the retention period."""
+        store = SecurityEventStore(TestingSessionLocal)
+        store.append([
+            login_failure("mario", "10.0.0.1", minutes_ago=3 * 24 * 60),
+            login_failure("luigi", "10.0.0.1", minutes_ago=5),
+        ])
+        retention = SecurityEventRetention(store, retention=timedelta(days=2), interval=60)
+
+        retention.start()
+        retention.stop()
+
+        assert retention.purged_total == 1
+        assert count_events(db_session, "login_failure", timedelta(days=7)) == 1
+
+    def test_logger_writes_to_store(self, db_session, tmp_path):
+        """Test the security logger appends its batches to the store."""
+        logger = SecurityLogger(str(tmp_path / "security.log"), event_store=SecurityEventStore(TestingSessionLocal))
+        logger.log_authentication(SecurityEventType.LOGIN_FAILURE, "mario", success=False, ip_address="10.0.0.1")
+        logger.close()
+
+        assert logger.get_stats()["stored_total"] == 1
+        assert count_events(db_session, "login_failure", timedelta(minutes=5), ip_address="10.0.0.1") == 1
+
+
+class TestSecurityEventsAPI:
+    """Test the admin security events endpoints."""
+
+    def test_aggregate(self, client: TestClient, admin_headers: dict):
+        """Test failed logins grouped by IP."""
+        SecurityEventStore(TestingSessionLocal).append([
+            login_failure("mario", "10.0.0.1"),
+            login_failure("luigi", "10.0.0.1"),
+        ])
+
+        response = client.get(
+            "/api/v1/security-events/aggregate",
+            params={"event_type": "login_failure", "group_by": "ip_address"},
+            headers=admin_headers
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["window_minutes"] == 60
+        assert data["items"][0]["key"] == "10.0.0.1"
+        assert data["items"][0]["count"] == 2
+
+    def test_list_events(self, client: TestClient, admin_headers: dict):
+        """Test recent events are listed, newest first."""
+        SecurityEventStore(TestingSessionLocal).append([
+            login_failure("mario", "10.0.0.1", minutes_ago=5),
+            login_failure("luigi", "10.0.0.1"),
+        ])
+
+        response = client.get("/api/v1/security-events/", headers=admin_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [event["username"] for event in response.json()] == ["luigi", "mario"]
+
+    def test_requires_admin(self, client: TestClient, auth_headers: dict):
+        """Test regular users cannot read security events."""
+        response = client.get("/api/v1/security-events/aggregate", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,69 @@
+"""Tests for the queued security logger."""
+
+import json
+
+from app.core.security_logging import (
+    SecurityEvent,
+    SecurityEventLevel,
+    SecurityEventType,
+    SecurityLogger,
+)
+
+
+def read_events(path) -> list:
+    """Parse the JSON lines of a security log."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class TestSecurityLogger:
+    """Test the non-blocking security log sink."""
+
+    def test_events_written_as_json_lines(self, tmp_path):
+        """Test helper methods and SecurityEvent produce the same line format."""
+        log_file = tmp_path / "security.log"
+        logger = SecurityLogger(str(log_file))
+
+        logger.log_authentication(
+            SecurityEventType.LOGIN_FAILURE, "mario", success=False,
+            ip_address="10.0.0.1", details={"reason": "invalid_password"}
+        )
+        logger.log_event(SecurityEvent(
+            event_type=SecurityEventType.LOGIN_SUCCESS,
+            level=SecurityEventLevel.INFO,
+            username="mario",
+            message="ok"
+        ))
+        logger.close()
+
+        failure, success = read_events(log_file)
+        assert failure["level"] == "WARNING"
+        assert failure["event"]["event_type"] == "login_failure"
+        assert failure["event"]["details"] == {"reason": "invalid_password"}
+        assert "user_agent" not in failure["event"]
+        assert success["event"]["username"] == "mario"
+        assert logger.get_stats()["written_total"] == 2
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        """Test events are dropped, not blocked on, when the queue is full."""
+        logger = SecurityLogger(str(tmp_path / "security.log"), queue_size=2)
+        logger.close()  # No consumer: the queue fills up
+
+        for _ in range(5):
+            logger.log_authentication(SecurityEventType.LOGIN_FAILURE, "mario", success=False)
+
+        stats = logger.get_stats()
+        assert stats["enqueued_total"] == 2
+        assert stats["dropped_total"] == 3
+
+    def test_size_based_rotation(self, tmp_path):
+        """Test the file rotates once it reaches max_bytes."""
+        log_file = tmp_path / "security.log"
+        logger = SecurityLogger(str(log_file), batch_size=1, max_bytes=600, backup_count=2)
+
+        for i in range(10):
+            logger.log_authentication(SecurityEventType.LOGIN_SUCCESS, f"user{i}", success=True)
+        logger.close()
+
+        assert logger.get_stats()["rotations_total"] >= 1
+        assert (tmp_path / "security.log.1").exists()
+        assert log_file.stat().st_size <= 600
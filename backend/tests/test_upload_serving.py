@@ -0,0 +1,87 @@
+"""Tests for uploaded file serving."""
+
+import hashlib
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.api import uploads as uploads_api
+from app.utils import uploads
+
+CONTENT = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def stored_file(tmp_path, monkeypatch) -> str:
+    """Content-addressed file in a temporary upload directory; returns its URL."""
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path)
+    name = f"{hashlib.sha256(CONTENT).hexdigest()}.pdf"
+    (tmp_path / "display_images").mkdir()
+    (tmp_path / "display_images" / name).write_bytes(CONTENT)
+    return f"/uploads/display_images/{name}"
+
+
+class TestUploadServing:
+    """Test caching, validators and ranges."""
+
+    def test_immutable_caching(self, client: TestClient, stored_file: str):
+        """Test content-addressed files are cached forever with a strong ETag."""
+        response = client.get(stored_file)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == CONTENT
+        assert response.headers["content-type"] == "application/pdf"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["etag"] == f'"{stored_file.rsplit("/", 1)[1]}"'
+
+    def test_not_modified(self, client: TestClient, stored_file: str):
+        """Test a matching If-None-Match gets 304 without a body."""
+        etag = client.get(stored_file).headers["etag"]
+
+        response = client.get(stored_file, headers={"If-None-Match": f"W/{etag}"})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+    @pytest.mark.parametrize("range_header, start, end", [
+        ("bytes=100-199", 100, 199),
+        ("bytes=10000-", 10000, 10239),
+        ("bytes=-40", 10200, 10239),
+    ])
+    def test_range(self, client: TestClient, stored_file: str, range_header: str, start: int, end: int):
+        """Test a single byte range is served as partial content."""
+        response = client.get(stored_file, headers={"Range": range_header})
+
+        assert response.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert response.content == CONTENT[start:end + 1]
+        assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+
+    def test_range_not_satisfiable(self, client: TestClient, stored_file: str):
+        """Test a range past the end of the file gets 416."""
+        response = client.get(stored_file, headers={"Range": "bytes=99999-"})
+
+        assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    def test_accel_redirect(self, client: TestClient, stored_file: str, monkeypatch):
+        """Test nginx is told to send the bytes when configured."""
+        monkeypatch.setattr(uploads_api.settings, "UPLOAD_ACCEL_REDIRECT_PREFIX", "/_uploads/")
+
+        response = client.get(stored_file)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == b""
+        assert response.headers["x-accel-redirect"] == stored_file.replace("/uploads/", "/_uploads/")
+        assert "immutable" in response.headers["cache-control"]
+
+    @pytest.mark.parametrize("path", [
+        "/uploads/display_images/.upload-123.part",
+        "/uploads/display_images/missing.png",
+        "/uploads/display_images",
+    ])
+    def test_not_found(self, client: TestClient, stored_file: str, path: str):
+        """Test hidden, missing and directory paths are not served."""
+        (uploads.UPLOAD_DIR / "display_images" / ".upload-123.part").write_bytes(b"partial")
+
+        assert client.get(path).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,157 @@
+"""Tests for streamed, content-addressed upload storage."""
+
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile, status
+from fastapi.testclient import TestClient
+
+from app.models.pharmacy import Pharmacy
+from app.models.upload_blob import UploadBlob
+from app.models.user import User
+from app.utils import uploads
+from app.utils.uploads import delete_file_if_exists, save_upload_file, upload_path
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    """Redirect uploads to a temporary directory."""
+    monkeypatch.setattr(uploads, "UPLOAD_DIR", tmp_path)
+    return tmp_path
+
+
+def make_upload(content: bytes, filename: str = "logo.png") -> UploadFile:
+    """UploadFile with unknown size, as for chunked requests."""
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+class TestSaveUploadFile:
+    """Test the streaming upload writer."""
+
+    def test_streams_and_hashes(self, db_session, upload_dir):
+        """Test the file is copied in chunks, hashed on the fly and named by its hash."""
+        content = b"x" * 10_000
+
+        stored = save_upload_file(db_session, make_upload(content), "logos", {".png"}, chunk_size=1024)
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        assert stored.path.read_bytes() == content
+        assert stored.size == len(content)
+        assert stored.sha256 == sha256
+        assert stored.url == f"/uploads/logos/{sha256}.png"
+        assert list((upload_dir / "logos").glob(".upload-*")) == []
+
+    def test_too_large_aborts(self, db_session, upload_dir):
+        """Test the copy stops at the limit and leaves nothing behind."""
+        with pytest.raises(HTTPException) as exc:
+            save_upload_file(
+                db_session, make_upload(b"x" * 5000), "logos", {".png"}, max_size=4096, chunk_size=1024
+            )
+
+        assert exc.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert list((upload_dir / "logos").iterdir()) == []
+        assert db_session.query(UploadBlob).count() == 0
+
+    def test_extension_not_allowed(self, db_session, upload_dir):
+        """Test unexpected file types are rejected."""
+        with pytest.raises(HTTPException) as exc:
+            save_upload_file(db_session, make_upload(b"x", "script.sh"), "logos", {".png"})
+
+        assert exc.value.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_identical_uploads_share_one_file(self, db_session, upload_dir):
+        """Test re-uploads are deduplicated and deleted with their last reference."""
+        first = save_upload_file(db_session, make_upload(b"logo"), "logos", {".png"})
+        second = save_upload_file(db_session, make_upload(b"logo"), "logos", {".png"})
+        db_session.commit()
+
+        assert second.url == first.url
+        assert second.deduplicated is True
+        assert db_session.get(UploadBlob, first.url).refcount == 2
+
+        delete_file_if_exists(db_session, first.url)
+        db_session.commit()
+        assert first.path.exists()
+
+        delete_file_if_exists(db_session, first.url)
+        db_session.commit()
+        assert not first.path.exists()
+        assert db_session.get(UploadBlob, first.url) is None
+
+    def test_derived_files_deleted_with_source(self, db_session, upload_dir):
+        """Test variants of an upload go away with its last reference."""
+        stored = save_upload_file(db_session, make_upload(b"img"), "logos", {".png"})
+        derived = stored.path.parent / uploads.DERIVED_DIRNAME / f"{stored.sha256}-thumb.webp"
+        derived.parent.mkdir()
+        derived.write_bytes(b"thumb")
+
+        delete_file_if_exists(db_session, stored.url)
+        assert derived.exists()  # Only once the release is committed
+
+        db_session.commit()
+        assert not derived.exists()
+
+    def test_rolled_back_release_keeps_file(self, db_session, upload_dir):
+        """Test a release that is rolled back deletes nothing."""
+        stored = save_upload_file(db_session, make_upload(b"img"), "logos", {".png"})
+        db_session.commit()
+
+        delete_file_if_exists(db_session, stored.url)
+        db_session.rollback()
+        db_session.commit()
+
+        assert stored.path.exists()
+        assert db_session.get(UploadBlob, stored.url).refcount == 1
+
+    def test_reacquired_file_kept(self, db_session, upload_dir):
+        """Test a file acquired again before the release commits is kept."""
+        stored = save_upload_file(db_session, make_upload(b"img"), "logos", {".png"})
+        db_session.commit()
+
+        delete_file_if_exists(db_session, stored.url)
+        save_upload_file(db_session, make_upload(b"img"), "logos", {".png"})
+        db_session.commit()
+
+        assert stored.path.exists()
+        assert db_session.get(UploadBlob, stored.url).refcount == 1
+
+    def test_delete_stays_in_upload_dir(self, db_session, upload_dir):
+        """Test deletion ignores URLs escaping the upload directory."""
+        legacy = upload_dir / "logos" / "legacy.png"
+        legacy.parent.mkdir()
+        legacy.write_bytes(b"x")
+
+        assert upload_path("/uploads/../secret.txt") is None
+        delete_file_if_exists(db_session, "/uploads/logos/legacy.png")
+        db_session.commit()
+        assert not legacy.exists()
+
+
+class TestLogoUpload:
+    """Test the pharmacy logo endpoint uses the shared writer."""
+
+    def test_replaces_old_logo(self, client: TestClient, auth_headers: dict, test_user: User, db_session, upload_dir):
+        """Test a new logo is stored and the previous file removed."""
+        pharmacy = Pharmacy(
+            user_id=test_user.id, display_id="LOGO01", name="Logo Pharmacy",
+            city="Milano", postal_code="20121", is_active=True
+        )
+        db_session.add(pharmacy)
+        db_session.commit()
+
+        first = client.post(
+            f"/api/v1/pharmacies/{pharmacy.id}/upload-logo",
+            files={"file": ("logo.png", b"first", "image/png")},
+            headers=auth_headers
+        )
+        second = client.post(
+            f"/api/v1/pharmacies/{pharmacy.id}/upload-logo",
+            files={"file": ("logo.png", b"second", "image/png")},
+            headers=auth_headers
+        )
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert upload_path(first.json()["logo_path"]) is not None
+        assert [p.read_bytes() for p in (upload_dir / "pharmacy_logos").iterdir()] == [b"second"]